@@ -0,0 +1,32 @@
+import os
+import sys
+import time
+import argparse
+
+# 添加项目根目录到Python路径
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app import custom_create_app
+from app.news_store import analyze_stored_news, ANALYZE_CHUNK_SIZE
+
+
+def main():
+    parser = argparse.ArgumentParser(description='批量计算已保存新闻的情感得分并关联话题')
+    parser.add_argument('--chunk-size', type=int, default=ANALYZE_CHUNK_SIZE, help='每批处理的条数')
+    parser.add_argument('--workers', type=int, help='分词进程数，默认使用CPU核数')
+    parser.add_argument('--reprocess', action='store_true', help='重新处理已处理过的新闻')
+    args = parser.parse_args()
+    
+    app = custom_create_app()
+    with app.app_context():
+        start = time.time()
+        processed_count = analyze_stored_news(chunk_size=args.chunk_size, workers=args.workers,
+                                              reprocess=args.reprocess)
+        elapsed = time.time() - start
+        
+        print(f"处理了 {processed_count} 条新闻")
+        print(f"耗时: {elapsed:.2f}秒")
+
+
+if __name__ == '__main__':
+    main()
@@ -19,6 +19,10 @@ def create_app(config_name=None):
     """创建Flask应用实例"""
     app = Flask(__name__, instance_relative_config=True)
     
+    # 配置日志（异步队列输出，级别由环境变量 LOG_LEVEL / LOG_LEVELS 控制）
+    from app.logging_config import configure_logging
+    configure_logging(app)
+    
     # 配置应用
     app.config['SECRET_KEY'] = os.getenv('SECRET_KEY', 'dev_key_change_in_production')
     app.config['SQLALCHEMY_DATABASE_URI'] = os.getenv('DATABASE_URL', 'sqlite:///app.db')
@@ -31,6 +35,26 @@ def create_app(config_name=None):
     migrate.init_app(app, db)
     login_manager.init_app(app)
     
+    # 后台采集任务执行器（首次提交任务时才启动线程）
+    from app.tasks import crawl_executor, news_scoring_worker
+    crawl_executor.init_app(app)
+    
+    # 后台新闻评分（首次保存新闻时才启动线程）
+    news_scoring_worker.init_app(app)
+    
+    # 后台深度采集（首次提交时才启动线程）
+    from app.deep_crawl import deep_crawl_runner
+    deep_crawl_runner.init_app(app)
+    
+    # 仪表盘计数（注册新闻、话题、评论增删时的计数监听）
+    from app.dashboard_stats import dashboard_stats
+    dashboard_stats.init_app(app)
+    
+    # 分词词典按需加载；NLP_WARMUP=1 时在后台预热，首个用到分词的请求不必等待
+    if os.getenv('NLP_WARMUP', '0') == '1':
+        from app.nlp import start_warm_up
+        start_warm_up()
+    
     # 注册蓝图
     from app.main import bp as main_bp
     app.register_blueprint(main_bp)
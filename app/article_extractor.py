@@ -0,0 +1,116 @@
+import re
+from typing import Any, Dict, List
+
+from app.html_parser import parse_html
+
+# 正文段落少于该长度时不参与打分（与 readability 一致）
+MIN_PARAGRAPH_LENGTH = 25
+
+# 类名或ID命中时加分/减分的规则
+_POSITIVE_PATTERN = re.compile(r'article|body|content|entry|main|post|text|detail|\bzw\b', re.I)
+_NEGATIVE_PATTERN = re.compile(
+    r'comment|footer|footnote|nav|menu|sidebar|share|related|recommend|copyright|banner|'
+    r'advert|sponsor|breadcrumb|popup|login', re.I)
+
+# 这些标签内的段落不是正文
+_UNLIKELY_TAGS = {'nav', 'header', 'footer', 'aside', 'form'}
+
+# 容器标签自身的基础分
+_TAG_SCORES = {'div': 5, 'article': 10, 'section': 3, 'pre': 3, 'td': 3, 'blockquote': 3,
+               'form': -3, 'ol': -3, 'ul': -3, 'li': -3, 'dl': -3,
+               'h1': -5, 'h2': -5, 'h3': -5, 'h4': -5, 'h5': -5, 'h6': -5, 'th': -5}
+
+_WHITESPACE_PATTERN = re.compile(r'\s+')
+
+
+def _class_and_id(node: Any) -> str:
+    classes = node.get('class') or ''
+    if isinstance(classes, list):  # BeautifulSoup 把 class 解析为列表
+        classes = ' '.join(classes)
+    return f"{classes} {node.get('id') or ''}"
+
+
+def _class_weight(node: Any) -> int:
+    value = _class_and_id(node)
+    weight = 0
+    if _NEGATIVE_PATTERN.search(value):
+        weight -= 25
+    if _POSITIVE_PATTERN.search(value):
+        weight += 25
+    return weight
+
+
+def _is_unlikely(node: Any) -> bool:
+    """段落是否位于导航、页脚、评论等区域中"""
+    for ancestor in node.parents:
+        if ancestor.name in _UNLIKELY_TAGS:
+            return True
+        value = _class_and_id(ancestor).strip() if ancestor.name != '[document]' else ''
+        if value and _NEGATIVE_PATTERN.search(value) and not _POSITIVE_PATTERN.search(value):
+            return True
+    return False
+
+
+def _link_density(node: Any) -> float:
+    text_length = len(node.get_text(strip=True))
+    if not text_length:
+        return 0.0
+    link_length = sum(len(a.get_text(strip=True)) for a in node.find_all('a'))
+    return link_length / text_length
+
+
+def _clean_paragraph(text: str) -> str:
+    return _WHITESPACE_PATTERN.sub(' ', text).strip()
+
+
+# 提取文章正文
+def extract_article_text(html_content: str, parser_backend: str = None) -> str:
+    """
+    按 readability 的思路从文章页中提取正文
+
+    每个较长的段落按长度和逗号数给父节点打分、给祖父节点打一半的分，
+    再按容器的标签、类名/ID 和链接密度调整，得分最高的容器即正文区域，
+    返回其中的段落文本。
+
+    Args:
+        html_content: 文章页HTML
+        parser_backend: HTML解析后端，默认读取环境变量 CRAWL_HTML_PARSER
+
+    Returns:
+        正文文本，段落之间以换行分隔；找不到正文时返回空字符串
+    """
+    if not html_content:
+        return ''
+    soup = parse_html(html_content, parser_backend)
+
+    candidates: Dict[int, List] = {}  # id(节点) -> [节点, 得分]
+    for paragraph in soup.find_all(['p', 'pre', 'td']):
+        text = _clean_paragraph(paragraph.get_text())
+        if len(text) < MIN_PARAGRAPH_LENGTH or _is_unlikely(paragraph):
+            continue
+
+        score = 1 + text.count(',') + text.count('，') + min(len(text) // 100, 3)
+        parent = paragraph.parent
+        grandparent = parent.parent if parent is not None else None
+        for ancestor, share in ((parent, 1.0), (grandparent, 0.5)):
+            if ancestor is None or ancestor.name == '[document]':
+                continue
+            candidate = candidates.get(id(ancestor))
+            if candidate is None:
+                candidate = [ancestor, _TAG_SCORES.get(ancestor.name, 0) + _class_weight(ancestor)]
+                candidates[id(ancestor)] = candidate
+            candidate[1] += score * share
+
+    if not candidates:
+        return ''
+
+    best, _ = max(((node, score * (1 - _link_density(node))) for node, score in candidates.values()),
+                  key=lambda item: item[1])
+
+    # 保留正文区域内、链接不多的段落
+    lines = []
+    for paragraph in best.find_all(['p', 'pre', 'td']):
+        text = _clean_paragraph(paragraph.get_text())
+        if text and _link_density(paragraph) < 0.5 and not _is_unlikely(paragraph):
+            lines.append(text)
+    return '\n'.join(lines)
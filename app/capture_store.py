@@ -0,0 +1,153 @@
+import gzip
+import itertools
+import json
+import logging
+import os
+import queue
+import re
+import threading
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+CAPTURE_SUFFIX = '.json.gz'
+
+# 文件名中的关键词只保留字母、数字、汉字和下划线
+_UNSAFE_CHARS = re.compile(r'\W+')
+
+
+# 原始响应留存
+class CaptureStore:
+    """
+    把抓取到的原始搜索结果页压缩保存到目录中，用于事后排查解析问题
+
+    save() 只把响应放入队列，压缩和写文件由后台线程完成，不阻塞抓取；
+    队列满时丢弃新的响应。文件按关键词、页码和时间命名，并发抓取之间
+    不会互相覆盖。超过文件数或总大小上限时删除最早的文件。
+    """
+
+    def __init__(self, directory: str, max_files: int = 200, max_bytes: int = 50 * 1024 * 1024,
+                 queue_size: int = 32):
+        self.directory = directory
+        self.max_files = max(1, max_files)
+        self.max_bytes = max(1, max_bytes)
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._counter = itertools.count()
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def save(self, keyword: str, page: int, html_content: str, url: str = '', status: int = None,
+             healthy: bool = True) -> bool:
+        """
+        提交一个响应等待写入
+
+        Returns:
+            是否已放入队列，队列已满时返回False
+        """
+        captured_at = datetime.now()
+        # 时间戳在前，文件名排序即写入顺序；序号避免同一微秒内的冲突
+        filename = '{}-{:06d}_{}_p{}{}'.format(
+            captured_at.strftime('%Y%m%d%H%M%S%f'), next(self._counter) % 1000000,
+            _UNSAFE_CHARS.sub('_', keyword)[:40], page, CAPTURE_SUFFIX)
+        record = {
+            'keyword': keyword,
+            'page': page,
+            'url': url,
+            'status': status,
+            'healthy': healthy,
+            'captured_at': captured_at.strftime('%Y-%m-%d %H:%M:%S'),
+            'html': html_content,
+        }
+        self._ensure_writer()
+        try:
+            self._queue.put_nowait((filename, record))
+            return True
+        except queue.Full:
+            logger.warning("响应留存队列已满，丢弃 %s", filename)
+            return False
+
+    def flush(self) -> None:
+        """等待已提交的响应全部写入"""
+        if self._thread is not None:
+            self._queue.join()
+
+    def list_captures(self) -> List[str]:
+        """按写入顺序返回留存文件路径"""
+        if not os.path.isdir(self.directory):
+            return []
+        names = sorted(name for name in os.listdir(self.directory) if name.endswith(CAPTURE_SUFFIX))
+        return [os.path.join(self.directory, name) for name in names]
+
+    def _ensure_writer(self) -> None:
+        if self._thread is None:
+            with self._lock:
+                if self._thread is None:
+                    os.makedirs(self.directory, exist_ok=True)
+                    self._thread = threading.Thread(target=self._run, name='capture-writer', daemon=True)
+                    self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            filename, record = self._queue.get()
+            try:
+                self._write(filename, record)
+                self._rotate()
+            except Exception:
+                logger.exception("写入响应留存文件失败: %s", filename)
+            finally:
+                self._queue.task_done()
+
+    def _write(self, filename: str, record: Dict[str, Any]) -> None:
+        path = os.path.join(self.directory, filename)
+        # 先写临时文件再改名，读取方不会看到写了一半的文件
+        with gzip.open(path + '.tmp', 'wt', encoding='utf-8') as f:
+            json.dump(record, f, ensure_ascii=False)
+        os.replace(path + '.tmp', path)
+
+    def _rotate(self) -> None:
+        paths = self.list_captures()
+        sizes = [os.path.getsize(path) for path in paths]
+        total = sum(sizes)
+        removed = 0
+        # 至少保留最新的一个文件
+        while len(paths) - removed > 1 and (len(paths) - removed > self.max_files or total > self.max_bytes):
+            os.remove(paths[removed])
+            total -= sizes[removed]
+            removed += 1
+
+
+def load_capture(path: str) -> Dict[str, Any]:
+    """
+    读取一个留存文件
+
+    Returns:
+        包含 keyword、page、url、status、healthy、captured_at 和 html 的字典
+    """
+    with gzip.open(path, 'rt', encoding='utf-8') as f:
+        return json.load(f)
+
+
+_capture_store = None
+_capture_store_lock = threading.Lock()
+
+
+def get_capture_store() -> Optional[CaptureStore]:
+    """
+    获取进程内共享的响应留存（由环境变量配置）
+
+    只有设置了 CRAWL_CAPTURE_DIR 时才启用，否则返回None。
+    """
+    global _capture_store
+    directory = os.getenv('CRAWL_CAPTURE_DIR')
+    if not directory:
+        return None
+    if _capture_store is None:
+        with _capture_store_lock:
+            if _capture_store is None:
+                _capture_store = CaptureStore(
+                    directory,
+                    max_files=int(os.getenv('CRAWL_CAPTURE_MAX_FILES', 200)),
+                    max_bytes=int(os.getenv('CRAWL_CAPTURE_MAX_BYTES', 50 * 1024 * 1024)),
+                )
+    return _capture_store
@@ -0,0 +1,128 @@
+import logging
+import threading
+from datetime import datetime
+from typing import Dict
+
+from sqlalchemy import event, func, select, update
+
+from app import db
+from app.models import Comment, News, StatCounter, Topic
+
+logger = logging.getLogger(__name__)
+
+# 计数器名称与对应的模型
+COUNTED_MODELS = {'news': News, 'topics': Topic, 'comments': Comment}
+
+
+# 增减计数
+def adjust_counter(name: str, delta: int, connection=None) -> None:
+    """
+    在当前事务中增减计数，随写入数据一起提交或回滚
+
+    计数行还不存在时不做处理，第一次读取或校准时会按实际行数建立。
+
+    Args:
+        name: 计数器名称，见 COUNTED_MODELS
+        delta: 增加的数量，删除时为负数
+        connection: 数据库连接，默认使用 db.session
+    """
+    if not delta:
+        return
+    statement = (update(StatCounter.__table__)
+                 .where(StatCounter.__table__.c.name == name)
+                 .values(value=StatCounter.__table__.c.value + delta, updated_at=datetime.utcnow()))
+    (connection or db.session).execute(statement)
+
+
+def _counter_listener(name: str, delta: int):
+    def listener(mapper, connection, target):
+        adjust_counter(name, delta, connection)
+    return listener
+
+
+# 读取和校准仪表盘计数
+def reconcile_counters() -> Dict[str, int]:
+    """
+    按实际行数重置全部计数器并提交，需要在应用上下文中调用
+
+    先锁住计数行再统计行数：并发写入的事务在提交前会等待锁，提交后
+    再在校准结果上增减，不会丢失计数（SQLite 本身串行写入）。
+
+    Returns:
+        各计数器的偏差（实际行数 - 原计数），计数行原本不存在时偏差为实际行数
+    """
+    from app.news_store import insert_ignore_duplicates
+
+    db.session.execute(insert_ignore_duplicates(StatCounter, ['name']),
+                       [{'name': name, 'value': 0} for name in COUNTED_MODELS])
+    current = dict(db.session.execute(
+        select(StatCounter.name, StatCounter.value)
+        .where(StatCounter.name.in_(list(COUNTED_MODELS)))
+        .with_for_update()
+    ).all())
+
+    drift = {}
+    for name, model in COUNTED_MODELS.items():
+        actual = db.session.scalar(select(func.count()).select_from(model))
+        drift[name] = actual - current.get(name, 0)
+        if drift[name]:
+            db.session.execute(update(StatCounter).where(StatCounter.name == name)
+                               .values(value=actual, updated_at=datetime.utcnow()))
+    db.session.commit()
+
+    if any(drift.values()):
+        logger.info("仪表盘计数已校准", extra={'drift': drift})
+    return drift
+
+
+# 仪表盘统计服务
+class DashboardStats:
+    """
+    仪表盘的新闻、话题、评论总数
+
+    总数保存在 stat_counter 表中，读取只需按主键取三行，与数据表大小无关。
+    通过ORM新增或删除这三种记录时由 after_insert / after_delete 事件增减
+    计数；promote_crawl_data 等批量写入路径自行调用 adjust_counter。
+    脚本中的批量删除等不经过这两种途径的修改，由定期校准修正。
+    """
+
+    _listeners_registered = False
+    _listeners_lock = threading.Lock()
+
+    def __init__(self, app=None):
+        self.app = None
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        """绑定应用并注册计数监听（每个进程只注册一次）"""
+        with self._listeners_lock:
+            if not DashboardStats._listeners_registered:
+                for name, model in COUNTED_MODELS.items():
+                    event.listen(model, 'after_insert', _counter_listener(name, 1))
+                    event.listen(model, 'after_delete', _counter_listener(name, -1))
+                DashboardStats._listeners_registered = True
+        app.extensions['dashboard_stats'] = self
+        self.app = app
+
+    def counts(self) -> Dict[str, int]:
+        """
+        读取计数，需要在应用上下文中调用
+
+        Returns:
+            {'news': 新闻总数, 'topics': 话题总数, 'comments': 评论总数}
+        """
+        counts = self._load()
+        if len(counts) < len(COUNTED_MODELS):
+            # 第一次使用时按实际行数建立计数
+            reconcile_counters()
+            counts = self._load()
+        return counts
+
+    @staticmethod
+    def _load() -> Dict[str, int]:
+        return dict(db.session.execute(
+            select(StatCounter.name, StatCounter.value).where(StatCounter.name.in_(list(COUNTED_MODELS)))).all())
+
+
+dashboard_stats = DashboardStats()
@@ -0,0 +1,184 @@
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+from typing import List, Optional, Set, Tuple
+from urllib.parse import urlparse
+
+from app import db
+from app.article_extractor import extract_article_text
+from app.models import CrawlData
+from app.rate_limit import HostBudget
+
+logger = logging.getLogger(__name__)
+
+# 提取到的正文短于该长度时视为失败，保留原有摘要
+MIN_ARTICLE_LENGTH = 50
+
+_article_budget = None
+_article_budget_lock = threading.Lock()
+
+
+def get_article_budget() -> HostBudget:
+    """
+    获取文章页请求共用的主机预算（由环境变量配置）
+
+    与搜索结果页的预算分开：文章分布在很多站点上，每个站点单独限制
+    并发数和请求频率，不同站点之间互不影响。
+    """
+    global _article_budget
+    if _article_budget is None:
+        with _article_budget_lock:
+            if _article_budget is None:
+                _article_budget = HostBudget(
+                    max_concurrency=int(os.getenv('CRAWL_DEEP_HOST_CONCURRENCY', 2)),
+                    rate=float(os.getenv('CRAWL_DEEP_HOST_RATE', 2.0)),
+                    burst=float(os.getenv('CRAWL_DEEP_HOST_BURST', 2)),
+                    min_rate=float(os.getenv('CRAWL_HOST_MIN_RATE', 0.05)),
+                    max_rate=float(os.getenv('CRAWL_DEEP_HOST_MAX_RATE', 5.0)),
+                )
+    return _article_budget
+
+
+# 抓取一篇文章并提取正文
+def fetch_article(url: str) -> str:
+    """
+    在主机预算内抓取文章页并提取正文
+
+    Returns:
+        正文文本，抓取失败或提取不到正文时返回空字符串
+    """
+    from app.utils import fetch_web_content
+
+    host = urlparse(url).hostname or ''
+    budget = get_article_budget()
+    with budget.slot(host):
+        html_content = fetch_web_content(url)
+    budget.report(host, bool(html_content))
+    return extract_article_text(html_content)
+
+
+# 批量深度采集
+def deep_crawl(data_ids: Optional[List[int]] = None, task_id: Optional[int] = None,
+               max_workers: Optional[int] = None, force: bool = False) -> Tuple[int, int]:
+    """
+    并发抓取采集数据的原文并提取正文，写回 content
+
+    请求在线程池中并发执行，同一站点的并发数和频率由文章主机预算限制；
+    数据库只在调用线程中读写，每 CRAWL_COMMIT_BATCH_SIZE 条提交一次，
+    前端轮询即可看到已完成的部分。需要在应用上下文中调用。
+
+    Args:
+        data_ids: 采集数据ID列表
+        task_id: 采集任务ID，处理该任务的全部数据（data_ids 为空时生效）
+        max_workers: 并发线程数，默认读取环境变量 CRAWL_DEEP_MAX_WORKERS
+        force: 是否重新采集已深度采集过的数据
+
+    Returns:
+        (成功数量, 失败数量)
+    """
+    query = db.session.query(CrawlData.id, CrawlData.url)
+    if data_ids:
+        query = query.filter(CrawlData.id.in_(data_ids))
+    elif task_id is not None:
+        query = query.filter(CrawlData.task_id == task_id)
+    else:
+        return 0, 0
+    if not force:
+        query = query.filter(CrawlData.is_deep_crawled.isnot(True))
+    rows = query.order_by(CrawlData.id).all()
+    if not rows:
+        return 0, 0
+
+    if max_workers is None:
+        max_workers = int(os.getenv('CRAWL_DEEP_MAX_WORKERS', 8))
+    batch_size = max(1, int(os.getenv('CRAWL_COMMIT_BATCH_SIZE', 50)))
+    crawled = failed = 0
+    updates = []
+
+    def flush():
+        if updates:
+            db.session.bulk_update_mappings(CrawlData, updates)
+            updates.clear()
+        db.session.commit()
+
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(rows))),
+                            thread_name_prefix='deep-crawl') as executor:
+        futures = {executor.submit(fetch_article, url): data_id for data_id, url in rows}
+        for future in as_completed(futures):
+            data_id = futures[future]
+            try:
+                content = future.result()
+            except Exception as e:
+                logger.warning("深度采集失败: %s", e, extra={'data_id': data_id})
+                content = ''
+            if len(content) < MIN_ARTICLE_LENGTH:
+                failed += 1
+                continue
+            crawled += 1
+            updates.append({'id': data_id, 'content': content,
+                            'is_deep_crawled': True, 'deep_crawl_time': datetime.now()})
+            if len(updates) >= batch_size:
+                flush()
+    flush()
+
+    logger.info("深度采集完成，成功 %d 条，失败 %d 条", crawled, failed, extra={'task_id': task_id})
+    return crawled, failed
+
+
+# 后台深度采集
+class DeepCrawlRunner:
+    """
+    在后台线程中执行整个采集任务的深度采集
+
+    同一任务同时只运行一次，重复提交会被忽略。每个任务内部已经并发抓取，
+    因此这里只用一个线程依次处理任务。
+    """
+
+    def __init__(self, app=None):
+        self.app = None
+        self._pool = None
+        self._lock = threading.Lock()
+        self._running: Set[int] = set()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.extensions['deep_crawl_runner'] = self
+        self.app = app
+
+    def is_running(self, task_id: int) -> bool:
+        with self._lock:
+            return task_id in self._running
+
+    def submit(self, task_id: int) -> bool:
+        """
+        提交任务的深度采集
+
+        Returns:
+            是否已提交，该任务正在深度采集时返回False
+        """
+        with self._lock:
+            if task_id in self._running:
+                return False
+            self._running.add(task_id)
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix='deep-crawl-runner')
+        self._pool.submit(self._run, task_id)
+        return True
+
+    def _run(self, task_id: int) -> None:
+        try:
+            with self.app.app_context():
+                try:
+                    deep_crawl(task_id=task_id)
+                except Exception:
+                    logger.exception("任务深度采集失败", extra={'task_id': task_id})
+                    db.session.rollback()
+        finally:
+            with self._lock:
+                self._running.discard(task_id)
+
+
+deep_crawl_runner = DeepCrawlRunner()
@@ -0,0 +1,112 @@
+import codecs
+import re
+import threading
+from collections import OrderedDict
+from typing import Optional
+from urllib.parse import urlparse
+
+from requests.compat import chardet
+
+# 编码检测只看正文开头的这么多字节
+DETECT_PREFIX_BYTES = 16 * 1024
+
+# <meta charset> 一般出现在 <head> 开头
+META_PREFIX_BYTES = 4096
+
+# 低于该置信度的检测结果视为无法确定
+MIN_DETECT_CONFIDENCE = 0.2
+
+# 最多记住多少个域名的检测结果，超出时淘汰最久未用的
+DOMAIN_ENCODING_CACHE_SIZE = 4096
+
+_HEADER_CHARSET_PATTERN = re.compile(r'charset\s*=\s*["\']?([\w.:-]+)', re.I)
+_META_CHARSET_PATTERN = re.compile(rb'<meta[^>]+charset\s*=\s*["\']?\s*([\w.:-]+)', re.I)
+_NON_ASCII_PATTERN = re.compile(rb'[\x80-\xff]')
+
+# 声明为 GB2312/GBK 的中文页面常混有超出字符集的字，统一按超集 GB18030 解码
+_ENCODING_ALIASES = {'gb2312': 'gb18030', 'gbk': 'gb18030', 'x-gbk': 'gb18030', 'gb_2312-80': 'gb18030'}
+
+_domain_encodings: OrderedDict = OrderedDict()
+_domain_encodings_lock = threading.Lock()
+
+
+def normalize_encoding(name: Optional[str]) -> Optional[str]:
+    """规范化编码名称，Python 不支持的编码返回None"""
+    if not name:
+        return None
+    name = name.strip().lower()
+    name = _ENCODING_ALIASES.get(name, name)
+    try:
+        return codecs.lookup(name).name
+    except LookupError:
+        return None
+
+
+def _header_encoding(content_type: str) -> Optional[str]:
+    # 没有 charset 参数时不采用 requests 对 text/* 默认的 ISO-8859-1
+    match = _HEADER_CHARSET_PATTERN.search(content_type or '')
+    return normalize_encoding(match.group(1)) if match else None
+
+
+def _meta_encoding(content: bytes) -> Optional[str]:
+    match = _META_CHARSET_PATTERN.search(content[:META_PREFIX_BYTES])
+    return normalize_encoding(match.group(1).decode('ascii', 'ignore')) if match else None
+
+
+def _detect_encoding(content: bytes) -> Optional[str]:
+    # 页面开头常是大段内联脚本和样式，从第一个非 ASCII 字节所在行开始检测；
+    # 纯 ASCII 的页面无从判断，交给调用方使用默认编码
+    match = _NON_ASCII_PATTERN.search(content)
+    if not match:
+        return None
+    start = content.rfind(b'\n', 0, match.start()) + 1
+    prefix = content[start:start + DETECT_PREFIX_BYTES]
+    # 截断处可能切开多字节字符，去掉末尾不完整的部分，避免误判
+    if len(content) > start + DETECT_PREFIX_BYTES:
+        prefix = prefix[:prefix.rfind(b'\n') + 1] or prefix
+    result = chardet.detect(prefix)
+    if (result.get('confidence') or 0) < MIN_DETECT_CONFIDENCE:
+        return None
+    encoding = normalize_encoding(result.get('encoding'))
+    return None if encoding == 'ascii' else encoding
+
+
+# 确定响应的文本编码
+def resolve_encoding(response, default: str = 'utf-8') -> str:
+    """
+    确定网页响应的编码，避免对整个正文做字符集检测
+
+    依次采用：BOM、Content-Type 中的 charset、页面开头的 <meta charset>、
+    该域名之前检测出的编码，最后才对第一个非 ASCII 字节起的一小段做检测。
+    只有确定的检测结果才会记住，供同一域名后续的页面使用。
+
+    Args:
+        response: requests 的响应对象
+        default: 都无法确定时使用的编码
+
+    Returns:
+        编码名称
+    """
+    content = response.content or b''
+    if content.startswith(codecs.BOM_UTF8):
+        return 'utf-8-sig'
+
+    encoding = _header_encoding(response.headers.get('Content-Type', '')) or _meta_encoding(content)
+    if encoding:
+        return encoding
+
+    host = urlparse(response.url or '').hostname or ''
+    with _domain_encodings_lock:
+        encoding = _domain_encodings.get(host)
+        if encoding:
+            _domain_encodings.move_to_end(host)
+            return encoding
+
+    encoding = _detect_encoding(content)
+    if encoding and host:
+        with _domain_encodings_lock:
+            _domain_encodings[host] = encoding
+            _domain_encodings.move_to_end(host)
+            if len(_domain_encodings) > DOMAIN_ENCODING_CACHE_SIZE:
+                _domain_encodings.popitem(last=False)
+    return encoding or default
@@ -0,0 +1,46 @@
+from datetime import datetime
+from typing import Optional, Sequence
+
+try:
+    import numpy as np
+except ImportError:  # numpy 未安装时逐条调用 calculate_heat
+    np = None
+
+
+# 批量计算热度
+def compute_heat_scores(comments_count: Sequence, views_count: Sequence, publish_time: Sequence,
+                        sentiment_score: Sequence, now: Optional[datetime] = None):
+    """
+    按 calculate_heat 的公式一次计算一批新闻的热度
+
+    热度 = (评论数 * 2 + 浏览量 * 0.1) * 时间衰减 * 情感因子，
+    时间衰减为 1 / (1 + 已发布小时数 / 24)，没有发布时间时为1。
+
+    Args:
+        comments_count: 评论数，None 视为0
+        views_count: 浏览量，None 视为0
+        publish_time: 发布时间（datetime），None 表示未知
+        sentiment_score: 情感得分，None 视为0
+        now: 计算时间，默认为当前时间
+
+    Returns:
+        热度数组（numpy 未安装时为列表），保留两位小数
+    """
+    now = now or datetime.now()
+    if np is None:
+        from types import SimpleNamespace
+        from app.utils import calculate_heat
+        return [calculate_heat(SimpleNamespace(comments_count=c or 0, views_count=v or 0,
+                                               publish_time=p, sentiment_score=s or 0.0), now=now)
+                for c, v, p, s in zip(comments_count, views_count, publish_time, sentiment_score)]
+
+    comments = np.nan_to_num(np.array(comments_count, dtype=float))
+    views = np.nan_to_num(np.array(views_count, dtype=float))
+    sentiment = np.nan_to_num(np.array(sentiment_score, dtype=float))
+    published = np.array(publish_time, dtype='datetime64[us]')
+
+    hours = (np.datetime64(now, 'us') - published) / np.timedelta64(1, 'h')
+    # 发布时间晚于当前时间（时钟偏差）时按刚发布处理
+    time_factor = np.where(np.isnat(published), 1.0, 1 / (1 + np.maximum(hours, 0) / 24))
+    heat = (comments * 2 + views * 0.1) * time_factor * (1 + np.abs(sentiment) * 0.5)
+    return np.round(heat, 2)
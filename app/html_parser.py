@@ -0,0 +1,188 @@
+import os
+from typing import Any, Dict, Iterator, List, Optional, Union
+
+from bs4 import BeautifulSoup
+
+try:
+    from lxml import etree
+except ImportError:  # lxml 未安装时只能使用 html.parser
+    etree = None
+
+# 可选的解析后端，auto 时按顺序选择第一个可用的
+PARSER_BACKENDS = ('lxml', 'html.parser')
+
+# 这些标签内的文本不计入 get_text()，与 BeautifulSoup 一致
+_NON_TEXT_TAGS = {'script', 'style', 'template'}
+
+# 这些标签内保留原样的空白，其他位置的纯空白文本与 BeautifulSoup 一样压缩为一个字符
+_PRESERVE_WHITESPACE_TAGS = {'pre', 'textarea'}
+_ASCII_SPACES = '\x20\x0a\x09\x0c\x0d'
+
+
+# lxml 元素的轻量封装
+class LxmlNode:
+    """
+    以 BeautifulSoup 的接口访问 lxml 元素
+
+    只实现爬虫解析用到的部分：name、parent、parents、get、find、
+    find_all 和 get_text。同一元素总是对应同一个封装对象，可以用
+    is 和 id() 判断是否为同一节点。
+    """
+
+    __slots__ = ('_document', '_element')
+
+    def __init__(self, document: 'LxmlDocument', element: Any):
+        self._document = document
+        self._element = element
+
+    @property
+    def name(self) -> str:
+        return self._element.tag
+
+    @property
+    def parent(self) -> Optional['LxmlNode']:
+        parent = self._element.getparent()
+        if parent is None:
+            return self._document
+        return self._document.wrap(parent)
+
+    @property
+    def parents(self) -> Iterator['LxmlNode']:
+        node = self.parent
+        while node is not None:
+            yield node
+            node = node.parent
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return self._element.get(key, default)
+
+    def _elements(self) -> Iterator[Any]:
+        return self._element.iterdescendants()
+
+    def find_all(self, name: Union[str, List[str], None] = None, class_: Any = None) -> List['LxmlNode']:
+        """按文档顺序查找后代元素，class_ 可以是类名或正则表达式"""
+        return list(self._iter_matches(name, class_))
+
+    def find(self, name: Union[str, List[str], None] = None, class_: Any = None) -> Optional['LxmlNode']:
+        return next(self._iter_matches(name, class_), None)
+
+    def _iter_matches(self, name, class_) -> Iterator['LxmlNode']:
+        names = {name} if isinstance(name, str) else set(name) if name else None
+        for element in self._elements():
+            tag = element.tag
+            if not isinstance(tag, str):  # 注释、处理指令
+                continue
+            if names is not None and tag not in names:
+                continue
+            if class_ is not None and not _class_matches(element.get('class'), class_):
+                continue
+            yield self._document.wrap(element)
+
+    def get_text(self, separator: str = '', strip: bool = False) -> str:
+        strings = []
+
+        def add(text, preserve):
+            if strip:
+                text = text.strip()
+            elif not preserve and not text.strip(_ASCII_SPACES):
+                text = '\n' if '\n' in text else ' '
+            if text:
+                strings.append(text)
+
+        def walk(element, preserve):
+            preserve = preserve or element.tag in _PRESERVE_WHITESPACE_TAGS
+            if element.text and element.tag not in _NON_TEXT_TAGS:
+                add(element.text, preserve)
+            for child in element:
+                if isinstance(child.tag, str) and child.tag not in _NON_TEXT_TAGS:
+                    walk(child, preserve)
+                if child.tail:
+                    add(child.tail, preserve)
+
+        walk(self._element, any(ancestor.tag in _PRESERVE_WHITESPACE_TAGS
+                                for ancestor in self._element.iterancestors()))
+        return separator.join(strings)
+
+    def __repr__(self):
+        return f'<LxmlNode {self.name}>'
+
+
+# 整个页面（对应 BeautifulSoup 对象本身）
+class LxmlDocument(LxmlNode):
+    __slots__ = ('_nodes',)
+
+    def __init__(self, root: Any):
+        self._nodes: Dict[Any, LxmlNode] = {}
+        super().__init__(self, root)
+
+    @property
+    def name(self) -> str:
+        return '[document]'
+
+    @property
+    def parent(self) -> None:
+        return None
+
+    def wrap(self, element: Any) -> LxmlNode:
+        node = self._nodes.get(element)
+        if node is None:
+            node = LxmlNode(self, element)
+            self._nodes[element] = node
+        return node
+
+    def _elements(self) -> Iterator[Any]:
+        return self._element.iter()
+
+
+def _class_matches(value: Optional[str], class_: Any) -> bool:
+    if not value:
+        return False
+    if isinstance(class_, str):
+        return class_ in value.split()
+    return class_.search(value) is not None
+
+
+def available_backends() -> List[str]:
+    """返回当前环境中可用的解析后端"""
+    return [backend for backend in PARSER_BACKENDS if backend != 'lxml' or etree is not None]
+
+
+def get_parser_backend() -> str:
+    """
+    读取环境变量 CRAWL_HTML_PARSER 选择解析后端
+
+    auto（默认）时优先使用 lxml，未安装时退回 html.parser；
+    指定的后端不可用时同样退回 html.parser。
+    """
+    backend = os.getenv('CRAWL_HTML_PARSER', 'auto')
+    if backend in available_backends():
+        return backend
+    return available_backends()[0] if backend == 'auto' else 'html.parser'
+
+
+# 解析HTML
+def parse_html(html_content: str, backend: Optional[str] = None) -> Any:
+    """
+    解析HTML页面
+
+    Args:
+        html_content: 页面HTML
+        backend: 解析后端，默认由 get_parser_backend() 决定
+
+    Returns:
+        页面根节点，lxml 后端返回 LxmlDocument，html.parser 后端返回
+        BeautifulSoup 对象，两者的查找接口一致
+    """
+    backend = backend or get_parser_backend()
+    if backend == 'lxml' and etree is not None:
+        if not html_content or not html_content.strip():
+            html_content = '<html></html>'
+        # 按字节解析并显式指定编码，避免页面内的编码声明与已解码的文本冲突；
+        # 使用 etree 的解析器而不是 lxml.html，省去每个元素的类查找
+        parser = etree.HTMLParser(encoding='utf-8')
+        root = etree.fromstring(html_content.encode('utf-8', 'replace'), parser=parser)
+        # 只有注释或 XML 声明的文档没有根元素，按空页面处理
+        if root is None:
+            root = etree.fromstring(b'<html></html>', parser=parser)
+        return LxmlDocument(root)
+    return BeautifulSoup(html_content, 'html.parser')
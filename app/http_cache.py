@@ -0,0 +1,218 @@
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from typing import Any, Dict, Optional
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from app.http_client import DEFAULT_HEADERS
+
+logger = logging.getLogger(__name__)
+
+# 默认缓存文件放在实例目录下，与开发数据库在一起
+DEFAULT_CACHE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'instance', 'http_cache.sqlite')
+
+# 随正文一起缓存的响应头，命中缓存时据此还原编码和校验信息
+_CACHED_HEADERS = ('Content-Type', 'ETag', 'Last-Modified')
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS http_cache (
+    url TEXT PRIMARY KEY,
+    headers TEXT NOT NULL,
+    body BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    fetched_at REAL NOT NULL,
+    accessed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ix_http_cache_accessed_at ON http_cache (accessed_at);
+"""
+
+
+# 磁盘HTTP缓存
+class HttpCache:
+    """
+    基于SQLite的HTTP响应缓存
+
+    缓存未超过 ttl 时直接返回，不发请求；超过后带上 ETag /
+    Last-Modified 发条件请求，服务器返回304时沿用缓存正文。正文
+    用zlib压缩保存，每写入 evict_every 条检查一次总大小，超过上限
+    时按最近访问时间淘汰。
+
+    每个线程使用自己的数据库连接，可以在抓取线程之间共享。
+    """
+
+    def __init__(self, path: str, ttl: float = 3600, max_bytes: int = 200 * 1024 * 1024, evict_every: int = 50):
+        self.path = path
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.evict_every = max(1, evict_every)
+        self._local = threading.local()
+        self._writes = 0
+        self._writes_lock = threading.Lock()
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            conn.executescript(_SCHEMA)
+            self._local.conn = conn
+        return conn
+
+    def lookup(self, url: str, ttl: Optional[float] = None) -> Optional[requests.Response]:
+        """
+        读取未过期的缓存
+
+        Args:
+            url: 请求地址
+            ttl: 有效期（秒），默认使用缓存的 ttl
+
+        Returns:
+            由缓存还原的响应对象，没有缓存或已过期时返回None
+        """
+        ttl = self.ttl if ttl is None else ttl
+        row = self._load(url)
+        if row is None or time.time() - row[2] > ttl:
+            return None
+        self._touch(url)
+        return _to_response(url, row[0], row[1])
+
+    def store(self, url: str, response: requests.Response) -> bool:
+        """
+        缓存一个成功的响应
+
+        Returns:
+            是否已缓存，非200或服务器要求不缓存时返回False
+        """
+        if response.status_code != 200 or 'no-store' in response.headers.get('Cache-Control', ''):
+            return False
+        headers = {name: response.headers[name] for name in _CACHED_HEADERS if name in response.headers}
+        body = zlib.compress(response.content)
+        now = time.time()
+        conn = self._connection()
+        conn.execute('INSERT OR REPLACE INTO http_cache (url, headers, body, size, fetched_at, accessed_at) '
+                     'VALUES (?, ?, ?, ?, ?, ?)', (url, json.dumps(headers), body, len(body), now, now))
+        # 统计总大小需要扫描整张表，每写入一定条数才检查一次
+        with self._writes_lock:
+            self._writes += 1
+            due = self._writes % self.evict_every == 0
+        if due:
+            self._evict(conn)
+        return True
+
+    def get(self, client: Any, url: str, ttl: Optional[float] = None,
+            headers: Optional[Dict[str, str]] = None, **kwargs) -> requests.Response:
+        """
+        经过缓存发送GET请求
+
+        Args:
+            client: 实际发送请求的客户端，如 CrawlerHttpClient
+            url: 请求地址
+            ttl: 有效期（秒），默认使用缓存的 ttl
+            headers: 请求头，默认使用 DEFAULT_HEADERS
+            **kwargs: 透传给 client.get 的其他参数
+
+        Returns:
+            响应对象，命中缓存或服务器返回304时由缓存还原，from_cache 为True
+        """
+        ttl = self.ttl if ttl is None else ttl
+        row = self._load(url)
+        if row is not None and time.time() - row[2] <= ttl:
+            self._touch(url)
+            return _to_response(url, row[0], row[1])
+
+        headers = dict(headers or DEFAULT_HEADERS)
+        if row is not None:
+            cached_headers = json.loads(row[0])
+            if 'ETag' in cached_headers:
+                headers['If-None-Match'] = cached_headers['ETag']
+            if 'Last-Modified' in cached_headers:
+                headers['If-Modified-Since'] = cached_headers['Last-Modified']
+
+        response = client.get(url, headers=headers, **kwargs)
+        if response.status_code == 304:
+            if row is not None:
+                # 内容未变化，只刷新缓存时间
+                now = time.time()
+                self._connection().execute('UPDATE http_cache SET fetched_at = ?, accessed_at = ? WHERE url = ?',
+                                           (now, now, url))
+                logger.debug("条件请求命中缓存: %s", url)
+                return _to_response(url, row[0], row[1])
+            # 没有可沿用的缓存正文（如调用方自带了校验头），去掉校验头重新请求
+            logger.debug("没有缓存却收到304，重新请求: %s", url)
+            headers = {name: value for name, value in headers.items()
+                       if name.lower() not in ('if-none-match', 'if-modified-since')}
+            response = client.get(url, headers=headers, **kwargs)
+
+        response.from_cache = False
+        self.store(url, response)
+        return response
+
+    def clear(self) -> None:
+        self._connection().execute('DELETE FROM http_cache')
+
+    def _load(self, url: str) -> Optional[tuple]:
+        return self._connection().execute(
+            'SELECT headers, body, fetched_at FROM http_cache WHERE url = ?', (url,)).fetchone()
+
+    def _touch(self, url: str) -> None:
+        self._connection().execute('UPDATE http_cache SET accessed_at = ? WHERE url = ?', (time.time(), url))
+
+    def _evict(self, conn: sqlite3.Connection) -> None:
+        total = conn.execute('SELECT COALESCE(SUM(size), 0) FROM http_cache').fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        # 从最久未访问的开始删除，直到总大小回到上限以内
+        excess = total - self.max_bytes
+        urls = []
+        for url, size in conn.execute('SELECT url, size FROM http_cache ORDER BY accessed_at'):
+            urls.append((url,))
+            excess -= size
+            if excess <= 0:
+                break
+        conn.executemany('DELETE FROM http_cache WHERE url = ?', urls)
+
+
+def _to_response(url: str, headers: str, body: bytes) -> requests.Response:
+    """把缓存记录还原为 requests 的响应对象，调用方按正常响应处理"""
+    response = requests.Response()
+    response.status_code = 200
+    response.url = url
+    response.headers = CaseInsensitiveDict(json.loads(headers))
+    response._content = zlib.decompress(body)
+    response.encoding = requests.utils.get_encoding_from_headers(response.headers)
+    response.from_cache = True
+    return response
+
+
+_http_cache = None
+_http_cache_lock = threading.Lock()
+
+
+def get_http_cache() -> Optional[HttpCache]:
+    """
+    获取进程内共享的HTTP缓存（由环境变量配置）
+
+    CRAWL_HTTP_CACHE_PATH 设为空字符串时关闭缓存，返回None。
+    """
+    global _http_cache
+    path = os.getenv('CRAWL_HTTP_CACHE_PATH', DEFAULT_CACHE_PATH)
+    if not path:
+        return None
+    if _http_cache is None:
+        with _http_cache_lock:
+            if _http_cache is None:
+                _http_cache = HttpCache(
+                    path,
+                    ttl=float(os.getenv('CRAWL_HTTP_CACHE_TTL', 3600)),
+                    max_bytes=int(os.getenv('CRAWL_HTTP_CACHE_MAX_BYTES', 200 * 1024 * 1024)),
+                    evict_every=int(os.getenv('CRAWL_HTTP_CACHE_EVICT_EVERY', 50)),
+                )
+    return _http_cache
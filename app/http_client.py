@@ -0,0 +1,138 @@
+import os
+import threading
+import time
+from typing import Dict, Optional
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# 默认请求头
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+}
+
+# 复制Cookie列表时遇到并发写入的最多尝试次数
+COOKIE_SNAPSHOT_RETRIES = 10
+
+
+def domain_matches(host: str, domain: str) -> bool:
+    """Cookie的域是否覆盖主机，按标签边界匹配（baidu.com 不覆盖 evil-baidu.com）"""
+    host = (host or '').lower()
+    domain = (domain or '').lower().lstrip('.')
+    return bool(domain) and (host == domain or host.endswith('.' + domain))
+
+
+# 爬虫共享HTTP客户端
+class CrawlerHttpClient:
+    """
+    所有爬虫请求共用的HTTP客户端
+
+    内部只持有一个 requests.Session：按主机保持长连接池，Cookie 在
+    多个关键词和页码之间复用，直到过期后才重新访问预热页面获取。
+    """
+
+    def __init__(self, pool_connections: int = 10, pool_maxsize: int = 10, cookie_ttl: float = 1800):
+        self.cookie_ttl = cookie_ttl
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self._lock = threading.Lock()
+        self._host_locks: Dict[str, threading.Lock] = {}
+        self._cookie_expiry: Dict[str, float] = {}
+
+    def _host_lock(self, host: str) -> threading.Lock:
+        with self._lock:
+            lock = self._host_locks.get(host)
+            if lock is None:
+                lock = threading.Lock()
+                self._host_locks[host] = lock
+            return lock
+
+    def _cookie_snapshot(self) -> list:
+        """
+        复制一份Cookie列表，之后的检查和清理都在副本上进行
+
+        其他线程的响应同时写入Cookie时复制可能因容器变化而失败，
+        此时重新复制。
+        """
+        for _ in range(COOKIE_SNAPSHOT_RETRIES - 1):
+            try:
+                return list(self.session.cookies)
+            except RuntimeError:
+                continue
+        return list(self.session.cookies)
+
+    def _cookies_valid(self, host: str) -> bool:
+        """检查主机的Cookie是否仍在有效期内"""
+        now = time.time()
+        if self._cookie_expiry.get(host, 0) <= now:
+            return False
+        # 站点下发的Cookie自身过期时也需要重新获取
+        for cookie in self._cookie_snapshot():
+            if domain_matches(host, cookie.domain) and cookie.is_expired(now):
+                return False
+        return True
+
+    def ensure_cookies(self, warmup_url: str, headers: Optional[Dict[str, str]] = None, timeout: int = 10) -> None:
+        """
+        确保已持有目标主机的Cookie，没有或已过期时访问预热页面获取
+
+        Args:
+            warmup_url: 用于获取Cookie的页面，如站点首页
+            headers: 请求头
+            timeout: 超时时间（秒）
+        """
+        host = urlparse(warmup_url).hostname or ''
+        with self._host_lock(host):
+            if self._cookies_valid(host):
+                return
+            self.session.get(warmup_url, headers=headers or DEFAULT_HEADERS, timeout=timeout)
+            self._cookie_expiry[host] = time.time() + self.cookie_ttl
+
+    def reset_cookies(self, host: str) -> None:
+        """丢弃某个主机的Cookie，下次请求时重新获取"""
+        with self._host_lock(host):
+            self._cookie_expiry.pop(host, None)
+            for cookie in self._cookie_snapshot():
+                if domain_matches(host, cookie.domain):
+                    self.session.cookies.clear(cookie.domain, cookie.path, cookie.name)
+
+    def get(self, url: str, headers: Optional[Dict[str, str]] = None, timeout: int = 15,
+            warmup_url: Optional[str] = None, **kwargs) -> requests.Response:
+        """
+        发送GET请求
+
+        Args:
+            url: 请求地址
+            headers: 请求头，默认使用 DEFAULT_HEADERS
+            timeout: 超时时间（秒）
+            warmup_url: 需要先获取Cookie时的预热页面
+            **kwargs: 透传给 requests 的其他参数
+
+        Returns:
+            响应对象
+        """
+        headers = headers or DEFAULT_HEADERS
+        if warmup_url:
+            self.ensure_cookies(warmup_url, headers=headers)
+        return self.session.get(url, headers=headers, timeout=timeout, **kwargs)
+
+
+_http_client = None
+_http_client_lock = threading.Lock()
+
+
+def get_http_client() -> CrawlerHttpClient:
+    """获取进程内共享的HTTP客户端（由环境变量配置连接池大小）"""
+    global _http_client
+    if _http_client is None:
+        with _http_client_lock:
+            if _http_client is None:
+                _http_client = CrawlerHttpClient(
+                    pool_connections=int(os.getenv('CRAWL_POOL_CONNECTIONS', 10)),
+                    pool_maxsize=int(os.getenv('CRAWL_POOL_MAXSIZE', 10)),
+                    cookie_ttl=float(os.getenv('CRAWL_COOKIE_TTL', 1800)),
+                )
+    return _http_client
@@ -0,0 +1,142 @@
+import atexit
+import json
+import logging
+import os
+import queue
+import sys
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, Dict, Optional
+
+# 应用日志的根记录器，app.utils、app.main.routes 等模块记录器都挂在它下面
+ROOT_LOGGER = 'app'
+
+DEFAULT_FORMAT = '%(asctime)s %(levelname)s %(name)s: %(message)s'
+
+# LogRecord 自带的属性，其余属性都是通过 extra 传入的结构化字段
+_RECORD_ATTRIBUTES = set(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {'message', 'asctime', 'taskName'}
+
+_listener: Optional[QueueListener] = None
+
+
+def _structured_fields(record: logging.LogRecord) -> Dict[str, Any]:
+    return {key: value for key, value in vars(record).items() if key not in _RECORD_ATTRIBUTES}
+
+
+# 文本格式：消息后追加 key=value 字段
+class StructuredFormatter(logging.Formatter):
+    """
+    在普通日志行后追加通过 extra 传入的结构化字段
+
+    例如 logger.info('抓取完成', extra={'keyword': '成都', 'page': 1}) 输出
+    "... app.utils: 抓取完成 keyword=成都 page=1"，含空白的值会加引号。
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        line = super().format(record)
+        fields = _structured_fields(record)
+        if not fields:
+            return line
+        pairs = ' '.join(f'{key}={_format_value(value)}' for key, value in fields.items())
+        head, newline, rest = line.partition('\n')  # 异常堆栈放在字段之后
+        return f'{head} {pairs}{newline}{rest}'
+
+
+def _format_value(value: Any) -> str:
+    text = str(value)
+    if not text or any(char.isspace() or char in '"=' for char in text):
+        return json.dumps(text, ensure_ascii=False)
+    return text
+
+
+# JSON格式：每条日志一行，便于日志系统检索
+class JsonFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            'time': self.formatTime(record),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+        }
+        entry.update(_structured_fields(record))
+        if record.exc_info:
+            entry['exc_info'] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+# 入队时不做任何格式化的队列处理器
+class _DeferredQueueHandler(QueueHandler):
+    """
+    只把日志记录放入队列，消息拼接和格式化都在监听线程中完成
+
+    标准 QueueHandler 为了能跨进程传递，会在调用线程中先格式化消息；
+    这里的队列只在进程内使用，调用线程只需一次入队操作。
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+def parse_module_levels(value: str) -> Dict[str, int]:
+    """
+    解析按模块设置的日志级别
+
+    Args:
+        value: 形如 "app.utils=DEBUG,app.main=WARNING" 的字符串
+
+    Returns:
+        模块名到日志级别的映射，无法识别的项被忽略
+    """
+    levels = {}
+    for item in (value or '').split(','):
+        name, _, level = item.partition('=')
+        level = logging.getLevelName(level.strip().upper())
+        if name.strip() and isinstance(level, int):
+            levels[name.strip()] = level
+    return levels
+
+
+def configure_logging(app: Any = None) -> logging.Logger:
+    """
+    配置应用日志
+
+    日志记录先放入内存队列，由后台监听线程写到标准错误，抓取线程不会
+    阻塞在输出上。逐条新闻的明细只在 DEBUG 级别输出，默认的 INFO 级别
+    下只有每页的汇总（安静模式）。重复调用时只更新级别。
+
+    环境变量:
+        LOG_LEVEL: 应用日志级别，默认 INFO，设为 WARNING 只输出警告和错误
+        LOG_LEVELS: 按模块设置级别，如 "app.utils=DEBUG,app.main=WARNING"
+        LOG_FORMAT: text（默认）或 json
+
+    Args:
+        app: Flask应用，传入时日志也作为 app.logger 的输出
+
+    Returns:
+        应用根记录器
+    """
+    global _listener
+
+    logger = logging.getLogger(ROOT_LOGGER)
+    level = logging.getLevelName(os.getenv('LOG_LEVEL', 'INFO').upper())
+    logger.setLevel(level if isinstance(level, int) else logging.INFO)
+    for name, module_level in parse_module_levels(os.getenv('LOG_LEVELS', '')).items():
+        logging.getLogger(name).setLevel(module_level)
+
+    if _listener is None:
+        formatter = JsonFormatter() if os.getenv('LOG_FORMAT', 'text') == 'json' else StructuredFormatter(DEFAULT_FORMAT)
+        stream_handler = logging.StreamHandler(sys.stderr)
+        stream_handler.setFormatter(formatter)
+
+        log_queue = queue.SimpleQueue()
+        _listener = QueueListener(log_queue, stream_handler, respect_handler_level=True)
+        _listener.start()
+        atexit.register(_listener.stop)
+
+        logger.addHandler(_DeferredQueueHandler(log_queue))
+        # 已由队列处理器输出，不再交给根记录器重复输出
+        logger.propagate = False
+
+    # Flask 的 app.logger 与应用同名时就是同一个记录器，已有处理器时不会再添加默认处理器
+    if app is not None and app.logger is not logger:
+        app.logger.setLevel(logger.level)
+    return logger
@@ -5,9 +5,17 @@ from app import db
 from app.models import User, Role, News, Topic, Comment, SystemSetting, CrawlTask, CrawlData
 from app.main import bp
 from app.utils import crawl_baidu_news, batch_crawl_baidu_news, analyze_sentiment, calculate_heat
+from app.tasks import crawl_executor, news_scoring_worker
+from app.news_store import promote_crawl_data
+from app.deep_crawl import deep_crawl, deep_crawl_runner
+from app.dashboard_stats import dashboard_stats
+from app.pagination import keyset_paginate
 import os
 from werkzeug.utils import secure_filename
 import json
+import logging
+
+logger = logging.getLogger(__name__)
 
 # 首页路由
 @bp.route('/')
@@ -97,6 +105,7 @@ def register():
             return redirect(url_for('main.login'))
         except Exception as e:
             db.session.rollback()
+            logger.exception("用户注册失败: %s", e, extra={'username': username})
             flash('注册失败，请稍后重试', 'error')
             return redirect(url_for('main.register'))
     
@@ -113,10 +122,11 @@ def logout():
 @bp.route('/dashboard')
 @login_required
 def dashboard():
-    # 获取统计信息
-    total_news = News.query.count()
-    total_topics = Topic.query.count()
-    total_comments = Comment.query.count()
+    # 获取统计信息（读取计数器，不扫描数据表）
+    counts = dashboard_stats.counts()
+    total_news = counts['news']
+    total_topics = counts['topics']
+    total_comments = counts['comments']
     recent_news = News.query.order_by(News.crawl_time.desc()).limit(5).all()
     
     return render_template('dashboard.html', 
@@ -129,13 +139,15 @@ def dashboard():
 @bp.route('/news')
 @login_required
 def news_list():
-    # 分页参数
-    page = request.args.get('page', 1, type=int)
+    # 分页参数（游标由上一页的链接带回，无效时回到第一页）
+    cursor = request.args.get('cursor')
     per_page = 10
     
     # 查询新闻列表
-    pagination = News.query.order_by(News.crawl_time.desc()).paginate(
-        page=page, per_page=per_page, error_out=False)
+    try:
+        pagination = keyset_paginate(News.query, (News.crawl_time, News.id), per_page, cursor)
+    except ValueError:
+        pagination = keyset_paginate(News.query, (News.crawl_time, News.id), per_page)
     news_items = pagination.items
     
     return render_template('news_list.html', 
@@ -146,13 +158,15 @@ def news_list():
 @bp.route('/topics')
 @login_required
 def topic_list():
-    # 分页参数
-    page = request.args.get('page', 1, type=int)
+    # 分页参数（游标由上一页的链接带回，无效时回到第一页）
+    cursor = request.args.get('cursor')
     per_page = 10
     
     # 查询话题列表
-    pagination = Topic.query.order_by(Topic.updated_at.desc()).paginate(
-        page=page, per_page=per_page, error_out=False)
+    try:
+        pagination = keyset_paginate(Topic.query, (Topic.updated_at, Topic.id), per_page, cursor)
+    except ValueError:
+        pagination = keyset_paginate(Topic.query, (Topic.updated_at, Topic.id), per_page)
     topic_items = pagination.items
     
     return render_template('topic_list.html', 
@@ -529,11 +543,15 @@ def update_settings():
 @bp.route('/api/news')
 @login_required
 def api_news():
-    page = request.args.get('page', 1, type=int)
-    per_page = request.args.get('per_page', 10, type=int)
+    cursor = request.args.get('cursor')
+    per_page = min(max(request.args.get('per_page', 10, type=int), 1), 100)
     
-    pagination = News.query.order_by(News.crawl_time.desc()).paginate(
-        page=page, per_page=per_page, error_out=False)
+    # 按 (crawl_time, id) 游标分页，总数取自仪表盘计数器（不执行 COUNT）
+    try:
+        pagination = keyset_paginate(News.query, (News.crawl_time, News.id), per_page, cursor,
+                                     total=dashboard_stats.counts()['news'])
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     
     news_list = []
     for news in pagination.items:
@@ -550,9 +568,9 @@ def api_news():
     return jsonify({
         'items': news_list,
         'total': pagination.total,
-        'page': page,
         'per_page': per_page,
-        'pages': pagination.pages
+        'next_cursor': pagination.next_cursor,
+        'prev_cursor': pagination.prev_cursor
     })
 
 # API路由 - 获取话题列表
@@ -611,6 +629,7 @@ def test_crawl():
                     news_count = len(latest_news)
                     flash(f'成功抓取 {news_count} 条新闻数据', 'success')
             except Exception as e:
+                logger.exception("测试抓取失败: %s", e, extra={'keyword': keyword, 'page': page})
                 flash(f'数据抓取失败: {str(e)}。可能是由于百度新闻的反爬机制限制。', 'error')
     
     return render_template('test_crawl.html', news_count=news_count, latest_news=latest_news)
@@ -620,7 +639,12 @@ def test_crawl():
 @bp.route('/crawl_management')
 @login_required
 def crawl_management():
-    return render_template('crawl_management.html')
+    # 展示当前用户最近一次任务的采集结果（任务执行中也能看到已保存的部分数据）
+    latest_task = CrawlTask.query.filter_by(user_id=current_user.id).order_by(CrawlTask.id.desc()).first()
+    crawl_data = latest_task.crawl_data.order_by(CrawlData.id).all() if latest_task else []
+    
+    return render_template('crawl_management.html', crawl_data=crawl_data,
+                           task_id=latest_task.id if latest_task else None)
 
 
 # 创建采集任务路由
@@ -639,17 +663,18 @@ def create_crawl_task():
             status='pending',
             progress=0,
             total_items=0,
-            success_items=0
+            crawled_items=0
         )
         db.session.add(task)
         db.session.commit()
         
         return jsonify({'status': 'success', 'task_id': task.id, 'message': '采集任务已创建'})
     except Exception as e:
+        logger.exception("创建采集任务失败: %s", e, extra={'user_id': current_user.id})
         return jsonify({'status': 'error', 'message': str(e)})
 
 
-# 执行采集任务路由
+# 执行采集任务路由（提交到后台执行器，立即返回）
 @bp.route('/execute_crawl_task/<int:task_id>')
 @login_required
 def execute_crawl_task(task_id):
@@ -660,46 +685,15 @@ def execute_crawl_task(task_id):
         if task.user_id != current_user.id:
             return jsonify({'status': 'error', 'message': '您无权执行此任务'})
         
-        # 更新任务状态为运行中
-        task.status = 'running'
-        task.start_time = datetime.now()
-        db.session.commit()
+        # 只有等待中的任务需要提交，其他状态直接返回当前状态供前端轮询
+        if task.status != 'pending':
+            return jsonify({'status': 'success', 'message': f'采集任务当前状态: {task.status}', 'task_id': task.id})
         
-        # 执行爬虫
-        news_list = crawl_baidu_news(task.keywords, page=1, num_per_page=20)
-        
-        # 更新任务进度和结果
-        task.total_items = len(news_list)
-        task.success_items = 0
-        
-        # 保存采集到的数据
-        for news_item in news_list:
-            crawl_data = CrawlData(
-                task_id=task.id,
-                title=news_item['title'],
-                content=news_item['content'],
-                source=news_item['source'],
-                source_type=news_item['source_type'],
-                url=news_item['url'],
-                publish_time=news_item['publish_time'],
-                cover_image=news_item['cover_image'],
-                crawl_time=datetime.now()
-            )
-            db.session.add(crawl_data)
-            task.success_items += 1
-        
-        # 完成任务
-        task.status = 'completed'
-        task.end_time = datetime.now()
-        task.progress = 100
-        db.session.commit()
+        crawl_executor.submit(task.id)
         
-        return jsonify({'status': 'success', 'message': '数据采集完成', 'data_count': task.success_items})
+        return jsonify({'status': 'success', 'message': '采集任务已提交', 'task_id': task.id})
     except Exception as e:
-        # 更新任务状态为失败
-        task.status = 'failed'
-        task.error_message = str(e)
-        db.session.commit()
+        logger.exception("提交采集任务失败: %s", e, extra={'task_id': task_id})
         return jsonify({'status': 'error', 'message': str(e)})
 
 
@@ -721,11 +715,12 @@ def get_task_status(task_id):
                 'status': task.status,
                 'progress': task.progress,
                 'total_items': task.total_items,
-                'success_items': task.success_items,
+                'crawled_items': task.crawled_items,
                 'error_message': task.error_message
             }
         })
     except Exception as e:
+        logger.exception("查询采集任务状态失败: %s", e, extra={'task_id': task_id})
         return jsonify({'status': 'error', 'message': str(e)})
 
 
@@ -740,8 +735,8 @@ def get_crawl_data(task_id):
         if task.user_id != current_user.id:
             return jsonify({'status': 'error', 'message': '您无权查看此任务数据'})
         
-        # 获取所有采集数据
-        crawl_data_list = CrawlData.query.filter_by(task_id=task_id).all()
+        # 获取已写入的采集数据（任务执行中返回目前为止的部分结果）
+        crawl_data_list = CrawlData.query.filter_by(task_id=task_id).order_by(CrawlData.id).all()
         
         # 转换为JSON格式
         data_list = []
@@ -753,20 +748,21 @@ def get_crawl_data(task_id):
                 'source': data.source,
                 'url': data.url,
                 'publish_time': data.publish_time.strftime("%Y-%m-%d %H:%M:%S") if data.publish_time else '',
-                'cover_image': data.cover_image,
-                'is_deep_crawled': data.is_deep_crawled,
-                'deep_content': data.deep_content
+                'cover_image': data.cover,
+                'is_deep_crawled': data.is_deep_crawled
             })
         
-        return jsonify({'status': 'success', 'data': data_list})
+        return jsonify({'status': 'success', 'data': data_list,
+                        'deep_crawl_running': deep_crawl_runner.is_running(task_id)})
     except Exception as e:
+        logger.exception("获取采集数据失败: %s", e, extra={'task_id': task_id})
         return jsonify({'status': 'error', 'message': str(e)})
 
 
 # 深度采集路由
 @bp.route('/deep_crawl/<int:data_id>')
 @login_required
-def deep_crawl(data_id):
+def deep_crawl_single(data_id):
     try:
         crawl_data = CrawlData.query.get_or_404(data_id)
         task = CrawlTask.query.get_or_404(crawl_data.task_id)
@@ -775,17 +771,35 @@ def deep_crawl(data_id):
         if task.user_id != current_user.id:
             return jsonify({'status': 'error', 'message': '您无权执行此操作'})
         
-        # 模拟深度采集（实际项目中可以实现更复杂的深度采集逻辑）
-        import time
-        time.sleep(2)  # 模拟网络请求延迟
-        
-        # 更新深度采集状态
-        crawl_data.is_deep_crawled = True
-        crawl_data.deep_content = f"深度采集内容：{crawl_data.content}（详细内容已采集...）"
-        db.session.commit()
+        # 抓取原文并提取正文，写回采集数据
+        crawled, failed = deep_crawl([data_id], force=True)
+        if not crawled:
+            return jsonify({'status': 'error', 'message': '未能从原文中提取到正文'})
         
         return jsonify({'status': 'success', 'message': '深度采集完成'})
     except Exception as e:
+        db.session.rollback()
+        logger.exception("深度采集失败: %s", e, extra={'data_id': data_id})
+        return jsonify({'status': 'error', 'message': str(e)})
+
+
+# 任务批量深度采集路由（提交到后台执行，前端轮询采集数据查看进度）
+@bp.route('/deep_crawl_task/<int:task_id>', methods=['POST'])
+@login_required
+def deep_crawl_task(task_id):
+    try:
+        task = CrawlTask.query.get_or_404(task_id)
+        
+        # 验证任务所有者
+        if task.user_id != current_user.id:
+            return jsonify({'status': 'error', 'message': '您无权执行此操作'})
+        
+        if not deep_crawl_runner.submit(task.id):
+            return jsonify({'status': 'success', 'message': '该任务正在深度采集中', 'task_id': task.id})
+        
+        return jsonify({'status': 'success', 'message': '深度采集已提交', 'task_id': task.id})
+    except Exception as e:
+        logger.exception("提交深度采集失败: %s", e, extra={'task_id': task_id})
         return jsonify({'status': 'error', 'message': str(e)})
 
 
@@ -794,36 +808,22 @@ def deep_crawl(data_id):
 @login_required
 def save_single_data(data_id):
     try:
-        crawl_data = CrawlData.query.get_or_404(data_id)
+        CrawlData.query.get_or_404(data_id)
+        
+        saved_count, exists_count = promote_crawl_data([data_id])
+        db.session.commit()
+        # 情感得分和热度由后台评分任务计算，不阻塞保存请求
+        if saved_count:
+            news_scoring_worker.notify()
         
         # 检查是否已存在相同URL的新闻
-        existing_news = News.query.filter_by(url=crawl_data.url).first()
-        if existing_news:
+        if exists_count:
             return jsonify({'status': 'warning', 'message': '该数据已存在于数据库中'})
         
-        # 创建新闻对象
-        news = News(
-            title=crawl_data.title,
-            content=crawl_data.content,
-            source=crawl_data.source,
-            source_type=crawl_data.source_type,
-            url=crawl_data.url,
-            publish_time=crawl_data.publish_time,
-            cover_image=crawl_data.cover_image,
-            crawl_time=crawl_data.crawl_time,
-            sentiment_score=0.0,  # 默认情感分数
-            heat_score=0.0  # 默认热度分数
-        )
-        
-        # 如果有深度采集内容，使用深度内容
-        if crawl_data.is_deep_crawled and crawl_data.deep_content:
-            news.content = crawl_data.deep_content
-        
-        db.session.add(news)
-        db.session.commit()
-        
         return jsonify({'status': 'success', 'message': '数据已成功保存到数据库'})
     except Exception as e:
+        db.session.rollback()
+        logger.exception("保存采集数据失败: %s", e, extra={'data_id': data_id})
         return jsonify({'status': 'error', 'message': str(e)})
 
 
@@ -836,44 +836,17 @@ def save_batch_data():
         if not data_ids:
             return jsonify({'status': 'error', 'message': '请选择要保存的数据'})
         
-        success_count = 0
-        exists_count = 0
-        
-        for data_id in data_ids:
-            crawl_data = CrawlData.query.get_or_404(data_id)
-            
-            # 检查是否已存在相同URL的新闻
-            existing_news = News.query.filter_by(url=crawl_data.url).first()
-            if existing_news:
-                exists_count += 1
-                continue
-            
-            # 创建新闻对象
-            news = News(
-                title=crawl_data.title,
-                content=crawl_data.content,
-                source=crawl_data.source,
-                source_type=crawl_data.source_type,
-                url=crawl_data.url,
-                publish_time=crawl_data.publish_time,
-                cover_image=crawl_data.cover_image,
-                crawl_time=crawl_data.crawl_time,
-                sentiment_score=0.0,  # 默认情感分数
-                heat_score=0.0  # 默认热度分数
-            )
-            
-            # 如果有深度采集内容，使用深度内容
-            if crawl_data.is_deep_crawled and crawl_data.deep_content:
-                news.content = crawl_data.deep_content
-            
-            db.session.add(news)
-            success_count += 1
-        
+        # 一次查询取出全部采集数据，按URL集合批量判重后批量插入
+        success_count, exists_count = promote_crawl_data(data_ids)
         db.session.commit()
+        if success_count:
+            news_scoring_worker.notify()
         
         message = f"成功保存 {success_count} 条数据到数据库"
         if exists_count > 0:
             message += f"，其中 {exists_count} 条数据已存在"
         return jsonify({'status': 'success', 'message': message})
     except Exception as e:
-        return jsonify({'status': 'error', 'message': str(e)})
\ No newline at end of file
+        db.session.rollback()
+        logger.exception("批量保存采集数据失败: %s", e)
+        return jsonify({'status': 'error', 'message': str(e)})
@@ -2,6 +2,7 @@ from datetime import datetime
 from flask_login import UserMixin
 from werkzeug.security import generate_password_hash, check_password_hash
 from app import db
+from app.url_utils import url_hash
 
 # 角色模型
 class Role(db.Model):
@@ -44,6 +45,10 @@ class User(UserMixin, db.Model):
     def __repr__(self):
         return f'<User {self.username}>'
 
+# 根据插入的URL计算去重哈希（未显式提供 url_hash 时使用）
+def _default_url_hash(context):
+    return url_hash(context.get_current_parameters().get('url'))
+
 # 新闻和话题的多对多关联表
 news_topics = db.Table('news_topics',
     db.Column('news_id', db.Integer, db.ForeignKey('news.id'), primary_key=True),
@@ -57,6 +62,7 @@ class News(db.Model):
     content = db.Column(db.Text)
     source = db.Column(db.String(128))
     url = db.Column(db.String(512))
+    url_hash = db.Column(db.String(40), unique=True, index=True, default=_default_url_hash)  # 规范化URL的哈希，用于去重
     cover = db.Column(db.String(512))  # 封面图片URL
     publish_time = db.Column(db.DateTime)
     crawl_time = db.Column(db.DateTime, default=datetime.utcnow)
@@ -65,13 +71,31 @@ class News(db.Model):
     comments_count = db.Column(db.Integer, default=0)
     views_count = db.Column(db.Integer, default=0)
     is_processed = db.Column(db.Boolean, default=False)
+    minhash = db.Column(db.Text)  # 标题和摘要的MinHash签名（十六进制），用于近似重复检测；为空表示尚未计算，空字符串表示无法计算
+    cluster_id = db.Column(db.Integer, index=True)  # 近似重复簇中最早一条新闻的ID，自身即为簇首时为空
     topics = db.relationship('Topic', secondary=news_topics, lazy='dynamic',
                            backref=db.backref('news_list', lazy='dynamic'))
     comments = db.relationship('Comment', backref='news', lazy='dynamic')
     
+    __table_args__ = (
+        db.Index('ix_news_crawl_time_id', 'crawl_time', 'id'),  # 新闻列表按 (crawl_time, id) 游标分页
+    )
+    
     def __repr__(self):
         return f'<News {self.title}>'
 
+# 新闻近似重复检测的LSH分桶索引（只收录簇首）
+class NewsLshBucket(db.Model):
+    news_id = db.Column(db.Integer, db.ForeignKey('news.id'), primary_key=True)
+    bucket = db.Column(db.String(16), primary_key=True)
+    
+    __table_args__ = (
+        db.Index('ix_news_lsh_bucket_bucket', 'bucket'),
+    )
+    
+    def __repr__(self):
+        return f'<NewsLshBucket {self.news_id} - {self.bucket}>'
+
 # 话题模型
 class Topic(db.Model):
     id = db.Column(db.Integer, primary_key=True)
@@ -81,6 +105,10 @@ class Topic(db.Model):
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     monitors = db.relationship('Monitor', backref='topic', lazy='dynamic')
     
+    __table_args__ = (
+        db.Index('ix_topic_updated_at_id', 'updated_at', 'id'),  # 话题列表按 (updated_at, id) 游标分页
+    )
+    
     def __repr__(self):
         return f'<Topic {self.name}>'
 
@@ -97,6 +125,15 @@ class Comment(db.Model):
     def __repr__(self):
         return f'<Comment {self.id}>'
 
+# 统计计数器（仪表盘的新闻、话题、评论总数），写入时增量维护，定期与实际行数校准
+class StatCounter(db.Model):
+    name = db.Column(db.String(64), primary_key=True)
+    value = db.Column(db.Integer, nullable=False, default=0)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    def __repr__(self):
+        return f'<StatCounter {self.name}={self.value}>'
+
 # 系统设置模型
 class SystemSetting(db.Model):
     id = db.Column(db.Integer, primary_key=True)
@@ -131,10 +168,13 @@ class CrawlTask(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('user.id'))
     keywords = db.Column(db.Text)  # 采集关键词或需求
-    status = db.Column(db.String(32), default='pending')  # pending, running, completed, failed
+    status = db.Column(db.String(32), default='pending', index=True)  # pending, running, completed, failed
     progress = db.Column(db.Integer, default=0)  # 采集进度（百分比）
     total_items = db.Column(db.Integer, default=0)  # 总采集数量
     crawled_items = db.Column(db.Integer, default=0)  # 已采集数量
+    start_time = db.Column(db.DateTime)  # 开始执行时间
+    end_time = db.Column(db.DateTime)  # 执行结束时间
+    error_message = db.Column(db.Text)  # 失败原因
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
@@ -152,6 +192,7 @@ class CrawlData(db.Model):
     content = db.Column(db.Text)  # 初始采集可能为空，深度采集后填充
     source = db.Column(db.String(128))
     url = db.Column(db.String(512), nullable=False)
+    url_hash = db.Column(db.String(40), default=_default_url_hash)  # 规范化URL的哈希，任务内去重
     cover = db.Column(db.String(512))  # 封面图片URL
     publish_time = db.Column(db.DateTime)
     crawl_time = db.Column(db.DateTime, default=datetime.utcnow)
@@ -161,5 +202,9 @@ class CrawlData(db.Model):
     
     news = db.relationship('News', backref='crawl_data')
     
+    __table_args__ = (
+        db.Index('ix_crawl_data_task_id_url_hash', 'task_id', 'url_hash', unique=True),
+    )
+    
     def __repr__(self):
         return f'<CrawlData {self.id} - {self.title}>'
\ No newline at end of file
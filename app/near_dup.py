@@ -0,0 +1,126 @@
+import hashlib
+import random
+import re
+from typing import Dict, List, Optional, Tuple
+
+# MinHash签名长度，按每段4个值切成16段做LSH分桶
+NUM_PERM = 64
+LSH_BANDS = 16
+LSH_ROWS = NUM_PERM // LSH_BANDS
+
+# 估计的Jaccard相似度不低于该值视为近似重复
+SIMILARITY_THRESHOLD = 0.6
+
+# 特征词少于该数量时签名不可靠，不参与去重
+MIN_FEATURES = 3
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+
+# 固定种子生成排列参数，签名在不同进程和重启之间保持一致
+_rng = random.Random(20261018)
+_PERMUTATIONS = [(_rng.randrange(1, _MERSENNE_PRIME), _rng.randrange(0, _MERSENNE_PRIME)) for _ in range(NUM_PERM)]
+
+_WORD_CHAR = re.compile(r'[\u4e00-\u9fa5a-zA-Z0-9]')
+
+
+# 分词并过滤标点和空白
+def tokenize(text: str) -> List[str]:
+    """使用jieba分词，只保留包含中文、英文或数字的词"""
+    if not text:
+        return []
+    from app.nlp import load_jieba
+    return [word.lower() for word in load_jieba().lcut(text) if _WORD_CHAR.search(word)]
+
+
+def _token_hash(token: str) -> int:
+    # 进程内的 hash() 带随机盐，签名需要跨进程稳定
+    return int.from_bytes(hashlib.md5(token.encode('utf-8')).digest()[:8], 'big')
+
+
+# 计算标题和摘要的MinHash签名
+def minhash(title: str, summary: str = '') -> Optional[List[int]]:
+    """
+    计算文章的MinHash签名
+
+    签名中相同位置取值相同的比例即两篇文章词集合Jaccard相似度的估计，
+    转载稿件即使标题略有改动，相似度仍然很高。
+
+    Args:
+        title: 标题
+        summary: 摘要或正文
+
+    Returns:
+        NUM_PERM 个32位整数，特征词太少时返回None
+    """
+    tokens = {_token_hash(token) for token in tokenize(title) + tokenize(summary)}
+    if len(tokens) < MIN_FEATURES:
+        return None
+    return [min((a * token + b) % _MERSENNE_PRIME for token in tokens) & _MAX_HASH
+            for a, b in _PERMUTATIONS]
+
+
+def similarity(a: List[int], b: List[int]) -> float:
+    """由两个签名估计Jaccard相似度"""
+    return sum(1 for x, y in zip(a, b) if x == y) / NUM_PERM
+
+
+def lsh_buckets(signature: List[int]) -> List[str]:
+    """
+    计算签名所在的LSH桶
+
+    每段 LSH_ROWS 个值合起来哈希为一个桶键，相似的签名大概率至少有
+    一段完全相同，因此只需比较同桶的候选。
+    """
+    buckets = []
+    for band in range(LSH_BANDS):
+        rows = signature[band * LSH_ROWS:(band + 1) * LSH_ROWS]
+        key = f'{band}:' + ','.join(map(str, rows))
+        buckets.append(hashlib.md5(key.encode('utf-8')).hexdigest()[:16])
+    return buckets
+
+
+def encode_signature(signature: List[int]) -> str:
+    return ''.join(format(value, '08x') for value in signature)
+
+
+def decode_signature(value: str) -> List[int]:
+    return [int(value[i:i + 8], 16) for i in range(0, len(value), 8)]
+
+
+# 内存中的LSH索引
+class MinHashIndex:
+    """
+    MinHash LSH 索引
+
+    查询只比较与签名共享至少一个桶的候选，不与全部文章两两比较。
+    """
+
+    def __init__(self, threshold: float = SIMILARITY_THRESHOLD):
+        self.threshold = threshold
+        self._entries: List[Tuple[List[int], object]] = []
+        self._buckets: Dict[str, List[int]] = {}
+
+    def add(self, signature: List[int], key) -> None:
+        """加入一个签名，key 为调用方用来识别文章的值"""
+        position = len(self._entries)
+        self._entries.append((signature, key))
+        for bucket in lsh_buckets(signature):
+            self._buckets.setdefault(bucket, []).append(position)
+
+    def find(self, signature: List[int]) -> Optional[object]:
+        """返回最相似的近似重复文章的 key，没有时返回None"""
+        best = None
+        best_score = 0.0
+        # 同一候选可能与签名共享多个桶，只比较一次
+        seen = set()
+        for bucket in lsh_buckets(signature):
+            for position in self._buckets.get(bucket, ()):
+                if position in seen:
+                    continue
+                seen.add(position)
+                other, key = self._entries[position]
+                score = similarity(signature, other)
+                if score >= self.threshold and score > best_score:
+                    best, best_score = key, score
+        return best
@@ -0,0 +1,421 @@
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import insert, select, update
+
+from app import db
+from app.dashboard_stats import adjust_counter
+from app.models import News, NewsLshBucket, CrawlData, Topic, news_topics
+from app.near_dup import MinHashIndex, minhash, lsh_buckets, encode_signature, decode_signature
+from app.url_utils import url_hash
+
+
+# 每批处理的采集数据条数（控制 IN 子句长度）
+PROMOTE_CHUNK_SIZE = 500
+
+# 按分桶查询近似重复候选时每次查询的桶数（每行16个桶，需分批避免超出绑定参数上限）
+BUCKET_QUERY_CHUNK_SIZE = 500
+
+# 批量文本分析时每批读取的新闻条数
+ANALYZE_CHUNK_SIZE = 2000
+
+# 批量重算热度时每批读取的新闻条数
+HEAT_CHUNK_SIZE = 5000
+
+
+# 构造遇到唯一索引冲突时跳过的批量插入语句
+def insert_ignore_duplicates(model, index_elements: List[str]):
+    """
+    生成 INSERT ... ON CONFLICT DO NOTHING 语句
+
+    SQLite 和 PostgreSQL 使用 ON CONFLICT，MySQL 使用 INSERT IGNORE，
+    其他数据库退化为普通插入（依赖调用方事先判重）。
+
+    Args:
+        model: 模型类
+        index_elements: 判断冲突的唯一索引列
+    """
+    dialect = db.session.get_bind().dialect.name
+    if dialect == 'sqlite':
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+    elif dialect == 'postgresql':
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+    elif dialect in ('mysql', 'mariadb'):
+        return insert(model).prefix_with('IGNORE')
+    else:
+        return insert(model)
+    return dialect_insert(model).on_conflict_do_nothing(index_elements=index_elements)
+
+
+# 批量插入并统计实际插入的行数
+def insert_rows_ignore_duplicates(model, index_elements: List[str], rows: List[dict]) -> int:
+    """
+    执行 insert_ignore_duplicates 生成的批量插入
+
+    支持批量 RETURNING 的数据库（SQLite、PostgreSQL）按返回的主键计数，
+    其他数据库使用驱动报告的 rowcount。因唯一索引冲突被跳过的行不计入。
+
+    Args:
+        model: 模型类，需有 id 主键
+        index_elements: 判断冲突的唯一索引列
+        rows: 要插入的行
+
+    Returns:
+        实际插入的行数
+    """
+    if not rows:
+        return 0
+    statement = insert_ignore_duplicates(model, index_elements)
+    if getattr(db.session.get_bind().dialect, 'insert_executemany_returning', False):
+        return len(db.session.execute(statement.returning(model.id), rows).all())
+    return max(db.session.execute(statement, rows).rowcount, 0)
+
+
+def _chunks(items: List[int], size: int) -> Iterable[List[int]]:
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+# 为一批文章查找近似重复簇
+def find_near_duplicates(items: List[Tuple[object, List[int]]]) -> Dict[object, object]:
+    """
+    按LSH分桶查找一批文章的近似重复簇首
+
+    按分桶取出与这批签名共享分桶的已索引簇首，再在内存中与候选和本批
+    中更早的簇首比较，不与全部新闻两两比较。索引中只有簇首，同一条
+    稿件的大量转载只需与簇首比较一次。
+
+    Args:
+        items: 按入库顺序排列的 (key, MinHash签名)，key 在本批内唯一
+
+    Returns:
+        {key: 簇首}，簇首是已有新闻的ID或本批中更早文章的 key；
+        没有近似重复的文章不出现在结果中
+    """
+    all_buckets = list({bucket for _, signature in items for bucket in lsh_buckets(signature)})
+    index = MinHashIndex()
+    indexed_ids = set()
+    for bucket_chunk in _chunks(all_buckets, BUCKET_QUERY_CHUNK_SIZE):
+        candidates = db.session.execute(
+            select(News.id, News.minhash).distinct()
+            .join(NewsLshBucket, NewsLshBucket.news_id == News.id)
+            .where(NewsLshBucket.bucket.in_(bucket_chunk), News.cluster_id.is_(None))
+        ).all()
+        for news_id, signature in candidates:
+            if news_id not in indexed_ids and signature:
+                indexed_ids.add(news_id)
+                index.add(decode_signature(signature), news_id)
+
+    roots = {}
+    for key, signature in items:
+        root = index.find(signature)
+        if root is None:
+            index.add(signature, key)
+        else:
+            roots[key] = root
+    return roots
+
+
+# 批量将采集数据转存为正式新闻
+def promote_crawl_data(data_ids: Optional[List[int]] = None, task_id: Optional[int] = None,
+                       chunk_size: int = PROMOTE_CHUNK_SIZE) -> Tuple[int, int]:
+    """
+    将采集数据批量保存到新闻表
+
+    每批的查询次数固定：一次取出所选的采集数据，一次按URL哈希集合走
+    唯一索引查出已存在的新闻，一次批量插入新闻（冲突时跳过），再查回
+    新闻ID并批量回写 crawl_data.news_id。调用方负责提交事务。
+
+    URL不同但标题和摘要近似的转载稿件仍会保存；签名计算和近似重复
+    聚类需要分词，不在保存请求中进行，由后台评分任务调用
+    index_near_duplicates() 完成。
+
+    Args:
+        data_ids: 要保存的采集数据ID列表
+        task_id: 保存某个采集任务的全部数据（与 data_ids 二选一）
+        chunk_size: 每批处理的条数
+
+    Returns:
+        (新保存的条数, 已存在而跳过的条数)
+    """
+    if data_ids is None:
+        if task_id is None:
+            raise ValueError('data_ids 和 task_id 至少需要指定一个')
+        data_ids = list(db.session.scalars(
+            select(CrawlData.id).where(CrawlData.task_id == task_id).order_by(CrawlData.id)))
+
+    saved_count = 0
+    exists_count = 0
+
+    for chunk in _chunks(list(dict.fromkeys(data_ids)), chunk_size):
+        rows = db.session.execute(
+            select(CrawlData.id, CrawlData.title, CrawlData.content, CrawlData.source, CrawlData.url,
+                   CrawlData.url_hash, CrawlData.cover, CrawlData.publish_time, CrawlData.crawl_time)
+            .where(CrawlData.id.in_(chunk))
+            .order_by(CrawlData.id)
+        ).all()
+        if not rows:
+            continue
+
+        hashes = {row.id: row.url_hash or url_hash(row.url) for row in rows}
+        existing_hashes = set(db.session.scalars(
+            select(News.url_hash).where(News.url_hash.in_(set(hashes.values())))))
+
+        new_news = []
+        data_id_by_hash = {}
+        for row in rows:
+            # 已存在的新闻以及本批中重复的URL都跳过
+            row_hash = hashes[row.id]
+            if row_hash in existing_hashes or row_hash in data_id_by_hash:
+                exists_count += 1
+                continue
+            data_id_by_hash[row_hash] = row.id
+            new_news.append({
+                'title': row.title,
+                'content': row.content,
+                'source': row.source,
+                'url': row.url,
+                'url_hash': row_hash,
+                'cover': row.cover,
+                'publish_time': row.publish_time,
+                'crawl_time': row.crawl_time,
+                'sentiment_score': 0.0,  # 由后台评分任务计算（is_processed 为False时待处理）
+                'heat_score': 0.0,
+                'comments_count': 0,
+                'views_count': 0,
+                'is_processed': False,
+                'minhash': None,  # 由后台任务建立近似重复索引
+                'cluster_id': None,
+            })
+
+        if not new_news:
+            continue
+
+        # 并发保存同一URL时由唯一索引兜底
+        inserted_count = insert_rows_ignore_duplicates(News, ['url_hash'], new_news)
+        inserted = db.session.execute(
+            select(News.id, News.url_hash).where(News.url_hash.in_(list(data_id_by_hash)))).all()
+        db.session.bulk_update_mappings(CrawlData, [
+            {'id': data_id_by_hash[row_hash], 'news_id': news_id} for news_id, row_hash in inserted])
+        # 判重后被并发写入方抢先插入的新闻算作已存在
+        saved_count += inserted_count
+        exists_count += len(new_news) - inserted_count
+
+    # 批量插入不触发ORM事件，仪表盘计数在同一事务中按实际插入的行数增加
+    adjust_counter('news', saved_count)
+    return saved_count, exists_count
+
+
+# 为尚未建立近似重复索引的新闻建立索引
+def index_near_duplicates(chunk_size: int = PROMOTE_CHUNK_SIZE,
+                          max_batches: Optional[int] = None) -> Tuple[int, int]:
+    """
+    按ID顺序为 minhash 为空的新闻计算签名并归入近似重复簇
+
+    只有簇首写入分桶索引，簇成员的 cluster_id 指向簇中最早的一条新闻；
+    特征词太少、无法计算签名的新闻 minhash 记为空字符串，不再重复处理。
+    后台评分任务每轮处理一批新保存的新闻，也可用于补建历史新闻的索引。
+    每批提交一次。
+
+    Args:
+        chunk_size: 每批处理的条数
+        max_batches: 最多处理的批数，默认处理到没有剩余为止
+
+    Returns:
+        (处理的条数, 归入已有簇的条数)
+    """
+    indexed_count = 0
+    clustered_count = 0
+    last_id = 0
+    batches = 0
+    while max_batches is None or batches < max_batches:
+        rows = db.session.execute(
+            select(News.id, News.title, News.content)
+            .where(News.minhash.is_(None), News.id > last_id)
+            .order_by(News.id)
+            .limit(chunk_size)
+        ).all()
+        if not rows:
+            break
+        last_id = rows[-1].id
+        batches += 1
+
+        signatures = {}
+        for row in rows:
+            signature = minhash(row.title, row.content)
+            if signature is not None:
+                signatures[row.id] = signature
+        roots = find_near_duplicates(list(signatures.items()))
+
+        db.session.bulk_update_mappings(News, [
+            {'id': row.id,
+             'minhash': encode_signature(signatures[row.id]) if row.id in signatures else '',
+             'cluster_id': roots.get(row.id)}
+            for row in rows])
+        bucket_rows = [{'news_id': news_id, 'bucket': bucket}
+                       for news_id, signature in signatures.items() if news_id not in roots
+                       for bucket in lsh_buckets(signature)]
+        if bucket_rows:
+            db.session.execute(insert_ignore_duplicates(NewsLshBucket, ['news_id', 'bucket']), bucket_rows)
+        db.session.commit()
+        indexed_count += len(rows)
+        clustered_count += len(roots)
+
+    return indexed_count, clustered_count
+
+
+# 由已保存的新闻重建主机-来源索引
+def rebuild_source_index(chunk_size: int = PROMOTE_CHUNK_SIZE, min_samples: int = 3,
+                         min_share: float = 0.8) -> Tuple[int, int]:
+    """
+    按ID顺序分批读取新闻的URL和来源，统计来源固定的主机并整体替换索引
+
+    Args:
+        chunk_size: 每批读取的条数
+        min_samples: 主机至少出现的次数
+        min_share: 最常见来源的最低占比
+
+    Returns:
+        (读取的新闻条数, 收录的主机数)，索引被关闭时收录数为0
+    """
+    from app.source_index import build_host_sources, get_source_index
+
+    def iter_pairs():
+        nonlocal scanned
+        last_id = 0
+        while True:
+            rows = db.session.execute(
+                select(News.id, News.url, News.source)
+                .where(News.id > last_id)
+                .order_by(News.id)
+                .limit(chunk_size)
+            ).all()
+            if not rows:
+                return
+            last_id = rows[-1].id
+            scanned += len(rows)
+            for row in rows:
+                yield row.url, row.source
+
+    scanned = 0
+    entries = build_host_sources(iter_pairs(), min_samples=min_samples, min_share=min_share)
+    source_index = get_source_index()
+    if source_index is None:
+        return scanned, 0
+    return scanned, source_index.replace(entries)
+
+
+# 批量分析已保存的新闻
+def analyze_stored_news(chunk_size: int = ANALYZE_CHUNK_SIZE, workers: Optional[int] = None,
+                        reprocess: bool = False, max_batches: Optional[int] = None) -> int:
+    """
+    按ID顺序批量计算新闻的情感得分和热度，关联匹配的话题并标记为已处理
+
+    标题和正文只分词一次，情感、话题匹配共用分词结果；分词在进程池中
+    并行执行，整个过程复用同一个进程池。每批提交一次，中途中断后再次
+    运行会从尚未处理的新闻继续；同一条新闻重复处理的结果相同，多个
+    进程同时运行也不会出错。
+
+    Args:
+        chunk_size: 每批读取的条数
+        workers: 分词进程数，默认由 get_nlp_workers() 决定
+        reprocess: 是否重新处理已处理过的新闻
+        max_batches: 最多处理的批数，默认处理到没有剩余为止
+
+    Returns:
+        处理的新闻条数
+    """
+    from concurrent.futures import ProcessPoolExecutor
+    from types import SimpleNamespace
+    from app.nlp import analyze_documents, get_nlp_workers
+    from app.utils import calculate_heat
+
+    topics = db.session.execute(select(Topic.id, Topic.name)).all()
+    topic_ids = {topic.name: topic.id for topic in topics}
+    workers = get_nlp_workers() if workers is None else workers
+    executor = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+
+    processed_count = 0
+    last_id = 0
+    batches = 0
+    try:
+        while max_batches is None or batches < max_batches:
+            query = select(News.id, News.title, News.content, News.publish_time,
+                           News.comments_count, News.views_count).where(News.id > last_id)
+            if not reprocess:
+                query = query.where(News.is_processed.isnot(True))
+            rows = db.session.execute(query.order_by(News.id).limit(chunk_size)).all()
+            if not rows:
+                break
+            last_id = rows[-1].id
+            batches += 1
+
+            results = analyze_documents([f"{row.title}\n{row.content or ''}" for row in rows],
+                                        topic_names=list(topic_ids), workers=workers, executor=executor)
+            updates = []
+            for row, result in zip(rows, results):
+                # 热度依赖刚算出的情感得分
+                heat_score = calculate_heat(SimpleNamespace(
+                    publish_time=row.publish_time, comments_count=row.comments_count or 0,
+                    views_count=row.views_count or 0, sentiment_score=result.sentiment))
+                updates.append({'id': row.id, 'sentiment_score': result.sentiment,
+                                'heat_score': heat_score, 'is_processed': True})
+            db.session.bulk_update_mappings(News, updates)
+            links = [{'news_id': row.id, 'topic_id': topic_ids[name]}
+                     for row, result in zip(rows, results) for name in result.topics]
+            if links:
+                db.session.execute(insert_ignore_duplicates(news_topics, ['news_id', 'topic_id']), links)
+            db.session.commit()
+            processed_count += len(rows)
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    return processed_count
+
+
+# 批量重算热度
+def recompute_heat_scores(chunk_size: int = HEAT_CHUNK_SIZE) -> Tuple[int, int]:
+    """
+    按当前时间重新计算全部新闻的热度
+
+    热度随发布时间衰减，需要定期重算才能保持按热度排序的结果准确。
+    每批按列取出评论数、浏览量、发布时间和情感得分，一次算出整批的
+    热度，只把有变化的行用 executemany 写回，每批提交一次。
+
+    Args:
+        chunk_size: 每批读取的条数
+
+    Returns:
+        (检查的条数, 更新的条数)
+    """
+    from datetime import datetime
+    from app.heat import compute_heat_scores
+
+    now = datetime.now()
+    checked_count = 0
+    updated_count = 0
+    last_id = 0
+    while True:
+        rows = db.session.execute(
+            select(News.id, News.comments_count, News.views_count, News.publish_time,
+                   News.sentiment_score, News.heat_score)
+            .where(News.id > last_id)
+            .order_by(News.id)
+            .limit(chunk_size)
+        ).all()
+        if not rows:
+            break
+        last_id = rows[-1].id
+
+        ids, comments, views, published, sentiment, current = zip(*rows)
+        scores = compute_heat_scores(comments, views, published, sentiment, now=now)
+        updates = [{'id': news_id, 'heat_score': float(score)}
+                   for news_id, score, old in zip(ids, scores, current) if old is None or score != old]
+        if updates:
+            # ORM 按主键批量更新，以 executemany 执行
+            db.session.execute(update(News), updates)
+        db.session.commit()
+        checked_count += len(rows)
+        updated_count += len(updates)
+
+    return checked_count, updated_count
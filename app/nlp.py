@@ -0,0 +1,196 @@
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterable, List, NamedTuple, Optional, Sequence
+
+# 情感分析关键词库
+POSITIVE_WORDS = {
+    '好', '优秀', '棒', '赞', '精彩', '完美', '满意', '喜欢', '推荐',
+    '成功', '进步', '创新', '高效', '专业', '可靠', '安全', '优质', '舒适'
+}
+
+NEGATIVE_WORDS = {
+    '差', '糟糕', '坏', '烂', '失望', '失败', '问题', '错误', '缺点',
+    '风险', '危险', '不安全', '低效', '麻烦', '困扰', '讨厌', '反对', '拒绝'
+}
+
+# 批量分析时每个子进程一次处理的文档数
+NLP_CHUNK_SIZE = 200
+
+# jieba 前缀词典的缓存文件，所有进程共用，避免每个进程各自从词典文本构建
+DEFAULT_JIEBA_CACHE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'instance', 'jieba.cache')
+
+_jieba_ready = False
+_jieba_lock = threading.Lock()
+
+
+# 单篇文档的分析结果
+class DocumentAnalysis(NamedTuple):
+    sentiment: float
+    keywords: List[str]
+    topics: List[str]
+
+
+def get_jieba_cache_path() -> Optional[str]:
+    """jieba 词典缓存路径，读取环境变量 JIEBA_CACHE_PATH，设为空时使用 jieba 默认的临时目录"""
+    path = os.getenv('JIEBA_CACHE_PATH', DEFAULT_JIEBA_CACHE_PATH)
+    return os.path.abspath(path) if path else None
+
+
+# 按需加载 jieba
+def load_jieba():
+    """
+    导入 jieba 并加载词典，只在第一次调用时执行
+
+    jieba 和词典在模块导入时不加载，Web进程和不做分词的脚本不必为此付出
+    启动时间。词典缓存写在 get_jieba_cache_path() 处，缓存不存在时第一次
+    构建并写入，之后的进程直接读取缓存。
+
+    Returns:
+        jieba 模块
+    """
+    global _jieba_ready
+    import jieba
+
+    if not _jieba_ready:
+        with _jieba_lock:
+            if not _jieba_ready:
+                cache_path = get_jieba_cache_path()
+                if cache_path:
+                    os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+                    jieba.dt.tmp_dir, jieba.dt.cache_file = os.path.split(cache_path)
+                jieba.initialize()
+                _jieba_ready = True
+    return jieba
+
+
+def _default_tfidf():
+    load_jieba()
+    import jieba.analyse
+    return jieba.analyse.default_tfidf
+
+
+def warm_up() -> None:
+    """预先加载分词词典和IDF词典，供后台线程或子进程初始化时调用"""
+    _default_tfidf()
+
+
+def start_warm_up() -> threading.Thread:
+    """在后台线程中预热分词，不阻塞调用方"""
+    thread = threading.Thread(target=warm_up, name='nlp-warm-up', daemon=True)
+    thread.start()
+    return thread
+
+
+def tokenize(text: str) -> List[str]:
+    """分词，每篇文档只需分一次，结果供情感、关键词和话题匹配共用"""
+    return load_jieba().lcut(text) if text else []
+
+
+def sentiment_from_tokens(tokens: Iterable[str]) -> float:
+    """基于关键词匹配的情感得分，返回-1.0到1.0之间的分数"""
+    positive_count = 0
+    negative_count = 0
+    for word in tokens:
+        if word in POSITIVE_WORDS:
+            positive_count += 1
+        elif word in NEGATIVE_WORDS:
+            negative_count += 1
+
+    total_emotional_words = positive_count + negative_count
+    if total_emotional_words == 0:
+        return 0.0
+    return (positive_count - negative_count) / total_emotional_words
+
+
+def keywords_from_tokens(tokens: Iterable[str], topK: int = 10) -> List[str]:
+    """
+    由分词结果按TF-IDF提取关键词
+
+    与 jieba.analyse.extract_tags 使用相同的IDF词典、停用词和排序规则，
+    结果一致，只是不再重新分词。
+    """
+    tfidf = _default_tfidf()
+    freq = {}
+    for word in tokens:
+        if len(word.strip()) < 2 or word.lower() in tfidf.stop_words:
+            continue
+        freq[word] = freq.get(word, 0.0) + 1.0
+    total = sum(freq.values())
+    for word in freq:
+        freq[word] *= tfidf.idf_freq.get(word, tfidf.median_idf) / total
+    tags = sorted(freq, key=freq.__getitem__, reverse=True)
+    return tags[:topK] if topK else tags
+
+
+def match_topics(text: str, tokens: Sequence[str], topic_names: Sequence[str]) -> List[str]:
+    """返回在文档中出现的话题名称（与分词结果中的词相同或出现在原文中）"""
+    if not topic_names:
+        return []
+    token_set = set(tokens)
+    return [name for name in topic_names if name in token_set or name in text]
+
+
+# 分析单篇文档
+def analyze_document(text: str, topK: int = 10, topic_names: Sequence[str] = ()) -> DocumentAnalysis:
+    """
+    分词一次，同时得到情感得分、关键词和匹配的话题
+
+    Args:
+        text: 文档文本
+        topK: 关键词数量
+        topic_names: 需要匹配的话题名称
+
+    Returns:
+        DocumentAnalysis
+    """
+    tokens = tokenize(text)
+    return DocumentAnalysis(
+        sentiment=sentiment_from_tokens(tokens),
+        keywords=keywords_from_tokens(tokens, topK),
+        topics=match_topics(text or '', tokens, topic_names),
+    )
+
+
+def _analyze_chunk(args) -> List[DocumentAnalysis]:
+    texts, topK, topic_names = args
+    return [analyze_document(text, topK, topic_names) for text in texts]
+
+
+# 批量分析文档
+def analyze_documents(texts: Sequence[str], topK: int = 10, topic_names: Sequence[str] = (),
+                      workers: Optional[int] = None, chunk_size: int = NLP_CHUNK_SIZE,
+                      executor: Optional[ProcessPoolExecutor] = None) -> List[DocumentAnalysis]:
+    """
+    批量分析文档，按块分给多个进程并行分词
+
+    jieba 分词是纯Python计算，多线程受GIL限制，这里使用进程池；
+    workers 为1或文档不足一块时在当前进程中执行。
+
+    Args:
+        texts: 文档文本列表
+        topK: 每篇文档的关键词数量
+        topic_names: 需要匹配的话题名称
+        workers: 进程数，默认由 get_nlp_workers() 决定
+        chunk_size: 每个任务包含的文档数
+        executor: 复用的进程池，多批调用时避免每批都重新启动子进程和加载词典
+
+    Returns:
+        与 texts 顺序一致的分析结果
+    """
+    chunks = [(list(texts[start:start + chunk_size]), topK, list(topic_names))
+              for start in range(0, len(texts), chunk_size)]
+    if executor is not None and len(chunks) > 1:
+        return [result for results in executor.map(_analyze_chunk, chunks) for result in results]
+
+    workers = get_nlp_workers() if workers is None else workers
+    if workers <= 1 or len(chunks) <= 1:
+        return [result for chunk in chunks for result in _analyze_chunk(chunk)]
+
+    with ProcessPoolExecutor(max_workers=min(workers, len(chunks))) as executor:
+        return [result for results in executor.map(_analyze_chunk, chunks) for result in results]
+
+
+def get_nlp_workers() -> int:
+    """批量分析的进程数，读取环境变量 NLP_WORKERS，未设置时使用CPU核数"""
+    return int(os.getenv('NLP_WORKERS', 0)) or os.cpu_count() or 1
@@ -0,0 +1,129 @@
+import base64
+import json
+from datetime import datetime
+from typing import Any, List, Optional, Sequence
+
+from sqlalchemy import tuple_
+
+# 游标中的日期时间值加上前缀，解码时还原为datetime
+_DATETIME_PREFIX = 'dt:'
+
+# 游标中允许出现的排序键类型
+_KEY_TYPES = (datetime, int, str)
+
+
+def encode_cursor(values: Sequence[Any], direction: str = 'next') -> str:
+    """
+    把排序键编码为不透明的游标字符串
+
+    Args:
+        values: 排序键的值，如 (crawl_time, id)
+        direction: 'next' 表示取这些键之后的一页，'prev' 表示之前的一页
+    """
+    keys = [_DATETIME_PREFIX + value.isoformat() if isinstance(value, datetime) else value for value in values]
+    payload = json.dumps({'d': direction, 'k': keys}, separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor: str) -> tuple:
+    """
+    解码 encode_cursor 生成的游标
+
+    Returns:
+        (方向, 排序键的值列表)
+
+    Raises:
+        ValueError: 游标格式不正确，或排序键不是 datetime、int、str
+    """
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))
+        direction, keys = payload['d'], payload['k']
+        if direction not in ('next', 'prev') or not isinstance(keys, list):
+            raise ValueError
+        keys = [datetime.fromisoformat(key[len(_DATETIME_PREFIX):])
+                if isinstance(key, str) and key.startswith(_DATETIME_PREFIX) else key for key in keys]
+        # bool 是 int 的子类，也不能作为排序键
+        if any(isinstance(key, bool) or not isinstance(key, _KEY_TYPES) for key in keys):
+            raise ValueError
+        return direction, keys
+    except (ValueError, TypeError, KeyError, AttributeError) as e:
+        raise ValueError(f'无效的分页游标: {cursor!r}') from e
+
+
+# 游标分页结果
+class KeysetPagination:
+    """
+    游标分页的一页结果，属性与 Flask-SQLAlchemy 的 Pagination 相近
+
+    没有页码和总页数；next_cursor / prev_cursor 分别用于取下一页和上一页，
+    total 由调用方按需提供（如计数器中的估计值），默认为None。
+    """
+
+    def __init__(self, items: List[Any], per_page: int, has_next: bool, has_prev: bool,
+                 next_cursor: Optional[str], prev_cursor: Optional[str], total: Optional[int] = None):
+        self.items = items
+        self.per_page = per_page
+        self.has_next = has_next
+        self.has_prev = has_prev
+        self.next_cursor = next_cursor
+        self.prev_cursor = prev_cursor
+        self.total = total
+
+
+# 按排序键做游标分页
+def keyset_paginate(query, order_columns: Sequence[Any], per_page: int, cursor: Optional[str] = None,
+                    total: Optional[int] = None) -> KeysetPagination:
+    """
+    按排序键降序做游标分页
+
+    用 (排序列, ...) < 游标值 的条件代替 OFFSET，配合以这些列建立的复合
+    索引，每一页都只需按索引读取 per_page + 1 行，与页的位置无关。排序列
+    的最后一列应为主键，保证顺序唯一；排序列不能为空。
+
+    Args:
+        query: 未排序的查询，如 News.query
+        order_columns: 排序列，如 (News.crawl_time, News.id)
+        per_page: 每页条数
+        cursor: 上一次返回的 next_cursor 或 prev_cursor，为空时取第一页
+        total: 总数（可选），原样放入结果
+
+    Returns:
+        KeysetPagination
+
+    Raises:
+        ValueError: 游标格式不正确，或排序键与排序列的类型不符
+    """
+    direction, keys = decode_cursor(cursor) if cursor else ('next', None)
+    if keys is not None and (len(keys) != len(order_columns) or
+                             not all(isinstance(key, column.type.python_type)
+                                     for key, column in zip(keys, order_columns))):
+        raise ValueError(f'无效的分页游标: {cursor!r}')
+
+    key_tuple = tuple_(*order_columns)
+    if direction == 'next':
+        if keys is not None:
+            query = query.filter(key_tuple < tuple_(*keys))
+        rows = query.order_by(*[column.desc() for column in order_columns]).limit(per_page + 1).all()
+        has_more = len(rows) > per_page
+        items = rows[:per_page]
+        has_next, has_prev = has_more, keys is not None
+    else:
+        # 向前翻页时按升序取紧挨着游标的一页，再倒回降序
+        query = query.filter(key_tuple > tuple_(*keys))
+        rows = query.order_by(*[column.asc() for column in order_columns]).limit(per_page + 1).all()
+        has_more = len(rows) > per_page
+        items = rows[:per_page][::-1]
+        has_next, has_prev = True, has_more
+
+    def keys_of(item):
+        return [getattr(item, column.key) for column in order_columns]
+
+    return KeysetPagination(
+        items=items,
+        per_page=per_page,
+        has_next=has_next and bool(items),
+        has_prev=has_prev and bool(items),
+        next_cursor=encode_cursor(keys_of(items[-1]), 'next') if has_next and items else None,
+        prev_cursor=encode_cursor(keys_of(items[0]), 'prev') if has_prev and items else None,
+        total=total,
+    )
@@ -0,0 +1,148 @@
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict
+
+
+# 令牌桶
+class TokenBucket:
+    """
+    线程安全的令牌桶
+
+    令牌可以透支：并发的请求按到达顺序预约令牌，各自得到需要等待的
+    时间，而不是一起醒来争抢。
+    """
+
+    def __init__(self, rate: float, capacity: float = 1.0):
+        self.rate = rate
+        self.capacity = max(1.0, capacity)
+        self.tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def reserve(self) -> float:
+        """取走一个令牌，返回需要等待的秒数"""
+        with self._lock:
+            self._refill(time.monotonic())
+            self.tokens -= 1
+            if self.tokens >= 0:
+                return 0.0
+            return -self.tokens / self.rate
+
+    def set_rate(self, rate: float) -> None:
+        """调整速率，已积累的令牌按旧速率结算"""
+        with self._lock:
+            self._refill(time.monotonic())
+            self.rate = rate
+
+    def drain(self) -> None:
+        """清空积累的令牌，下一个请求至少等待一个令牌周期"""
+        with self._lock:
+            self._refill(time.monotonic())
+            self.tokens = min(self.tokens, 0.0)
+
+
+# 按主机划分的礼貌性预算
+class HostBudget:
+    """
+    按主机限制抓取压力：同一主机的并发请求数和请求速率
+
+    每个主机一个令牌桶，速率按加性增、乘性减自适应调整：响应正常时
+    逐步提速到 max_rate，遇到验证码或异常页面时减半并清空令牌，最低
+    降到 min_rate。多个工作线程共享同一个实例，这样无论开多少个线程，
+    单个主机受到的请求频率都不会超过它当前能承受的速率。
+    """
+
+    def __init__(self, max_concurrency: int = 1, rate: float = 0.5, burst: float = 1.0,
+                 min_rate: float = 0.05, max_rate: float = 2.0):
+        self.max_concurrency = max(1, max_concurrency)
+        self.rate = rate
+        self.burst = burst
+        self.min_rate = min(min_rate, rate)
+        self.max_rate = max(max_rate, rate)
+        # 每次正常响应的提速步长
+        self.increase_step = rate * 0.1
+        self._lock = threading.Lock()
+        self._semaphores: Dict[str, threading.BoundedSemaphore] = {}
+        self._buckets: Dict[str, TokenBucket] = {}
+
+    def _semaphore(self, host: str) -> threading.BoundedSemaphore:
+        with self._lock:
+            semaphore = self._semaphores.get(host)
+            if semaphore is None:
+                semaphore = threading.BoundedSemaphore(self.max_concurrency)
+                self._semaphores[host] = semaphore
+            return semaphore
+
+    def bucket(self, host: str) -> TokenBucket:
+        """获取主机对应的令牌桶"""
+        with self._lock:
+            bucket = self._buckets.get(host)
+            if bucket is None:
+                bucket = TokenBucket(self.rate, self.burst)
+                self._buckets[host] = bucket
+            return bucket
+
+    @contextmanager
+    def slot(self, host: str):
+        """
+        占用主机的一个请求名额，必要时等待令牌
+
+        Args:
+            host: 目标主机名
+        """
+        semaphore = self._semaphore(host)
+        semaphore.acquire()
+        try:
+            wait = self.bucket(host).reserve()
+            if wait > 0:
+                time.sleep(wait)
+            yield
+        finally:
+            semaphore.release()
+
+    def report(self, host: str, healthy: bool) -> float:
+        """
+        反馈一次请求的结果，调整主机的请求速率
+
+        Args:
+            host: 目标主机名
+            healthy: 响应是否正常（非验证码、非异常短页面）
+
+        Returns:
+            调整后的速率（次/秒）
+        """
+        bucket = self.bucket(host)
+        if healthy:
+            rate = min(self.max_rate, bucket.rate + self.increase_step)
+        else:
+            rate = max(self.min_rate, bucket.rate * 0.5)
+        bucket.set_rate(rate)
+        if not healthy:
+            bucket.drain()
+        return rate
+
+
+_host_budget = None
+_host_budget_lock = threading.Lock()
+
+
+def get_host_budget() -> HostBudget:
+    """获取进程内共享的主机预算（由环境变量配置）"""
+    global _host_budget
+    if _host_budget is None:
+        with _host_budget_lock:
+            if _host_budget is None:
+                _host_budget = HostBudget(
+                    max_concurrency=int(os.getenv('CRAWL_HOST_CONCURRENCY', 2)),
+                    rate=float(os.getenv('CRAWL_HOST_RATE', 0.5)),
+                    burst=float(os.getenv('CRAWL_HOST_BURST', 1)),
+                    min_rate=float(os.getenv('CRAWL_HOST_MIN_RATE', 0.05)),
+                    max_rate=float(os.getenv('CRAWL_HOST_MAX_RATE', 2.0)),
+                )
+    return _host_budget
@@ -0,0 +1,174 @@
+import os
+import sqlite3
+import threading
+import time
+from collections import Counter, OrderedDict, defaultdict
+from typing import Iterable, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+from app.source_registry import get_source_classifier
+
+# 默认索引文件放在实例目录下，与HTTP缓存在一起
+DEFAULT_INDEX_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'instance', 'source_index.sqlite')
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS source_host (
+    host TEXT PRIMARY KEY,
+    source TEXT NOT NULL,
+    source_type TEXT NOT NULL,
+    samples INTEGER NOT NULL
+);
+"""
+
+# (主机名, 来源, 来源类型, 样本数)
+SourceEntry = Tuple[str, str, str, int]
+
+
+def host_of(url: str) -> str:
+    """返回URL中的小写主机名，无法解析时返回空字符串"""
+    try:
+        return (urlsplit(url or '').hostname or '').lower()
+    except ValueError:
+        return ''
+
+
+# 由历史新闻统计每个主机对应的来源
+def build_host_sources(pairs: Iterable[Tuple[str, str]], min_samples: int = 3,
+                       min_share: float = 0.8) -> List[SourceEntry]:
+    """
+    统计 (URL, 来源) 对，找出来源固定的主机
+
+    只收录样本数不少于 min_samples、且最常见的来源占比不低于 min_share
+    的主机。百家号、百度跳转链接等同一主机下来源各不相同的，不会收录。
+
+    Args:
+        pairs: 已保存新闻的 (URL, 来源)
+        min_samples: 主机至少出现的次数
+        min_share: 最常见来源的最低占比
+
+    Returns:
+        (主机名, 来源, 来源类型, 样本数) 列表
+    """
+    counters = defaultdict(Counter)
+    for url, source in pairs:
+        host = host_of(url)
+        if host and source:
+            counters[host][source] += 1
+
+    classifier = get_source_classifier()
+    entries = []
+    for host, counter in counters.items():
+        total = sum(counter.values())
+        source, count = counter.most_common(1)[0]
+        if total >= min_samples and count / total >= min_share:
+            entries.append((host, source, classifier.classify(source), total))
+    return entries
+
+
+# 主机到来源的索引
+class SourceIndex:
+    """
+    基于SQLite的主机-来源索引，前面加一层进程内LRU缓存
+
+    查询先看LRU（包括未收录的主机），未命中时查一次数据库。LRU条目在
+    cache_ttl 秒后失效，其他进程重建索引后，抓取进程不需要重启就能用上。
+    每个线程使用自己的数据库连接，可以在抓取线程之间共享。
+    """
+
+    def __init__(self, path: str, cache_size: int = 4096, cache_ttl: float = 600):
+        self.path = path
+        self.cache_size = cache_size
+        self.cache_ttl = cache_ttl
+        self._local = threading.local()
+        self._cache: OrderedDict = OrderedDict()
+        self._cache_lock = threading.Lock()
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.executescript(_SCHEMA)
+            self._local.conn = conn
+        return conn
+
+    def lookup(self, host: str) -> Optional[Tuple[str, str]]:
+        """
+        按主机名查询来源
+
+        Returns:
+            (来源, 来源类型)，主机未收录时返回None
+        """
+        if not host:
+            return None
+        now = time.monotonic()
+        with self._cache_lock:
+            cached = self._cache.get(host)
+            if cached is not None and cached[1] > now:
+                self._cache.move_to_end(host)
+                return cached[0]
+
+        row = self._connection().execute(
+            'SELECT source, source_type FROM source_host WHERE host = ?', (host,)).fetchone()
+        entry = (row[0], row[1]) if row else None
+        with self._cache_lock:
+            self._cache[host] = (entry, now + self.cache_ttl)
+            self._cache.move_to_end(host)
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return entry
+
+    def lookup_url(self, url: str) -> Optional[Tuple[str, str]]:
+        """按URL的主机名查询来源"""
+        return self.lookup(host_of(url))
+
+    def replace(self, entries: Iterable[SourceEntry]) -> int:
+        """
+        用新的统计结果整体替换索引
+
+        Returns:
+            收录的主机数
+        """
+        entries = list(entries)
+        conn = self._connection()
+        conn.execute('BEGIN')
+        try:
+            conn.execute('DELETE FROM source_host')
+            conn.executemany('INSERT INTO source_host (host, source, source_type, samples) VALUES (?, ?, ?, ?)',
+                             entries)
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+        with self._cache_lock:
+            self._cache.clear()
+        return len(entries)
+
+    def __len__(self) -> int:
+        return self._connection().execute('SELECT COUNT(*) FROM source_host').fetchone()[0]
+
+
+_source_index = None
+_source_index_lock = threading.Lock()
+
+
+def get_source_index() -> Optional[SourceIndex]:
+    """
+    获取进程内共享的来源索引（由环境变量配置）
+
+    SOURCE_INDEX_PATH 设为空字符串时关闭索引，返回None。
+    """
+    global _source_index
+    path = os.getenv('SOURCE_INDEX_PATH', DEFAULT_INDEX_PATH)
+    if not path:
+        return None
+    if _source_index is None:
+        with _source_index_lock:
+            if _source_index is None:
+                _source_index = SourceIndex(
+                    path,
+                    cache_size=int(os.getenv('SOURCE_INDEX_CACHE_SIZE', 4096)),
+                    cache_ttl=float(os.getenv('SOURCE_INDEX_CACHE_TTL', 600)),
+                )
+    return _source_index
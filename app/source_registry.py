@@ -0,0 +1,145 @@
+import json
+import os
+import threading
+from collections import deque
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+# 默认的媒体名录，可用环境变量 MEDIA_REGISTRY_PATH 指向更大的名录文件
+DEFAULT_REGISTRY_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'media_registry.json')
+
+UNKNOWN_SOURCE_TYPE = '未知'
+OTHER_SOURCE_TYPE = '其他媒体'
+
+
+# 名录中的一家媒体
+class MediaOutlet(NamedTuple):
+    name: str
+    source_type: str
+    priority: int  # 所属类别在名录中的顺序，越小越优先
+
+
+class _Automaton:
+    """
+    Aho-Corasick 自动机，一次扫描找出文本中优先级最高的匹配
+
+    每个状态只记录以该状态结尾的最优匹配（类别优先级最小，其次名称更长），
+    失败链接上的匹配在构建时合并进来，扫描时不需要沿失败链接回溯输出。
+    """
+
+    def __init__(self, patterns: Dict[str, MediaOutlet]):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._best: List[Optional[Tuple[Tuple[int, int], MediaOutlet]]] = [None]
+
+        for pattern, outlet in patterns.items():
+            state = 0
+            for char in pattern:
+                next_state = self._goto[state].get(char)
+                if next_state is None:
+                    next_state = len(self._goto)
+                    self._goto[state][char] = next_state
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._best.append(None)
+                state = next_state
+            self._best[state] = self._better(self._best[state], ((outlet.priority, -len(pattern)), outlet))
+
+        # 按层次遍历建立失败链接
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                fail = self._fail[state]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[next_state] = self._goto[fail].get(char, 0)
+                self._best[next_state] = self._better(self._best[next_state], self._best[self._fail[next_state]])
+                queue.append(next_state)
+
+    @staticmethod
+    def _better(left, right):
+        if left is None:
+            return right
+        if right is None:
+            return left
+        return left if left[0] <= right[0] else right
+
+    def search(self, text: str) -> Optional[MediaOutlet]:
+        goto, fail, best_of = self._goto, self._fail, self._best
+        state = 0
+        best = None
+        for char in text:
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if best_of[state] is not None:
+                best = self._better(best, best_of[state])
+        return best[1] if best else None
+
+
+# 媒体来源分类器
+class SourceClassifier:
+    """
+    由媒体名录编译出的来源分类器
+
+    名称和别名编译为 Aho-Corasick 自动机，来源名称只需扫描一遍；域名按
+    后缀逐级查表，子域名优先于上级域名。多个名称同时出现时，按名录中
+    类别的先后顺序取第一个类别（官方媒体优先于商业媒体，再到自媒体）。
+    """
+
+    def __init__(self, registry: Dict):
+        patterns: Dict[str, MediaOutlet] = {}
+        self._domains: Dict[str, MediaOutlet] = {}
+        for priority, category in enumerate(registry.get('categories', [])):
+            for entry in category.get('outlets', []):
+                outlet = MediaOutlet(entry['name'], category['type'], priority)
+                for name in [entry['name'], *entry.get('aliases', [])]:
+                    if name and name.lower() not in patterns:
+                        patterns[name.lower()] = outlet
+                for domain in entry.get('domains', []):
+                    self._domains.setdefault(domain.lower().strip('.'), outlet)
+        self._automaton = _Automaton(patterns)
+        self.size = len(patterns)
+
+    @classmethod
+    def from_file(cls, path: str) -> 'SourceClassifier':
+        """从JSON名录文件加载"""
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls(json.load(f))
+
+    def match(self, source: str) -> Optional[MediaOutlet]:
+        """按来源名称匹配媒体，名称中不包含名录里的任何媒体时返回None"""
+        if not source:
+            return None
+        return self._automaton.search(source.lower())
+
+    def match_host(self, host: str) -> Optional[MediaOutlet]:
+        """按主机名匹配媒体，例如 finance.sina.com.cn 匹配 sina.com.cn"""
+        host = (host or '').lower().strip('.')
+        while host:
+            outlet = self._domains.get(host)
+            if outlet is not None:
+                return outlet
+            _, _, host = host.partition('.')
+        return None
+
+    def classify(self, source: str) -> str:
+        """返回来源类型（官方媒体、商业媒体、自媒体等）"""
+        if not source:
+            return UNKNOWN_SOURCE_TYPE
+        outlet = self.match(source)
+        return outlet.source_type if outlet else OTHER_SOURCE_TYPE
+
+
+_classifier = None
+_classifier_lock = threading.Lock()
+
+
+def get_source_classifier() -> SourceClassifier:
+    """获取进程内共用的分类器，名录只在第一次调用时加载和编译"""
+    global _classifier
+    if _classifier is None:
+        with _classifier_lock:
+            if _classifier is None:
+                _classifier = SourceClassifier.from_file(os.getenv('MEDIA_REGISTRY_PATH') or DEFAULT_REGISTRY_PATH)
+    return _classifier
@@ -0,0 +1,414 @@
+import logging
+import os
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import List, Optional
+
+from sqlalchemy import select
+
+from app import db
+from app.models import CrawlTask, CrawlData
+from app.url_utils import url_hash
+
+logger = logging.getLogger(__name__)
+
+
+# 拆分任务关键词（支持逗号、顿号、分号和换行分隔多个关键词）
+def split_task_keywords(keywords: str) -> List[str]:
+    """将任务的关键词文本拆分为关键词列表"""
+    if not keywords:
+        return []
+    return [keyword.strip() for keyword in re.split(r'[,，、;；\n]+', keywords) if keyword.strip()]
+
+
+# 将一条抓取结果转换为 crawl_data 表的行
+def _crawl_data_row(task_id: int, news_item: dict, item_hash: str) -> dict:
+    return {
+        'task_id': task_id,
+        'title': news_item['title'],
+        'content': news_item['content'],
+        'source': news_item['source'],
+        'url': news_item['url'],
+        'url_hash': item_hash,
+        'cover': news_item['cover_image'],
+        'publish_time': news_item['publish_datetime'],
+        'crawl_time': datetime.now(),
+        'is_deep_crawled': False,
+    }
+
+
+# 执行单个采集任务
+def run_crawl_task(task_id: int) -> None:
+    """
+    执行采集任务，边解析边分批写入 crawl_data
+
+    抓取结果按 CRAWL_COMMIT_BATCH_SIZE 条一批写入并提交，内存占用
+    与页数无关；任务中途失败时已提交的数据会保留，前端也能在任务
+    执行过程中看到部分结果和真实进度。
+
+    需要在应用上下文中调用。任务应已被置为 running 状态。
+
+    Args:
+        task_id: 采集任务ID
+    """
+    from app.utils import iter_baidu_news
+    from app.news_store import insert_rows_ignore_duplicates
+
+    task = db.session.get(CrawlTask, task_id)
+    if task is None:
+        return
+
+    keywords = split_task_keywords(task.keywords)
+    pages = int(os.getenv('CRAWL_TASK_PAGES', 1))
+    num_per_page = int(os.getenv('CRAWL_TASK_NUM_PER_PAGE', 20))
+    batch_size = max(1, int(os.getenv('CRAWL_COMMIT_BATCH_SIZE', 50)))
+    units = [(keyword, page) for keyword in keywords for page in range(1, pages + 1)]
+    buffer = []
+    # 任务内已采集的URL哈希，跨页去重（唯一索引兜底）
+    seen_hashes = set(db.session.scalars(select(CrawlData.url_hash).where(CrawlData.task_id == task.id)))
+
+    def flush(progress=None):
+        # 批量插入一批数据并更新进度，同一事务提交
+        if buffer:
+            inserted = insert_rows_ignore_duplicates(CrawlData, ['task_id', 'url_hash'], buffer)
+            task.crawled_items = (task.crawled_items or 0) + inserted
+            buffer.clear()
+        if progress is not None:
+            task.progress = progress
+        # 进度没有变化时 onupdate 不会触发，显式刷新心跳
+        task.updated_at = datetime.utcnow()
+        db.session.commit()
+
+    try:
+        for index, (keyword, page) in enumerate(units, 1):
+            for news_item in iter_baidu_news(keyword, page=page, num_per_page=num_per_page):
+                item_hash = url_hash(news_item['url'])
+                if item_hash in seen_hashes:
+                    continue
+                seen_hashes.add(item_hash)
+                buffer.append(_crawl_data_row(task.id, news_item, item_hash))
+                if len(buffer) >= batch_size:
+                    flush()
+            # 每页结束时提交剩余数据，前端轮询即可看到真实进度
+            flush(int(index * 100 / len(units)))
+
+        task.status = 'completed'
+        task.total_items = task.crawled_items
+        task.progress = 100
+        task.end_time = datetime.now()
+        db.session.commit()
+    except Exception as e:
+        logger.exception("采集任务执行失败: %s", e, extra={'task_id': task_id})
+        db.session.rollback()
+        task = db.session.get(CrawlTask, task_id)
+        task.status = 'failed'
+        task.error_message = str(e)
+        task.end_time = datetime.now()
+        db.session.commit()
+
+
+# 后台采集任务执行器
+class CrawlTaskExecutor:
+    """
+    在后台线程池中执行采集任务
+
+    任务状态全部持久化在 crawl_task 表中：调度线程认领 pending 状态的
+    任务并置为 running，执行过程中按页更新进度，并在每次轮询时刷新本
+    进程正在执行的任务的 updated_at 作为心跳。执行器启动时，心跳超过
+    CRAWL_TASK_STALE_SECONDS 没有更新的 running 任务（其所在进程已经
+    退出）会被重新放回 pending 并清理其不完整的数据。多个进程可以同时
+    运行执行器，认领操作通过条件更新保证只有一个进程拿到任务。
+    """
+
+    def __init__(self, app=None):
+        self.app = None
+        self._pool = None
+        self._dispatcher = None
+        self._wakeup = threading.Event()
+        self._stopping = threading.Event()
+        self._lock = threading.Lock()
+        self._active = 0
+        self._running_ids = set()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        """绑定应用并读取执行器配置"""
+        app.config.setdefault('CRAWL_EXECUTOR_WORKERS', int(os.getenv('CRAWL_EXECUTOR_WORKERS', 2)))
+        app.config.setdefault('CRAWL_EXECUTOR_POLL_INTERVAL', float(os.getenv('CRAWL_EXECUTOR_POLL_INTERVAL', 5)))
+        app.config.setdefault('CRAWL_TASK_STALE_SECONDS', int(os.getenv('CRAWL_TASK_STALE_SECONDS', 600)))
+        app.extensions['crawl_executor'] = self
+        self.app = app
+
+    @property
+    def running(self) -> bool:
+        return self._dispatcher is not None and self._dispatcher.is_alive()
+
+    def start(self) -> None:
+        """启动调度线程（重复调用无副作用）"""
+        with self._lock:
+            if self.running:
+                return
+            self._stopping.clear()
+            self._pool = ThreadPoolExecutor(max_workers=self.app.config['CRAWL_EXECUTOR_WORKERS'],
+                                            thread_name_prefix='crawl-task')
+            self._dispatcher = threading.Thread(target=self._dispatch_loop, name='crawl-dispatcher', daemon=True)
+            self._dispatcher.start()
+
+    def stop(self, wait: bool = True) -> None:
+        """停止调度线程，等待正在执行的任务结束"""
+        self._stopping.set()
+        self._wakeup.set()
+        if self._dispatcher is not None:
+            self._dispatcher.join()
+            self._dispatcher = None
+        if self._pool is not None:
+            self._pool.shutdown(wait=wait)
+            self._pool = None
+
+    def submit(self, task_id: int) -> None:
+        """通知执行器有新的 pending 任务（任务本身已经持久化）"""
+        self.start()
+        self._wakeup.set()
+
+    def recover_stale_tasks(self) -> int:
+        """
+        将心跳长时间没有更新的 running 任务放回 pending
+
+        只在执行器启动时调用；正在执行的任务由所在进程的执行器持续刷新
+        心跳，不会被误判为中断。
+
+        Returns:
+            恢复的任务数量
+        """
+        deadline = datetime.utcnow() - timedelta(seconds=self.app.config['CRAWL_TASK_STALE_SECONDS'])
+        stale_ids = [task_id for (task_id,) in db.session.query(CrawlTask.id).filter(
+            CrawlTask.status == 'running', CrawlTask.updated_at < deadline)]
+        for task_id in stale_ids:
+            # 丢弃中断前保存的部分数据，重新执行时从头采集
+            CrawlData.query.filter_by(task_id=task_id).delete(synchronize_session=False)
+            CrawlTask.query.filter_by(id=task_id, status='running').update(
+                {'status': 'pending', 'progress': 0, 'crawled_items': 0}, synchronize_session=False)
+        db.session.commit()
+        return len(stale_ids)
+
+    def claim_next(self) -> Optional[int]:
+        """
+        认领最早的 pending 任务
+
+        Returns:
+            认领到的任务ID，没有可执行任务时返回None
+        """
+        while True:
+            task_id = db.session.query(CrawlTask.id).filter_by(status='pending').order_by(CrawlTask.id).limit(1).scalar()
+            if task_id is None:
+                return None
+            claimed = CrawlTask.query.filter_by(id=task_id, status='pending').update(
+                {'status': 'running', 'start_time': datetime.now(), 'error_message': None},
+                synchronize_session=False)
+            db.session.commit()
+            if claimed:
+                return task_id
+
+    def heartbeat(self) -> int:
+        """
+        刷新本进程正在执行的任务的 updated_at，需要在应用上下文中调用
+
+        Returns:
+            刷新的任务数量
+        """
+        with self._lock:
+            task_ids = list(self._running_ids)
+        if not task_ids:
+            return 0
+        count = CrawlTask.query.filter(CrawlTask.id.in_(task_ids), CrawlTask.status == 'running').update(
+            {'updated_at': datetime.utcnow()}, synchronize_session=False)
+        db.session.commit()
+        return count
+
+    def _dispatch_loop(self) -> None:
+        with self.app.app_context():
+            self._safe_recover()
+        while not self._stopping.is_set():
+            self._wakeup.clear()
+            with self.app.app_context():
+                try:
+                    self.heartbeat()
+                except Exception:
+                    logger.exception("刷新采集任务心跳失败")
+                    db.session.rollback()
+                while self._has_capacity():
+                    try:
+                        task_id = self.claim_next()
+                    except Exception:
+                        logger.exception("认领采集任务失败")
+                        db.session.rollback()
+                        break
+                    if task_id is None:
+                        break
+                    with self._lock:
+                        self._active += 1
+                        self._running_ids.add(task_id)
+                    self._pool.submit(self._run, task_id)
+            self._wakeup.wait(self.app.config['CRAWL_EXECUTOR_POLL_INTERVAL'])
+
+    def _safe_recover(self) -> None:
+        try:
+            self.recover_stale_tasks()
+        except Exception:
+            logger.exception("恢复中断的采集任务失败")
+            db.session.rollback()
+
+    def _has_capacity(self) -> bool:
+        with self._lock:
+            return self._active < self.app.config['CRAWL_EXECUTOR_WORKERS']
+
+    def _run(self, task_id: int) -> None:
+        try:
+            with self.app.app_context():
+                run_crawl_task(task_id)
+        finally:
+            with self._lock:
+                self._active -= 1
+                self._running_ids.discard(task_id)
+            self._wakeup.set()
+
+
+crawl_executor = CrawlTaskExecutor()
+
+
+# 后台新闻评分任务
+class NewsScoringWorker:
+    """
+    在后台线程中持续处理 is_processed 为False的新闻
+
+    每轮处理一批：计算情感得分、热度并关联话题，批量写回后提交；再为
+    一批新保存的新闻计算MinHash签名并归入近似重复簇。
+    保存新闻的请求只需调用 notify() 唤醒线程，不等待评分完成；没有
+    待处理的新闻时按间隔轮询，其他进程写入的新闻也会被处理。处理
+    状态全部保存在 is_processed 列中，进程重启后从剩余的新闻继续。
+
+    空闲时每隔 NEWS_HEAT_REFRESH_INTERVAL 秒按当前时间重算全部新闻的
+    热度，使按热度排序的结果跟上时间衰减；每隔 DASHBOARD_RECONCILE_INTERVAL
+    秒按实际行数校准一次仪表盘计数。
+    """
+
+    def __init__(self, app=None):
+        self.app = None
+        self._thread = None
+        self._wakeup = threading.Event()
+        self._stopping = threading.Event()
+        self._lock = threading.Lock()
+        self._last_heat_refresh = None
+        self._last_stats_reconcile = None
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        """绑定应用并读取评分配置"""
+        app.config.setdefault('NEWS_SCORING_BATCH_SIZE', int(os.getenv('NEWS_SCORING_BATCH_SIZE', 200)))
+        app.config.setdefault('NEWS_SCORING_POLL_INTERVAL', float(os.getenv('NEWS_SCORING_POLL_INTERVAL', 30)))
+        app.config.setdefault('NEWS_HEAT_REFRESH_INTERVAL', float(os.getenv('NEWS_HEAT_REFRESH_INTERVAL', 600)))
+        app.config.setdefault('DASHBOARD_RECONCILE_INTERVAL', float(os.getenv('DASHBOARD_RECONCILE_INTERVAL', 3600)))
+        app.extensions['news_scoring_worker'] = self
+        self.app = app
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        """启动评分线程（重复调用无副作用）"""
+        with self._lock:
+            if self.running:
+                return
+            self._stopping.clear()
+            self._thread = threading.Thread(target=self._loop, name='news-scoring', daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        """停止评分线程，等待当前批次结束"""
+        self._stopping.set()
+        self._wakeup.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def notify(self) -> None:
+        """通知有新保存的新闻待评分"""
+        self.start()
+        self._wakeup.set()
+
+    def process_batch(self) -> int:
+        """
+        处理一批待评分的新闻，需要在应用上下文中调用
+
+        同时为一批新保存的新闻建立近似重复索引，保存请求中不做分词。
+
+        Returns:
+            本批处理的条数，为0表示没有待处理的新闻
+        """
+        from app.news_store import analyze_stored_news, index_near_duplicates
+
+        batch_size = self.app.config['NEWS_SCORING_BATCH_SIZE']
+        # Web进程中直接在本线程分词，不启动子进程
+        scored = analyze_stored_news(chunk_size=batch_size, workers=1, max_batches=1)
+        indexed, _ = index_near_duplicates(chunk_size=batch_size, max_batches=1)
+        return scored + indexed
+
+    def refresh_heat_if_due(self) -> bool:
+        """
+        距上次重算超过 NEWS_HEAT_REFRESH_INTERVAL 时重算热度，需要在应用上下文中调用
+
+        Returns:
+            是否进行了重算
+        """
+        from app.news_store import recompute_heat_scores
+
+        interval = self.app.config['NEWS_HEAT_REFRESH_INTERVAL']
+        now = time.monotonic()
+        if interval <= 0 or (self._last_heat_refresh is not None and now - self._last_heat_refresh < interval):
+            return False
+        self._last_heat_refresh = now
+        recompute_heat_scores()
+        return True
+
+    def reconcile_stats_if_due(self) -> bool:
+        """
+        距上次校准超过 DASHBOARD_RECONCILE_INTERVAL 时按实际行数校准仪表盘计数，需要在应用上下文中调用
+
+        Returns:
+            是否进行了校准
+        """
+        from app.dashboard_stats import reconcile_counters
+
+        interval = self.app.config['DASHBOARD_RECONCILE_INTERVAL']
+        now = time.monotonic()
+        if interval <= 0 or (self._last_stats_reconcile is not None and now - self._last_stats_reconcile < interval):
+            return False
+        self._last_stats_reconcile = now
+        reconcile_counters()
+        return True
+
+    def _loop(self) -> None:
+        while not self._stopping.is_set():
+            self._wakeup.clear()
+            processed = 0
+            with self.app.app_context():
+                try:
+                    processed = self.process_batch()
+                    if not processed:
+                        self.refresh_heat_if_due()
+                        self.reconcile_stats_if_due()
+                except Exception:
+                    logger.exception("新闻评分任务执行失败")
+                    db.session.rollback()
+            # 还有剩余时立即处理下一批，否则等待通知或轮询间隔
+            if not processed:
+                self._wakeup.wait(self.app.config['NEWS_SCORING_POLL_INTERVAL'])
+
+
+news_scoring_worker = NewsScoringWorker()
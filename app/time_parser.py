@@ -0,0 +1,142 @@
+import re
+from datetime import datetime, timedelta
+from functools import lru_cache
+from typing import Optional
+
+# 标准化后的发布时间格式
+PUBLISH_TIME_FORMAT = '%Y-%m-%d %H:%M'
+
+# 相对时间（如 "1小时前"、"2天前"）的匹配规则和对应的时间单位
+_RELATIVE_TIME_PATTERNS = (
+    (re.compile(r'(\d+)小时前'), 'hours'),
+    (re.compile(r'(\d+)天前'), 'days'),
+    (re.compile(r'(\d+)分钟前'), 'minutes'),
+    (re.compile(r'刚刚'), None),
+)
+
+# 完整日期和不含年份的日期（与 strptime 的 %Y-%m-%d、%m-%d 接受的写法相同）
+_FULL_DATE_PATTERN = re.compile(r'^(\d{4})-(0?[1-9]|1[0-2])-(0?[1-9]|[12]\d|3[01])$')
+_MONTH_DAY_PATTERN = re.compile(r'^(0?[1-9]|1[0-2])-(0?[1-9]|[12]\d|3[01])$')
+
+# parse_date 支持的格式：年在前（- 或 / 分隔，可带时分秒），或日/月/年
+_YEAR_FIRST_PATTERN = re.compile(r'^(\d{4})([-/])(\d{1,2})\2(\d{1,2})(?: (\d{1,2}):(\d{1,2}):(\d{1,2}))?$')
+_DAY_FIRST_PATTERN = re.compile(r'^(\d{1,2})([-/])(\d{1,2})\2(\d{4})$')
+
+
+@lru_cache(maxsize=4096)
+def _parse_literal(time_str: str) -> Optional[tuple]:
+    """
+    解析与当前时间无关的部分，结果按原字符串缓存
+
+    同一页中的 "3小时前"、"12-01" 等字符串会反复出现，只解析一次。
+
+    Returns:
+        ('relative', 时间差) / ('date', datetime) / ('month_day', (月, 日))，无法解析时返回None
+    """
+    for pattern, unit in _RELATIVE_TIME_PATTERNS:
+        match = pattern.search(time_str)
+        if match:
+            return 'relative', timedelta(**{unit: int(match.group(1))}) if unit else timedelta(0)
+
+    match = _FULL_DATE_PATTERN.match(time_str)
+    if match:
+        try:
+            return 'date', datetime(*map(int, match.groups()))
+        except ValueError:  # 如 2025-02-30
+            return None
+
+    match = _MONTH_DAY_PATTERN.match(time_str)
+    if match:
+        return 'month_day', tuple(map(int, match.groups()))
+    return None
+
+
+# 解析发布时间
+def parse_time(time_str: str, now: Optional[datetime] = None) -> Optional[datetime]:
+    """
+    将搜索结果中的发布时间解析为datetime
+
+    Args:
+        time_str: 原始时间字符串，如 "3小时前"、"2025-12-01"、"12-01"
+        now: 参照时间，同一批结果应传入同一个值，默认为当前时间
+
+    Returns:
+        发布时间（精确到分钟），无法解析时返回None
+    """
+    if not time_str:
+        return None
+    parsed = _parse_literal(time_str)
+    if parsed is None:
+        return None
+
+    kind, value = parsed
+    if kind == 'date':
+        return value
+    now = now or datetime.now()
+    if kind == 'relative':
+        return (now - value).replace(second=0, microsecond=0)
+
+    # 不含年份时取今年，如果是未来日期（如12月31日，但当前是1月1日），则减一年
+    month, day = value
+    try:
+        moment = datetime(now.year, month, day)
+        if moment > now:
+            moment = moment.replace(year=now.year - 1)
+    except ValueError:  # 2月29日
+        return None
+    return moment
+
+
+# 标准化时间格式
+def normalize_time(time_str: str, now: Optional[datetime] = None) -> str:
+    """
+    标准化时间格式，将各种时间表示转换为统一格式
+
+    Args:
+        time_str: 原始时间字符串
+        now: 参照时间，默认为当前时间
+
+    Returns:
+        标准化后的时间字符串，无法解析时原样返回
+    """
+    moment = parse_time(time_str, now)
+    if moment is None:
+        return time_str or ""
+    return moment.strftime(PUBLISH_TIME_FORMAT)
+
+
+@lru_cache(maxsize=1024)
+def _parse_date_literal(date_str: str) -> Optional[datetime]:
+    match = _YEAR_FIRST_PATTERN.match(date_str)
+    if match:
+        year, _, month, day, hour, minute, second = match.groups()
+        fields = (year, month, day) if hour is None else (year, month, day, hour, minute, second)
+    else:
+        match = _DAY_FIRST_PATTERN.match(date_str)
+        if not match:
+            return None
+        day, _, month, year = match.groups()
+        fields = (year, month, day)
+    try:
+        return datetime(*map(int, fields))
+    except ValueError:
+        return None
+
+
+# 日期解析函数
+def parse_date(date_str: str, now: Optional[datetime] = None) -> datetime:
+    """
+    解析日期字符串为datetime对象
+
+    支持 %Y-%m-%d %H:%M:%S、%Y-%m-%d、%Y/%m/%d %H:%M:%S、%Y/%m/%d、
+    %d/%m/%Y、%d-%m-%Y，用一个正则确定格式，不逐个尝试 strptime。
+
+    Args:
+        date_str: 日期字符串
+        now: 无法解析时返回的时间，默认为当前时间
+
+    Returns:
+        解析结果，为空或无法解析时返回 now
+    """
+    moment = _parse_date_literal(date_str) if date_str else None
+    return moment or now or datetime.now()
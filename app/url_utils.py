@@ -0,0 +1,40 @@
+import hashlib
+from typing import Optional
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+# URL中不影响页面内容的跟踪参数
+TRACKING_QUERY_PARAMS = {'spm', 'from', 'wfr'}
+
+
+# URL规范化函数
+def normalize_url(url: str) -> str:
+    """
+    规范化URL用于去重：协议和主机名小写、去掉默认端口和锚点、
+    去掉跟踪参数并对其余查询参数排序、去掉路径末尾的斜杠
+    """
+    if not url:
+        return ""
+
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    netloc = parts.netloc.lower()
+    if (scheme == 'http' and netloc.endswith(':80')) or (scheme == 'https' and netloc.endswith(':443')):
+        netloc = netloc.rsplit(':', 1)[0]
+
+    path = parts.path or '/'
+    if len(path) > 1:
+        path = path.rstrip('/')
+
+    query = [(key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+             if not key.lower().startswith('utm_') and key.lower() not in TRACKING_QUERY_PARAMS]
+
+    return urlunsplit((scheme, netloc, path, urlencode(sorted(query)), ''))
+
+
+# URL哈希函数
+def url_hash(url: str) -> Optional[str]:
+    """返回规范化URL的SHA1十六进制摘要（40位），URL为空时返回None"""
+    normalized = normalize_url(url)
+    if not normalized:
+        return None
+    return hashlib.sha1(normalized.encode('utf-8')).hexdigest()
@@ -1,10 +1,26 @@
+import os
 import re
-import jieba
-import jieba.analyse
+import logging
 import requests
 from datetime import datetime
-from typing import List, Dict, Any
-from bs4 import BeautifulSoup
+from typing import List, Dict, Any, Iterator
+from app.html_parser import parse_html
+from app.http_client import get_http_client
+from app.rate_limit import get_host_budget
+from app.capture_store import get_capture_store
+from app.http_cache import get_http_cache
+from app.encoding import resolve_encoding
+from app.source_registry import get_source_classifier
+from app.source_index import get_source_index, host_of
+from app.time_parser import PUBLISH_TIME_FORMAT, parse_time
+from app.nlp import tokenize, sentiment_from_tokens, keywords_from_tokens
+
+logger = logging.getLogger(__name__)
+
+# 文本清理用到的正则
+_HTML_TAG_PATTERN = re.compile(r'<[^>]+>')
+_SPECIAL_CHAR_PATTERN = re.compile(r'[^\u4e00-\u9fa5a-zA-Z0-9,.!?:;"\'()\[\]{}<>\s]')
+_WHITESPACE_PATTERN = re.compile(r'\s+')
 
 # 文本清理函数
 def clean_text(text: str) -> str:
@@ -13,13 +29,13 @@ def clean_text(text: str) -> str:
         return ""
     
     # 去除HTML标签
-    text = re.sub(r'<[^>]+>', '', text)
+    text = _HTML_TAG_PATTERN.sub('', text)
     
     # 去除特殊字符（保留中文、英文、数字和基本标点）
-    text = re.sub(r'[^\u4e00-\u9fa5a-zA-Z0-9,.!?:;"\'()\[\]{}<>\s]', '', text)
+    text = _SPECIAL_CHAR_PATTERN.sub('', text)
     
     # 去除多余空格
-    text = re.sub(r'\s+', ' ', text)
+    text = _WHITESPACE_PATTERN.sub(' ', text)
     
     # 去除首尾空格
     return text.strip()
@@ -35,87 +51,8 @@ def determine_source_type(source: str) -> str:
     Returns:
         来源类型（官方媒体、商业媒体、自媒体等）
     """
-    if not source:
-        return "未知"
-        
-    # 官方媒体列表
-    official_media = ["央视", "新华社", "人民网", "光明网", "中国日报", "中新网", "环球网", "中国新闻网"]
-    
-    # 商业媒体列表
-    commercial_media = ["澎湃新闻", "界面新闻", "财经网", "科技日报", "成都商报", "华西都市报", "凤凰网", "新浪", "网易", "腾讯"]
-    
-    # 自媒体列表
-    we_media = ["微信", "微博", "知乎", "抖音", "小红书", "头条", "搜狐号", "百家号"]
-    
-    source_lower = source.lower()
-    
-    for media in official_media:
-        if media in source:
-            return "官方媒体"
-    
-    for media in commercial_media:
-        if media in source:
-            return "商业媒体"
-    
-    for media in we_media:
-        if media in source_lower:
-            return "自媒体"
-    
-    return "其他媒体"
-
-# 标准化时间格式的辅助函数
-def normalize_time(time_str: str) -> str:
-    """
-    标准化时间格式，将各种时间表示转换为统一格式
-    
-    Args:
-        time_str: 原始时间字符串
-        
-    Returns:
-        标准化后的时间字符串
-    """
-    from datetime import timedelta
-    if not time_str:
-        return ""
-        
-    # 处理相对时间（如 "1小时前"、"2天前"）
-    relative_time_patterns = {
-        r'(\d+)小时前': lambda m: (datetime.now() - timedelta(hours=int(m.group(1)))).strftime("%Y-%m-%d %H:%M"),
-        r'(\d+)天前': lambda m: (datetime.now() - timedelta(days=int(m.group(1)))).strftime("%Y-%m-%d %H:%M"),
-        r'(\d+)分钟前': lambda m: (datetime.now() - timedelta(minutes=int(m.group(1)))).strftime("%Y-%m-%d %H:%M"),
-        r'刚刚': lambda m: datetime.now().strftime("%Y-%m-%d %H:%M"),
-    }
-    
-    for pattern, formatter in relative_time_patterns.items():
-        match = re.search(pattern, time_str)
-        if match:
-            return formatter(match)
-    
-    # 处理完整日期格式
-    full_date_patterns = [
-        (r'^(\d{4})[-/年](0?[1-9]|1[0-2])[-/月](0?[1-9]|[12]\d|3[01])日?$', "%Y-%m-%d"),
-        (r'^(0?[1-9]|1[0-2])[-/月](0?[1-9]|[12]\d|3[01])日?$', f"{datetime.now().year}-%m-%d"),
-        (r'^(\d{2}):(\d{2})$', f"{datetime.now().strftime('%Y-%m-%d')} %H:%M"),
-    ]
-    
-    for pattern, format_str in full_date_patterns:
-        match = re.match(pattern, time_str)
-        if match:
-            try:
-                # 特殊处理不含年份的情况
-                if "%Y" not in format_str:
-                    # 如果是未来日期（如12月31日，但当前是1月1日），则减一年
-                    formatted_date = datetime.strptime(time_str, "%m-%d")
-                    formatted_date = formatted_date.replace(year=datetime.now().year)
-                    if formatted_date > datetime.now():
-                        formatted_date = formatted_date.replace(year=datetime.now().year - 1)
-                    return formatted_date.strftime("%Y-%m-%d %H:%M")
-                else:
-                    return datetime.strptime(time_str, "%Y-%m-%d").strftime("%Y-%m-%d %H:%M")
-            except ValueError:
-                continue
-    
-    return time_str
+    # 媒体名录见 app/media_registry.json，首次调用时编译为自动机
+    return get_source_classifier().classify(source)
 
 # 关键词提取函数
 def extract_keywords(text: str, topK: int = 10) -> List[str]:
@@ -126,101 +63,46 @@ def extract_keywords(text: str, topK: int = 10) -> List[str]:
     # 确保中文分词正常工作
     try:
         # 使用TF-IDF提取关键词
-        keywords = jieba.analyse.extract_tags(text, topK=topK)
-        return keywords
+        return keywords_from_tokens(tokenize(text), topK)
     except Exception as e:
-        print(f"关键词提取错误: {e}")
+        logger.warning("关键词提取错误: %s", e)
         return []
 
-# 情感分析关键词库
-POSITIVE_WORDS = {
-    '好', '优秀', '棒', '赞', '精彩', '完美', '满意', '喜欢', '推荐',
-    '成功', '进步', '创新', '高效', '专业', '可靠', '安全', '优质', '舒适'
-}
-
-NEGATIVE_WORDS = {
-    '差', '糟糕', '坏', '烂', '失望', '失败', '问题', '错误', '缺点',
-    '风险', '危险', '不安全', '低效', '麻烦', '困扰', '讨厌', '反对', '拒绝'
-}
-
 # 简单的情感分析函数
 def analyze_sentiment(text: str) -> float:
     """基于关键词匹配的简单情感分析，返回-1.0到1.0之间的分数"""
     if not text:
         return 0.0
     
-    # 分词
-    words = jieba.lcut(text)
-    
-    # 统计情感词
-    positive_count = 0
-    negative_count = 0
-    
-    for word in words:
-        if word in POSITIVE_WORDS:
-            positive_count += 1
-        elif word in NEGATIVE_WORDS:
-            negative_count += 1
-    
-    # 计算情感得分
-    total_emotional_words = positive_count + negative_count
-    if total_emotional_words == 0:
-        return 0.0
-    
-    # 归一化到-1.0到1.0
-    sentiment_score = (positive_count - negative_count) / total_emotional_words
-    
-    return sentiment_score
+    # 分词后统计情感词，批量分析多篇文档时使用 app.nlp.analyze_documents
+    return sentiment_from_tokens(tokenize(text))
 
 # 网页内容获取函数
 def fetch_web_content(url: str, timeout: int = 10) -> str:
-    """获取网页内容"""
+    """获取网页内容，启用HTTP缓存时优先使用缓存或条件请求"""
     try:
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        }
-        response = requests.get(url, headers=headers, timeout=timeout)
+        http_cache = get_http_cache()
+        if http_cache is not None:
+            response = http_cache.get(get_http_client(), url, timeout=timeout)
+        else:
+            response = get_http_client().get(url, timeout=timeout)
         response.raise_for_status()
-        response.encoding = response.apparent_encoding
+        # 优先使用响应头和页面声明的编码，只在都没有时检测正文开头
+        response.encoding = resolve_encoding(response)
         return response.text
     except Exception as e:
-        print(f"获取网页内容错误: {e}")
+        logger.warning("获取网页内容错误: %s", e, extra={'url': url})
         return ""
 
-# 日期解析函数
-def parse_date(date_str: str) -> datetime:
-    """解析日期字符串为datetime对象"""
-    if not date_str:
-        return datetime.now()
-    
-    # 尝试多种常见的日期格式
-    formats = [
-        '%Y-%m-%d %H:%M:%S',
-        '%Y-%m-%d',
-        '%Y/%m/%d %H:%M:%S',
-        '%Y/%m/%d',
-        '%d/%m/%Y',
-        '%d-%m-%Y'
-    ]
-    
-    for fmt in formats:
-        try:
-            return datetime.strptime(date_str, fmt)
-        except ValueError:
-            continue
-    
-    # 如果都解析失败，返回当前时间
-    return datetime.now()
-
 # 热度计算函数
-def calculate_heat(news: Any) -> float:
-    """计算新闻热度分数"""
+def calculate_heat(news: Any, now: datetime = None) -> float:
+    """计算新闻热度分数，批量重算时使用 app.heat.compute_heat_scores"""
     # 基于评论数、浏览量和发布时间计算热度
     base_score = news.comments_count * 2 + news.views_count * 0.1
     
-    # 时间衰减因子
+    # 时间衰减因子（发布时间晚于当前时间时按刚发布处理）
     if news.publish_time:
-        hours_passed = (datetime.now() - news.publish_time).total_seconds() / 3600
+        hours_passed = max(0.0, ((now or datetime.now()) - news.publish_time).total_seconds() / 3600)
         time_factor = 1 / (1 + hours_passed / 24)  # 每天衰减一半
     else:
         time_factor = 1.0
@@ -283,6 +165,14 @@ def get_pagination_urls(pagination: Any) -> Dict[str, str]:
     
     return urls
 
+# 判断响应是否为验证码或反爬拦截页面
+def is_captcha_response(response: Any) -> bool:
+    """判断响应是否被重定向到百度安全验证页面"""
+    if 'wappass.baidu.com' in (response.url or ''):
+        return True
+    # 验证页面的标题出现在页面开头，无需扫描全文
+    return '百度安全验证' in (response.text or '')[:2000]
+
 # 百度新闻搜索抓取函数
 def crawl_baidu_news(keyword: str, page: int = 1, num_per_page: int = 20) -> List[Dict[str, Any]]:
     """
@@ -296,19 +186,58 @@ def crawl_baidu_news(keyword: str, page: int = 1, num_per_page: int = 20) -> Lis
     Returns:
         新闻列表，每条包含标题、概要、封面、原始URL、来源等信息
     """
+    return list(iter_baidu_news(keyword, page, num_per_page))
+
+# 百度新闻流式抓取函数
+def iter_baidu_news(keyword: str, page: int = 1, num_per_page: int = 20) -> Iterator[Dict[str, Any]]:
+    """
+    抓取一页百度新闻搜索结果，每解析出一条新闻就立即产出
+    
+    调用方可以边解析边保存，不必等整页结果都放进内存。
+    
+    Args:
+        keyword: 搜索关键词
+        page: 页码 (1-based)
+        num_per_page: 每页条数
+        
+    Yields:
+        新闻字典，字段与 crawl_baidu_news 的返回值相同
+    """
     # 输入参数验证
     if not keyword or not keyword.strip():
-        print("错误: 关键词不能为空")
-        return []
+        logger.error("关键词不能为空")
+        return
     
     page = max(1, page)  # 确保页码至少为1
     num_per_page = max(1, min(100, num_per_page))  # 限制每页条数在1-100之间
-    
     keyword = keyword.strip()
+    
+    html_content = fetch_baidu_news_page(keyword, page, num_per_page)
+    if not html_content:
+        logger.warning("无法获取有效内容，返回空列表", extra={'keyword': keyword, 'page': page})
+        return
+    
+    yield from parse_baidu_news(html_content, keyword, page, num_per_page)
+
+# 百度新闻搜索页面获取函数
+def fetch_baidu_news_page(keyword: str, page: int, num_per_page: int) -> str:
+    """
+    请求百度新闻搜索结果页
+    
+    设置了 CRAWL_CAPTURE_DIR 时，每次收到的响应（包括验证码等异常页面）
+    都交给响应留存在后台压缩保存，可以用 replay_capture.py 重新解析。
+    
+    Args:
+        keyword: 搜索关键词（已去除首尾空格）
+        page: 页码 (1-based)
+        num_per_page: 每页条数
+        
+    Returns:
+        页面HTML，多次重试仍失败时返回空字符串
+    """
     # 构建搜索URL - 使用用户指定的百度新闻搜索URL格式
     import urllib.parse
     import random
-    import time
     
     encoded_keyword = urllib.parse.quote(keyword)
     # 计算pn参数：pn = (page-1) * num_per_page
@@ -357,422 +286,535 @@ def crawl_baidu_news(keyword: str, page: int = 1, num_per_page: int = 20) -> Lis
     
     # 发送请求，实现重试机制
     max_retries = 3
-    retry_delay = 5
     html_content = ""
     
+    host_budget = get_host_budget()
+    http_client = get_http_client()
+    capture_store = get_capture_store()
+    
+    # 短时间内重复抓取同一关键词和页码时直接使用缓存的结果页（默认关闭）
+    search_cache_ttl = float(os.getenv('CRAWL_SEARCH_CACHE_TTL', 0))
+    http_cache = get_http_cache() if search_cache_ttl > 0 else None
+    if http_cache is not None:
+        cached = http_cache.lookup(url, ttl=search_cache_ttl)
+        if cached is not None:
+            logger.debug("关键词 '%s' 第 %d 页使用缓存的结果页", keyword, page)
+            return cached.text
+    
     for retry in range(max_retries):
         try:
-            # 添加随机延迟，避免请求过快触发反爬虫
-            delay = random.uniform(2, 5) + retry * 2  # 重试时增加延迟
-            time.sleep(delay)
-            print(f"正在抓取关键词 '{keyword}' 第 {page} 页 (延迟 {delay:.2f}秒)...")
-            
-            # 使用会话对象，模拟浏览器会话
-            session = requests.Session()
-            
-            # 先访问百度首页，获取cookie
-            session.get('https://www.baidu.com/', headers=headers, timeout=10)
-            
-            # 再访问新闻搜索页面
-            response = session.get(url, headers=headers, timeout=15, allow_redirects=True)
-            response.raise_for_status()
+            # 请求节奏由主机预算的令牌桶控制，异常响应后会自动放慢
+            with host_budget.slot('www.baidu.com'):
+                logger.info("正在抓取关键词 '%s' 第 %d 页", keyword, page)
+                
+                # 使用共享客户端，首次请求或Cookie过期时先访问百度首页获取cookie
+                response = http_client.get(url, headers=headers, timeout=15, allow_redirects=True,
+                                           warmup_url='https://www.baidu.com/')
+                response.raise_for_status()
             
             # 验证响应是否正常（检查是否包含搜索结果）
-            print(f"响应状态码: {response.status_code}")
-            print(f"响应内容长度: {len(response.text)}")
-            print(f"响应前100个字符: {response.text[:100]}...")
-            
-            # 放宽验证条件，只要响应内容不为空且长度大于1000就认为是正常的
-            if response.text and len(response.text) > 1000:
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("响应前100个字符: %.100s", response.text,
+                             extra={'status': response.status_code, 'length': len(response.text)})
+            
+            # 放宽验证条件，只要响应内容不为空且长度大于1000、且不是验证码页面就认为是正常的
+            healthy = bool(response.text) and len(response.text) > 1000 and not is_captcha_response(response)
+            host_budget.report('www.baidu.com', healthy)
+            if capture_store is not None:
+                capture_store.save(keyword, page, response.text, url=response.url,
+                                   status=response.status_code, healthy=healthy)
+            if healthy:
                 html_content = response.text
-                print(f"成功获取关键词 '{keyword}' 第 {page} 页的内容")
+                if http_cache is not None:
+                    http_cache.store(url, response)
+                logger.debug("成功获取关键词 '%s' 第 %d 页的内容", keyword, page)
                 break
             else:
-                print(f"警告: 响应内容可能异常，重试 {retry + 1}/{max_retries}")
+                logger.warning("响应内容可能异常，重试 %d/%d", retry + 1, max_retries,
+                               extra={'keyword': keyword, 'page': page, 'status': response.status_code})
+                # 异常页面可能与当前cookie有关，重试前重新获取
+                http_client.reset_cookies('www.baidu.com')
                 
         except requests.exceptions.RequestException as e:
-            print(f"请求失败: {e}，重试 {retry + 1}/{max_retries}")
+            logger.warning("请求失败: %s，重试 %d/%d", e, retry + 1, max_retries,
+                           extra={'keyword': keyword, 'page': page})
+            host_budget.report('www.baidu.com', False)
             if retry == max_retries - 1:  # 最后一次重试失败
-                return []
+                return ""
             
+            http_client.reset_cookies('www.baidu.com')
             # 调整请求头，尝试使用不同的User-Agent
             headers['user-agent'] = random.choice(user_agents)
             continue
     
-    if not html_content:
-        print("无法获取有效内容，返回空列表")
-        return []
+    return html_content
+
+# 新闻来源的匹配规则，按优先级排列，第一个匹配成功的规则生效
+# 通用规则限定从词的开头匹配（(?<!\w)），匹配结果与不加限制时相同，
+# 但不会在长段文字中从每个字符重新回溯
+SOURCE_PATTERNS = tuple(re.compile(pattern, re.MULTILINE) for pattern in (
+    r'(央视网|新华网|人民网|光明网|中国日报网|中新网|环球网|凤凰网|中国新闻网|澎湃新闻|界面新闻|财经网|科技日报|成都商报|华西都市报)',
+    r'来源[:：]\s*(\w+)',
+    r'(?<!\w)(\w+)[网报台]',
+    r'^(\w+)',  # 开头的来源
+    r'(?<!\w)(\w+)\s*·',  # 中间的来源，如 "成都商报 · "
+))
+
+# 发布时间的匹配规则，按优先级排列
+TIME_PATTERNS = tuple(re.compile(pattern) for pattern in (
+    r'((?:20\d{2}|19\d{2})[-/年](?:0?[1-9]|1[0-2])[-/月](?:0?[1-9]|[12]\d|3[01])日?)',
+    r'((?:0?[1-9]|1[0-2])[-/月](?:0?[1-9]|[12]\d|3[01])日?)',
+    r'(\d{2}:\d{2})',
+    r'(\d+(?:小时|分钟|天)前|刚刚)',
+    r'发布于\s*([^\s]+)',
+    r'时间[:：]\s*([^\s]+)',
+))
+
+# 摘要中需要去掉的热搜榜等无关内容
+IRRELEVANT_WORDS = ('热搜榜', '民生榜', '财经榜', '换一换', '新闻全文', '新闻标题', '全部资讯', '分享', '收藏', '评论', '点赞')
+
+# 可能包含封面图片的元素的class
+IMAGE_CLASS_PATTERN = re.compile(r'img|pic|image', re.I)
+
+
+def _first_match(patterns: tuple, text: str) -> str:
+    for pattern in patterns:
+        match = pattern.search(text)
+        if match:
+            return match.group(1)
+    return ''
+
+
+# 从容器文本中提取来源、时间和摘要正文
+def extract_text_fields(text: str, title: str, source: str = None) -> tuple:
+    """
+    从搜索结果容器的文本中提取来源、发布时间和摘要正文
     
-    # 保存HTML内容用于调试（可选，产品环境可关闭）
-    if page == 1 and num_per_page == 10:  # 仅在默认情况下保存调试文件
-        with open('baidu_news.html', 'w', encoding='utf-8') as f:
-            f.write(html_content)
-        print("HTML内容已保存到 baidu_news.html")
+    Args:
+        text: 容器文本
+        title: 清理后的标题
+        source: 已知的来源（如由来源索引查到），给出时不再用正则匹配来源
+        
+    Returns:
+        (来源, 时间, 摘要正文)，摘要正文已去掉标题、来源、时间和无关内容，未截断
+    """
+    if not source:
+        source = _first_match(SOURCE_PATTERNS, text)
+    publish_time_str = _first_match(TIME_PATTERNS, text)
     
-    # 使用BeautifulSoup解析HTML
-    soup = BeautifulSoup(html_content, 'html.parser')
+    # 移除标题、来源和时间
+    for part in (title, source, publish_time_str):
+        if part:
+            text = text.replace(part, '')
     
-    # 提取新闻列表
-    news_list = []
-    news_set = set()  # 用于去重，存储(标题, URL)元组
+    text = clean_text(text)
+    for word in IRRELEVANT_WORDS:
+        text = text.replace(word, '')
     
-    # 记录处理开始时间
-    processing_start = time.time()
+    return source, publish_time_str, _WHITESPACE_PATTERN.sub(' ', text).strip()
+
+# 查找搜索结果容器
+def find_result_containers(soup: Any) -> List[tuple]:
+    """
+    一次遍历找出每条搜索结果可能的容器
     
-    # 查找可能的新闻条目容器
-    # 移动版百度新闻的页面结构可能不同，尝试多种方式查找
-    candidate_divs = []
-    
-    # 1. 尝试查找所有包含h3标签的div
-    all_divs = soup.find_all('div')
-    for div in all_divs:
-        h3_tag = div.find('h3')
-        if h3_tag:
-            a_tag = h3_tag.find('a')
-            if a_tag and a_tag.get('href'):
-                candidate_divs.append(div)
-    
-    # 2. 如果没有找到，尝试直接查找所有h3标签
-    if not candidate_divs:
-        h3_tags = soup.find_all('h3')
-        for h3 in h3_tags:
-            a_tag = h3.find('a')
-            if a_tag and a_tag.get('href'):
-                # 使用h3的父元素作为容器
-                if h3.parent.name == 'div':
-                    candidate_divs.append(h3.parent)
-                else:
-                    # 创建一个临时div作为容器
-                    candidate_divs.append(h3)
-    
-    # 3. 如果还是没有找到，尝试查找所有包含链接的元素
-    if not candidate_divs:
-        a_tags = soup.find_all('a')
-        for a in a_tags:
+    每个带链接的 h3 只处理一次：从它向上逐层查找 div，直到遇到同时
+    包含前一个 h3 的祖先为止，这些 div 中第一个 h3 都是它，都可以作为
+    这条结果的容器。组内由外到内排列，与按文档顺序遍历所有 div 的结果
+    一致。
+    
+    Args:
+        soup: 已解析的页面
+        
+    Returns:
+        [(h3元素, [容器, ...]), ...]，按结果在页面中的顺序排列；
+        没有带链接的 h3 时退化为逐个容器的分组，h3元素为None
+    """
+    groups = []
+    previous_scope = set()  # 前一个 h3 及其所有祖先
+    for h3 in soup.find_all('h3'):
+        ancestors = list(h3.parents)
+        a_tag = h3.find('a')
+        if a_tag and a_tag.get('href'):
+            containers = []
+            for parent in ancestors:
+                if id(parent) in previous_scope:
+                    break
+                if parent.name == 'div':
+                    containers.append(parent)
+            if containers:
+                containers.reverse()
+                groups.append((h3, containers))
+        previous_scope = {id(parent) for parent in ancestors}
+        previous_scope.add(id(h3))
+    if groups:
+        return groups
+    
+    # 没有找到时，尝试直接使用h3标签的父元素
+    candidates = []
+    for h3 in soup.find_all('h3'):
+        a_tag = h3.find('a')
+        if a_tag and a_tag.get('href'):
+            # 使用h3的父元素作为容器，父元素不是div时使用h3本身
+            candidates.append(h3.parent if h3.parent.name == 'div' else h3)
+    
+    # 如果还是没有找到，尝试查找所有包含链接的元素
+    if not candidates:
+        for a in soup.find_all('a'):
             if a.get('href') and a.get_text().strip():
-                candidate_divs.append(a.parent)
+                candidates.append(a.parent)
     
-    print(f"找到 {len(candidate_divs)} 个候选新闻容器")
+    return [(None, [container]) for container in candidates]
+
+# 从单个容器中提取一条新闻
+def _extract_news_item(container: Any, keyword: str, page: int, news_set: set, h3_tag: Any = None,
+                       now: datetime = None) -> Any:
+    """
+    从候选容器中提取新闻信息
     
-    # 遍历每个候选容器，尝试提取新闻信息
-    for container in candidate_divs:
-        try:
-            # 提取标题和链接
-            h3_tag = container.find('h3')
-            if h3_tag:
-                a_tag = h3_tag.find('a')
-            else:
-                # 如果没有h3标签，尝试直接在容器中查找a标签
-                a_tag = container.find('a')
-            
-            if not a_tag:
-                continue
-            
-            link = a_tag.get('href')
-            if not link:
-                continue
-            
-            # 获取标题文本
-            if h3_tag:
-                title_text = h3_tag.get_text(strip=True)
-            else:
-                title_text = a_tag.get_text(strip=True)
-            
-            if not title_text:
-                continue
-            
-            # 清理标题
-            cleaned_title = clean_text(title_text)
-            
-            # 放宽关键词匹配条件，只要新闻内容相关即可
-            # 不再严格要求标题或链接包含关键词，避免过滤掉相关新闻
-            # 我们会在后续步骤中通过内容分析进一步筛选
-            
-            # 数据验证
-            if not cleaned_title or len(cleaned_title) < 5:
-                print(f"新闻标题过短或为空，跳过")
-                continue
-                
-            if not link or not link.startswith(('http://', 'https://')):
-                print(f"新闻链接无效或为空，跳过")
-                continue
-                
-            # 检查是否已经存在相同的新闻（去重）
-            news_key = (cleaned_title, link)
-            if news_key in news_set:
-                print(f"发现重复新闻: {cleaned_title[:30]}...")
-                continue
-            
-            # 提取来源和时间信息
-            source = ''
-            publish_time_str = ''
-            
-            # 查找所有可能包含来源和时间的文本节点
-            all_text = container.get_text()
-            
-            # 尝试匹配常见来源模式，优先匹配主要新闻网站
-            source_patterns = [
-                r'(央视网|新华网|人民网|光明网|中国日报网|中新网|环球网|凤凰网|中国新闻网|澎湃新闻|界面新闻|财经网|科技日报|成都商报|华西都市报)',
-                r'来源[:：]\s*(\w+)',
-                r'\s*(\w+)(?:[网报台])\s*',
-                r'^(\w+)(?:\s*[:：])?',  # 开头的来源
-                r'\s*(\w+)\s*·\s*',    # 中间的来源，如 "成都商报 · "
-            ]
-            
-            for pattern in source_patterns:
-                match = re.search(pattern, all_text, re.MULTILINE)
-                if match:
-                    source = match.group(1)
-                    break
-            
-            # 尝试匹配时间模式
-            time_patterns = [
-                r'((?:20\d{2}|19\d{2})[-/年](?:0?[1-9]|1[0-2])[-/月](?:0?[1-9]|[12]\d|3[01])日?)',
-                r'((?:0?[1-9]|1[0-2])[-/月](?:0?[1-9]|[12]\d|3[01])日?)',
-                r'(\d{2}:\d{2})',
-                r'(\d+[小时天前])',
-                r'发布于\s*([^\s]+)',
-                r'时间[:：]\s*([^\s]+)',
-            ]
-            
-            for pattern in time_patterns:
-                match = re.search(pattern, all_text)
-                if match:
-                    publish_time_str = match.group(1)
-                    break
-            
-            # 提取摘要信息
-            summary = ''
-            
-            # 查找所有文本节点，提取最相关的内容作为摘要
-            all_text = container.get_text()
-            
-            # 移除标题、来源和时间
-            if cleaned_title in all_text:
-                all_text = all_text.replace(cleaned_title, '')
-            if source in all_text:
-                all_text = all_text.replace(source, '')
-            if publish_time_str in all_text:
-                all_text = all_text.replace(publish_time_str, '')
-            
-            # 清理文本
-            all_text = clean_text(all_text)
-            
-            # 跳过热搜榜等无关内容
-            irrelevant_keywords = ['热搜榜', '民生榜', '财经榜', '换一换', '新闻全文', '新闻标题', '全部资讯', '', '', '', '', '分享', '收藏', '评论', '点赞']
-            for keyword in irrelevant_keywords:
-                all_text = all_text.replace(keyword, '')
-            
-            # 移除多余的空格和换行
-            all_text = re.sub(r'\s+', ' ', all_text).strip()
-            
-            # 提取摘要
-            if all_text:
-                if len(all_text) <= 200:
-                    summary = all_text
-                else:
-                    # 截取前200个字符作为摘要
-                    summary = all_text[:200] + '...'
-            
-            # 如果还是没有摘要，尝试从容器的兄弟节点或子节点中提取
-            if not summary:
-                # 尝试查找容器内的p标签
-                p_tags = container.find_all('p')
-                for p in p_tags:
-                    p_text = clean_text(p.get_text(strip=True))
-                    if p_text and len(p_text) > 10:
-                        summary = p_text[:200] + ('...' if len(p_text) > 200 else '')
-                        break
-                
-            # 再次验证摘要长度
-            if not summary or len(summary) < 10:
-                print(f"新闻摘要过短或为空，跳过")
-                continue
-            
-            # 提取封面图片
-            cover_image = ''
-            
-            # 1. 尝试查找容器内的图片，支持现代百度新闻的多种结构
-            # 查找容器内的所有img标签
-            all_imgs = container.find_all('img')
-            for img in all_imgs:
-                # 获取图片源
-                img_src = img.get('src', '')
-                # 也检查data-src等懒加载属性
-                if not img_src:
-                    img_src = img.get('data-src', '')
-                if not img_src:
-                    img_src = img.get('data-original', '')
-                
-                if img_src:
-                    # 排除base64图片和图标
-                    if not img_src.startswith('data:') and not img_src.startswith('//www.baidu.com/img/'):
-                        # 处理相对URL和协议相对URL
-                        if img_src.startswith('//'):
-                            img_src = 'https:' + img_src
-                        elif img_src.startswith('/'):
-                            img_src = 'https://www.baidu.com' + img_src
-                        elif img_src.startswith('https:') and not img_src.startswith('https://'):
-                            # 修复缺少//的情况，如https:t9.baidu.com/...
-                            img_src = 'https://' + img_src[6:]
-                        elif img_src.startswith('http:') and not img_src.startswith('http://'):
-                            # 修复缺少//的情况，如http:t9.baidu.com/...
-                            img_src = 'http://' + img_src[5:]
-                        elif not img_src.startswith(('http://', 'https://')):
-                            img_src = 'https://www.baidu.com/' + img_src
-                        cover_image = img_src
-                        break
-            
-            # 2. 尝试从容器的子元素或兄弟元素中查找图片
-            if not cover_image:
-                # 查找可能包含图片的子容器
-                image_containers = container.find_all(['div', 'span', 'a'], class_=re.compile(r'.*img.*|.*pic.*|.*image.*', re.I))
-                for img_container in image_containers:
-                    img_tag = img_container.find('img')
-                    if img_tag:
-                        img_src = img_tag.get('src', '') or img_tag.get('data-src', '') or img_tag.get('data-original', '')
-                        if img_src and not img_src.startswith('data:') and not img_src.startswith('//www.baidu.com/img/'):
-                            if img_src.startswith('//'):
-                                img_src = 'https:' + img_src
-                            elif img_src.startswith('/'):
-                                img_src = 'https://www.baidu.com' + img_src
-                            elif img_src.startswith('https:') and not img_src.startswith('https://'):
-                                # 修复缺少//的情况，如https:t9.baidu.com/...
-                                img_src = 'https://' + img_src[6:]
-                            elif img_src.startswith('http:') and not img_src.startswith('http://'):
-                                # 修复缺少//的情况，如http:t9.baidu.com/...
-                                img_src = 'http://' + img_src[5:]
-                            elif not img_src.startswith(('http://', 'https://')):
-                                img_src = 'https://www.baidu.com/' + img_src
-                            cover_image = img_src
-                            break
-            
-            # 3. 尝试从链接中提取
-            if not cover_image and 'img' in link:
-                cover_image = link
-                # 同样需要处理URL格式问题
-                if cover_image and not cover_image.startswith('data:'):
-                    if cover_image.startswith('//'):
-                        cover_image = 'https:' + cover_image
-                    elif cover_image.startswith('/'):
-                        cover_image = 'https://www.baidu.com' + cover_image
-                    elif cover_image.startswith('https:') and not cover_image.startswith('https://'):
+    Args:
+        container: 候选容器元素
+        keyword: 搜索关键词
+        page: 页码
+        news_set: 已产出新闻的(标题, URL)集合，用于去重
+        h3_tag: 已知的标题元素，为空时在容器内查找
+        now: 同一页共用的参照时间，用于解析相对时间和采集时间
+        
+    Returns:
+        新闻字典，容器不是有效新闻或与已产出的新闻重复时返回None
+    """
+    if h3_tag is None:
+        h3_tag = container.find('h3')
+    if h3_tag:
+        a_tag = h3_tag.find('a')
+    else:
+        # 如果没有h3标签，尝试直接在容器中查找a标签
+        a_tag = container.find('a')
+    
+    if not a_tag:
+        return None
+    
+    link = a_tag.get('href')
+    if not link:
+        return None
+    
+    # 获取标题文本
+    if h3_tag:
+        title_text = h3_tag.get_text(strip=True)
+    else:
+        title_text = a_tag.get_text(strip=True)
+    
+    if not title_text:
+        return None
+    
+    # 清理标题
+    cleaned_title = clean_text(title_text)
+    
+    # 放宽关键词匹配条件，只要新闻内容相关即可
+    # 不再严格要求标题或链接包含关键词，避免过滤掉相关新闻
+    # 我们会在后续步骤中通过内容分析进一步筛选
+    
+    # 数据验证
+    if not cleaned_title or len(cleaned_title) < 5:
+        logger.debug("新闻标题过短或为空，跳过")
+        return None
+        
+    if not link or not link.startswith(('http://', 'https://')):
+        logger.debug("新闻链接无效或为空，跳过")
+        return None
+        
+    # 检查是否已经存在相同的新闻（去重）
+    news_key = (cleaned_title, link)
+    if news_key in news_set:
+        logger.debug("发现重复新闻: %.30s...", cleaned_title)
+        return None
+    
+    # 原文主机已收录在来源索引中时直接得到来源和类型；索引为空或未收录时
+    # 按媒体名录的域名匹配，都没有时才从容器文本中用正则匹配
+    source_index = get_source_index()
+    known_source = source_index.lookup_url(link) if source_index is not None else None
+    if known_source is None:
+        outlet = get_source_classifier().match_host(host_of(link))
+        if outlet is not None:
+            known_source = (outlet.name, outlet.source_type)
+    
+    # 一次取出容器文本，从中提取来源、时间和摘要正文
+    source, publish_time_str, all_text = extract_text_fields(
+        container.get_text(), cleaned_title, known_source[0] if known_source else None)
+    summary = ''
+    
+    # 提取摘要
+    if all_text:
+        if len(all_text) <= 200:
+            summary = all_text
+        else:
+            # 截取前200个字符作为摘要
+            summary = all_text[:200] + '...'
+    
+    # 如果还是没有摘要，尝试从容器的兄弟节点或子节点中提取
+    if not summary:
+        # 尝试查找容器内的p标签
+        p_tags = container.find_all('p')
+        for p in p_tags:
+            p_text = clean_text(p.get_text(strip=True))
+            if p_text and len(p_text) > 10:
+                summary = p_text[:200] + ('...' if len(p_text) > 200 else '')
+                break
+        
+    # 再次验证摘要长度
+    if not summary or len(summary) < 10:
+        logger.debug("新闻摘要过短或为空，跳过")
+        return None
+    
+    # 提取封面图片
+    cover_image = ''
+    
+    # 1. 尝试查找容器内的图片，支持现代百度新闻的多种结构
+    # 查找容器内的所有img标签
+    all_imgs = container.find_all('img')
+    for img in all_imgs:
+        # 获取图片源
+        img_src = img.get('src', '')
+        # 也检查data-src等懒加载属性
+        if not img_src:
+            img_src = img.get('data-src', '')
+        if not img_src:
+            img_src = img.get('data-original', '')
+        
+        if img_src:
+            # 排除base64图片和图标
+            if not img_src.startswith('data:') and not img_src.startswith('//www.baidu.com/img/'):
+                # 处理相对URL和协议相对URL
+                if img_src.startswith('//'):
+                    img_src = 'https:' + img_src
+                elif img_src.startswith('/'):
+                    img_src = 'https://www.baidu.com' + img_src
+                elif img_src.startswith('https:') and not img_src.startswith('https://'):
+                    # 修复缺少//的情况，如https:t9.baidu.com/...
+                    img_src = 'https://' + img_src[6:]
+                elif img_src.startswith('http:') and not img_src.startswith('http://'):
+                    # 修复缺少//的情况，如http:t9.baidu.com/...
+                    img_src = 'http://' + img_src[5:]
+                elif not img_src.startswith(('http://', 'https://')):
+                    img_src = 'https://www.baidu.com/' + img_src
+                cover_image = img_src
+                break
+    
+    # 2. 尝试从容器的子元素或兄弟元素中查找图片
+    if not cover_image:
+        # 查找可能包含图片的子容器
+        image_containers = container.find_all(['div', 'span', 'a'], class_=IMAGE_CLASS_PATTERN)
+        for img_container in image_containers:
+            img_tag = img_container.find('img')
+            if img_tag:
+                img_src = img_tag.get('src', '') or img_tag.get('data-src', '') or img_tag.get('data-original', '')
+                if img_src and not img_src.startswith('data:') and not img_src.startswith('//www.baidu.com/img/'):
+                    if img_src.startswith('//'):
+                        img_src = 'https:' + img_src
+                    elif img_src.startswith('/'):
+                        img_src = 'https://www.baidu.com' + img_src
+                    elif img_src.startswith('https:') and not img_src.startswith('https://'):
                         # 修复缺少//的情况，如https:t9.baidu.com/...
-                        cover_image = 'https://' + cover_image[6:]
-                    elif cover_image.startswith('http:') and not cover_image.startswith('http://'):
+                        img_src = 'https://' + img_src[6:]
+                    elif img_src.startswith('http:') and not img_src.startswith('http://'):
                         # 修复缺少//的情况，如http:t9.baidu.com/...
-                        cover_image = 'http://' + cover_image[5:]
-                    elif not cover_image.startswith(('http://', 'https://')):
-                        cover_image = 'https://www.baidu.com/' + cover_image
-            
-            # 清理数据
-            cleaned_source = clean_text(source)
-            cleaned_time = clean_text(publish_time_str)
-            cleaned_summary = clean_text(summary)
-            # 封面图片URL不使用clean_text处理，避免破坏URL结构
-            cleaned_cover = cover_image.strip() if cover_image else ''
-            
-            # 构建新闻对象
-            news = {
-                "title": cleaned_title,
-                "content": cleaned_summary,
-                "source": cleaned_source,
-                "source_type": determine_source_type(cleaned_source),
-                "url": link,
-                "publish_time": normalize_time(cleaned_time),
-                "cover_image": cleaned_cover,
-                "crawl_time": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-                "keyword": keyword,
-                "page": page
-            }
-            
-            # 脏数据过滤：检查五个关键字段的有效性，至少三个无效则视为脏数据
-            invalid_count = 0
-            
-            # 检查标题
-            if not news["title"]:
-                invalid_count += 1
-            
-            # 检查摘要
-            if not news["content"]:
-                invalid_count += 1
-            
-            # 检查来源
-            if not news["source"]:
-                invalid_count += 1
-            
-            # 检查URL
-            if not news["url"] or not (news["url"].startswith("http://") or news["url"].startswith("https://")):
-                invalid_count += 1
-            
-            # 检查封面图片
-            if not news["cover_image"]:
-                invalid_count += 1
-            
-            # 如果无效字段数量大于等于3，则跳过这条新闻
-            if invalid_count >= 3:
-                print(f"过滤脏数据（{invalid_count}个无效字段）: {cleaned_title[:30]}...")
+                        img_src = 'http://' + img_src[5:]
+                    elif not img_src.startswith(('http://', 'https://')):
+                        img_src = 'https://www.baidu.com/' + img_src
+                    cover_image = img_src
+                    break
+    
+    # 3. 尝试从链接中提取
+    if not cover_image and 'img' in link:
+        cover_image = link
+        # 同样需要处理URL格式问题
+        if cover_image and not cover_image.startswith('data:'):
+            if cover_image.startswith('//'):
+                cover_image = 'https:' + cover_image
+            elif cover_image.startswith('/'):
+                cover_image = 'https://www.baidu.com' + cover_image
+            elif cover_image.startswith('https:') and not cover_image.startswith('https://'):
+                # 修复缺少//的情况，如https:t9.baidu.com/...
+                cover_image = 'https://' + cover_image[6:]
+            elif cover_image.startswith('http:') and not cover_image.startswith('http://'):
+                # 修复缺少//的情况，如http:t9.baidu.com/...
+                cover_image = 'http://' + cover_image[5:]
+            elif not cover_image.startswith(('http://', 'https://')):
+                cover_image = 'https://www.baidu.com/' + cover_image
+    
+    # 清理数据
+    cleaned_source = clean_text(source)
+    cleaned_time = clean_text(publish_time_str)
+    cleaned_summary = clean_text(summary)
+    # 封面图片URL不使用clean_text处理，避免破坏URL结构
+    cleaned_cover = cover_image.strip() if cover_image else ''
+    
+    # 构建新闻对象（publish_time 为标准化的字符串，publish_datetime 为解析结果，无法解析时为None）
+    now = now or datetime.now()
+    publish_datetime = parse_time(cleaned_time, now)
+    news = {
+        "title": cleaned_title,
+        "content": cleaned_summary,
+        "source": cleaned_source,
+        "source_type": known_source[1] if known_source else determine_source_type(cleaned_source),
+        "url": link,
+        "publish_time": publish_datetime.strftime(PUBLISH_TIME_FORMAT) if publish_datetime else cleaned_time,
+        "publish_datetime": publish_datetime,
+        "cover_image": cleaned_cover,
+        "crawl_time": now.strftime("%Y-%m-%d %H:%M:%S"),
+        "keyword": keyword,
+        "page": page
+    }
+    
+    # 脏数据过滤：检查五个关键字段的有效性，至少三个无效则视为脏数据
+    invalid_count = 0
+    
+    # 检查标题
+    if not news["title"]:
+        invalid_count += 1
+    
+    # 检查摘要
+    if not news["content"]:
+        invalid_count += 1
+    
+    # 检查来源
+    if not news["source"]:
+        invalid_count += 1
+    
+    # 检查URL
+    if not news["url"] or not (news["url"].startswith("http://") or news["url"].startswith("https://")):
+        invalid_count += 1
+    
+    # 检查封面图片
+    if not news["cover_image"]:
+        invalid_count += 1
+    
+    # 如果无效字段数量大于等于3，则跳过这条新闻
+    if invalid_count >= 3:
+        logger.debug("过滤脏数据（%d个无效字段）: %.30s...", invalid_count, cleaned_title)
+        return None
+    
+    # 逐条明细只在DEBUG级别输出，INFO级别下不构造任何日志字段
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("成功提取新闻: %.30s...", cleaned_title, extra={
+            'url': link,
+            'source': cleaned_source,
+            'publish_time': cleaned_time,
+            'cover': cleaned_cover,
+            'summary': cleaned_summary,
+        })
+    
+    return news
+
+# 百度新闻搜索结果解析函数
+def parse_baidu_news(html_content: str, keyword: str, page: int = 1, num_per_page: int = 20,
+                     parser_backend: str = None, now: datetime = None) -> Iterator[Dict[str, Any]]:
+    """
+    解析百度新闻搜索结果页，逐条产出新闻
+    
+    Args:
+        html_content: 搜索结果页HTML
+        keyword: 搜索关键词
+        page: 页码 (1-based)
+        num_per_page: 最多产出的条数
+        parser_backend: HTML解析后端，默认读取环境变量 CRAWL_HTML_PARSER
+        now: 解析相对时间的参照时间，默认为开始解析的时间，整页共用
+        
+    Yields:
+        新闻字典，包含标题、概要、封面、原始URL、来源等信息
+    """
+    import time
+    
+    # 解析HTML（lxml可用时使用lxml，否则使用html.parser）
+    soup = parse_html(html_content, parser_backend)
+    
+    # 整页共用一个参照时间，"3小时前" 等相对时间按同一时刻换算
+    now = now or datetime.now()
+    
+    # 已产出的新闻数量
+    extracted_count = 0
+    news_set = set()  # 用于去重，存储(标题, URL)元组
+    
+    # 记录处理开始时间
+    processing_start = time.time()
+    
+    # 查找新闻条目容器，每条结果一组
+    container_groups = find_result_containers(soup)
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("找到 %d 个候选新闻容器", sum(len(containers) for _, containers in container_groups))
+    
+    # 遍历每条结果，依次尝试它的容器，直到提取成功
+    for h3_tag, containers in container_groups:
+        news = None
+        for container in containers:
+            try:
+                news = _extract_news_item(container, keyword, page, news_set, h3_tag, now)
+            except Exception as e:
+                logger.exception("处理新闻时发生错误: %s", e, extra={'keyword': keyword, 'page': page})
                 continue
-            
-            # 添加到新闻列表并记录到集合中用于去重
-            news_list.append(news)
-            news_set.add(news_key)
-            print(f"成功提取新闻: {cleaned_title[:30]}...")
-            
-            # 打印新闻信息
-            print(f"\n发现新闻:")
-            print(f"标题: {cleaned_title}")
-            print(f"链接: {link}")
-            print(f"来源: {cleaned_source}")
-            print(f"时间: {cleaned_time}")
-            print(f"摘要: {cleaned_summary}")
-            print(f"封面图片: {cleaned_cover}")
-            print("-" * 50)
-            
-            # 控制数量
-            if len(news_list) >= num_per_page:
+            if news is not None:
                 break
-            
-        except Exception as e:
-            print(f"处理新闻时发生错误: {e}")
-            import traceback
-            traceback.print_exc()
+        if news is None:
             continue
+        
+        # 记录到集合中用于去重
+        news_set.add((news["title"], news["url"]))
+        extracted_count += 1
+        
+        yield news
+        
+        # 控制数量
+        if extracted_count >= num_per_page:
+            break
     
-        # 记录处理结束时间
+    # 记录处理结束时间
     processing_end = time.time()
     processing_time = processing_end - processing_start
     
-    print(f"关键词 '{keyword}' 第 {page} 页处理完成")
-    print(f"提取到 {len(news_list)} 条有效新闻")
-    print(f"处理时间: {processing_time:.2f}秒")
-    print("=" * 50)
-    
-    return news_list
+    logger.info("关键词 '%s' 第 %d 页处理完成，提取到 %d 条有效新闻", keyword, page, extracted_count,
+                extra={'elapsed': round(processing_time, 2)})
 
 # 批量抓取百度新闻函数
-def batch_crawl_baidu_news(keywords: List[str], pages: int = 3, num_per_page: int = 10) -> List[Dict[str, Any]]:
+def batch_crawl_baidu_news(keywords: List[str], pages: int = 3, num_per_page: int = 10,
+                           max_workers: int = None) -> List[Dict[str, Any]]:
     """
-    批量抓取百度新闻
+    批量抓取百度新闻，多个关键词和页码并发抓取
+    
+    同一主机的请求频率由共享的主机预算限制，增加工作线程只会提高
+    总吞吐量，不会加大对单个主机的压力。
     
     Args:
         keywords: 关键词列表
         pages: 每个关键词抓取的页数
         num_per_page: 每页条数
+        max_workers: 并发工作线程数，默认读取环境变量 CRAWL_MAX_WORKERS
         
     Returns:
-        所有抓取的新闻列表
+        所有抓取的新闻列表，按关键词和页码的顺序排列
     """
+    from concurrent.futures import ThreadPoolExecutor
+    
+    if max_workers is None:
+        max_workers = int(os.getenv('CRAWL_MAX_WORKERS', 4))
+    
+    jobs = [(keyword, page) for keyword in keywords for page in range(1, pages + 1)]
+    if not jobs:
+        return []
+    
     all_news = []
     
-    for keyword in keywords:
-        for page in range(1, pages + 1):
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(jobs)))) as executor:
+        futures = [executor.submit(crawl_baidu_news, keyword, page, num_per_page)
+                   for keyword, page in jobs]
+        
+        # 按提交顺序收集结果，保持与串行抓取一致的输出顺序
+        for (keyword, page), future in zip(jobs, futures):
             try:
-                news_list = crawl_baidu_news(keyword, page, num_per_page)
+                news_list = future.result()
                 all_news.extend(news_list)
-                print(f"已抓取关键词 '{keyword}' 第 {page} 页，共 {len(news_list)} 条新闻")
+                logger.info("已抓取关键词 '%s' 第 %d 页，共 %d 条新闻", keyword, page, len(news_list))
             except Exception as e:
-                print(f"抓取关键词 '{keyword}' 第 {page} 页失败: {e}")
+                logger.error("抓取关键词 '%s' 第 %d 页失败: %s", keyword, page, e)
                 continue
     
-    return all_news
\ No newline at end of file
+    return all_news
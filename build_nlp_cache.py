@@ -0,0 +1,33 @@
+import os
+import sys
+import time
+import argparse
+
+# 添加项目根目录到Python路径
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.nlp import get_jieba_cache_path, warm_up
+
+
+# 预先生成分词词典缓存，部署时执行一次，之后各进程直接读取缓存
+def main():
+    parser = argparse.ArgumentParser(description='生成jieba分词词典缓存')
+    parser.add_argument('--rebuild', action='store_true', help='删除已有缓存后重新生成')
+    args = parser.parse_args()
+    
+    cache_path = get_jieba_cache_path()
+    if not cache_path:
+        print("JIEBA_CACHE_PATH 为空，使用 jieba 默认的临时目录缓存")
+    elif args.rebuild and os.path.exists(cache_path):
+        os.remove(cache_path)
+    
+    start = time.time()
+    warm_up()
+    
+    if cache_path:
+        print(f"词典缓存: {cache_path} ({os.path.getsize(cache_path) / 1024 / 1024:.1f}MB)")
+    print(f"耗时: {time.time() - start:.2f}秒")
+
+
+if __name__ == '__main__':
+    main()
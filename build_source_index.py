@@ -0,0 +1,32 @@
+import os
+import sys
+import time
+import argparse
+
+# 添加项目根目录到Python路径
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app import custom_create_app
+from app.news_store import rebuild_source_index, PROMOTE_CHUNK_SIZE
+
+
+# 由已保存新闻的URL和来源重建主机-来源索引，可由 cron 等定时调用
+def main():
+    parser = argparse.ArgumentParser(description='由已保存的新闻重建主机-来源索引')
+    parser.add_argument('--chunk-size', type=int, default=PROMOTE_CHUNK_SIZE, help='每批读取的条数')
+    parser.add_argument('--min-samples', type=int, default=3, help='主机至少出现的次数')
+    parser.add_argument('--min-share', type=float, default=0.8, help='最常见来源的最低占比')
+    args = parser.parse_args()
+    
+    app = custom_create_app()
+    with app.app_context():
+        start = time.time()
+        scanned_count, host_count = rebuild_source_index(chunk_size=args.chunk_size, min_samples=args.min_samples,
+                                                         min_share=args.min_share)
+        
+        print(f"读取了 {scanned_count} 条新闻，收录了 {host_count} 个主机的来源")
+        print(f"耗时: {time.time() - start:.2f}秒")
+
+
+if __name__ == '__main__':
+    main()
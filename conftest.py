@@ -0,0 +1,26 @@
+import os
+import sys
+
+import pytest
+
+# 添加项目根目录到Python路径
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture
+def app(monkeypatch):
+    """
+    使用内存数据库的应用实例，表已创建
+
+    DATABASE_URL 只在本测试内指向内存数据库，测试结束后恢复，
+    不影响其他测试模块和开发数据。
+    """
+    monkeypatch.setenv('DATABASE_URL', 'sqlite://')
+    from app import custom_create_app, db
+
+    application = custom_create_app()
+    with application.app_context():
+        db.create_all()
+    yield application
+    with application.app_context():
+        db.session.remove()
@@ -0,0 +1,34 @@
+import os
+import sys
+import time
+import argparse
+
+# 添加项目根目录到Python路径
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app import custom_create_app
+from app.deep_crawl import deep_crawl
+
+
+def main():
+    parser = argparse.ArgumentParser(description='并发抓取采集数据的原文并提取正文')
+    parser.add_argument('data_ids', nargs='*', type=int, help='要深度采集的采集数据ID')
+    parser.add_argument('--task-id', type=int, help='深度采集指定采集任务的全部数据')
+    parser.add_argument('--workers', type=int, help='并发线程数')
+    parser.add_argument('--force', action='store_true', help='重新采集已深度采集过的数据')
+    args = parser.parse_args()
+    
+    if not args.data_ids and args.task_id is None:
+        parser.error('请指定采集数据ID或 --task-id')
+    
+    app = custom_create_app()
+    with app.app_context():
+        start = time.time()
+        crawled, failed = deep_crawl(args.data_ids or None, task_id=args.task_id,
+                                     max_workers=args.workers, force=args.force)
+        print(f"深度采集成功 {crawled} 条，失败 {failed} 条")
+        print(f"耗时: {time.time() - start:.2f}秒")
+
+
+if __name__ == '__main__':
+    main()
@@ -6,7 +6,8 @@ sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from app import custom_create_app
 from app import db
-from app.models import News
+from app.models import News, NewsLshBucket
+from app.dashboard_stats import reconcile_counters
 
 def delete_all_news():
     """删除数据库中所有新闻记录"""
@@ -19,12 +20,16 @@ def delete_all_news():
             current_count = News.query.count()
             print(f"当前数据库中有 {current_count} 条新闻记录")
             
-            # 删除所有新闻
+            # 删除所有新闻及其近似重复索引
+            NewsLshBucket.query.delete()
             News.query.delete()
             
             # 提交事务
             db.session.commit()
             
+            # 批量删除不经过ORM事件，按实际行数校准仪表盘计数
+            reconcile_counters()
+            
             # 验证删除结果
             new_count = News.query.count()
             print(f"成功删除所有新闻记录，现在数据库中有 {new_count} 条新闻记录")
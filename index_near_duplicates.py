@@ -0,0 +1,28 @@
+import os
+import sys
+import time
+import argparse
+
+# 添加项目根目录到Python路径
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app import custom_create_app
+from app.news_store import index_near_duplicates, PROMOTE_CHUNK_SIZE
+
+
+def main():
+    parser = argparse.ArgumentParser(description='为已有新闻补建近似重复索引')
+    parser.add_argument('--chunk-size', type=int, default=PROMOTE_CHUNK_SIZE, help='每批处理的条数')
+    args = parser.parse_args()
+    
+    app = custom_create_app()
+    with app.app_context():
+        start = time.time()
+        indexed_count, clustered_count = index_near_duplicates(chunk_size=args.chunk_size)
+        
+        print(f"为 {indexed_count} 条新闻建立了索引，其中 {clustered_count} 条归入已有的近似重复簇")
+        print(f"耗时: {time.time() - start:.2f}秒")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,45 @@
+import os
+import sys
+import time
+import argparse
+
+# 添加项目根目录到Python路径
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app import custom_create_app, db
+from app.models import CrawlData
+from app.news_store import promote_crawl_data, PROMOTE_CHUNK_SIZE
+
+
+def main():
+    parser = argparse.ArgumentParser(description='将采集数据批量转存到新闻表')
+    parser.add_argument('data_ids', nargs='*', type=int, help='要保存的采集数据ID')
+    parser.add_argument('--task-id', type=int, help='保存指定采集任务的全部数据')
+    parser.add_argument('--all', action='store_true', help='保存所有尚未转存的采集数据')
+    parser.add_argument('--chunk-size', type=int, default=PROMOTE_CHUNK_SIZE, help='每批处理的条数')
+    args = parser.parse_args()
+    
+    if not args.data_ids and args.task_id is None and not args.all:
+        parser.error('请指定采集数据ID、--task-id 或 --all')
+    
+    app = custom_create_app()
+    with app.app_context():
+        start = time.time()
+        
+        if args.all:
+            data_ids = [data_id for (data_id,) in db.session.query(CrawlData.id).filter(
+                CrawlData.news_id.is_(None)).order_by(CrawlData.id)]
+            saved_count, exists_count = promote_crawl_data(data_ids, chunk_size=args.chunk_size)
+        elif args.task_id is not None:
+            saved_count, exists_count = promote_crawl_data(task_id=args.task_id, chunk_size=args.chunk_size)
+        else:
+            saved_count, exists_count = promote_crawl_data(args.data_ids, chunk_size=args.chunk_size)
+        
+        db.session.commit()
+        
+        print(f"成功保存 {saved_count} 条数据到数据库，{exists_count} 条数据已存在")
+        print(f"耗时: {time.time() - start:.2f}秒")
+
+
+if __name__ == '__main__':
+    main()
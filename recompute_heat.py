@@ -0,0 +1,29 @@
+import os
+import sys
+import time
+import argparse
+
+# 添加项目根目录到Python路径
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app import custom_create_app
+from app.news_store import recompute_heat_scores, HEAT_CHUNK_SIZE
+
+
+# 按当前时间重算全部新闻的热度，可由 cron 等定时调用
+def main():
+    parser = argparse.ArgumentParser(description='按当前时间重算全部新闻的热度')
+    parser.add_argument('--chunk-size', type=int, default=HEAT_CHUNK_SIZE, help='每批处理的条数')
+    args = parser.parse_args()
+    
+    app = custom_create_app()
+    with app.app_context():
+        start = time.time()
+        checked_count, updated_count = recompute_heat_scores(chunk_size=args.chunk_size)
+        
+        print(f"检查了 {checked_count} 条新闻，更新了 {updated_count} 条新闻的热度")
+        print(f"耗时: {time.time() - start:.2f}秒")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,40 @@
+import os
+import sys
+import argparse
+
+# 添加项目根目录到Python路径
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.capture_store import CaptureStore, load_capture
+from app.html_parser import PARSER_BACKENDS
+from app.utils import parse_baidu_news
+
+
+def main():
+    parser = argparse.ArgumentParser(description='用留存的原始响应重新运行解析器')
+    parser.add_argument('paths', nargs='*', help='留存文件路径，不指定时使用目录中最新的文件')
+    parser.add_argument('--dir', default=os.getenv('CRAWL_CAPTURE_DIR'), help='留存目录，默认读取 CRAWL_CAPTURE_DIR')
+    parser.add_argument('--latest', type=int, default=1, help='未指定文件时重放最新的几个文件')
+    parser.add_argument('--backend', choices=PARSER_BACKENDS, help='HTML解析后端')
+    parser.add_argument('--num-per-page', type=int, default=100, help='最多解析的条数')
+    args = parser.parse_args()
+    
+    paths = args.paths
+    if not paths:
+        if not args.dir:
+            parser.error('请指定留存文件或 --dir')
+        paths = CaptureStore(args.dir).list_captures()[-max(1, args.latest):]
+    
+    for path in paths:
+        capture = load_capture(path)
+        print(f"{os.path.basename(path)}: 关键词 '{capture['keyword']}' 第 {capture['page']} 页，"
+              f"状态码 {capture['status']}，抓取于 {capture['captured_at']}")
+        news_list = list(parse_baidu_news(capture['html'], capture['keyword'], capture['page'],
+                                          args.num_per_page, parser_backend=args.backend))
+        for news in news_list:
+            print(f"  {news['title']} | {news['source']} | {news['publish_time']} | {news['url']}")
+        print(f"共解析出 {len(news_list)} 条新闻")
+
+
+if __name__ == '__main__':
+    main()
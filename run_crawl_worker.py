@@ -0,0 +1,27 @@
+import os
+import sys
+import time
+
+# 添加项目根目录到Python路径
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app import custom_create_app
+from app.tasks import crawl_executor, news_scoring_worker
+
+# 独立运行后台采集执行器，处理 pending 状态的采集任务
+# 同时运行新闻评分任务，处理尚未计算情感得分和热度的新闻
+# Web进程只负责创建和提交任务，可以与本进程同时运行
+if __name__ == '__main__':
+    app = custom_create_app()
+    crawl_executor.start()
+    print(f"采集任务执行器已启动，工作线程数: {app.config['CRAWL_EXECUTOR_WORKERS']}")
+    news_scoring_worker.start()
+    print(f"新闻评分任务已启动，每批处理: {app.config['NEWS_SCORING_BATCH_SIZE']} 条")
+    
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        print("正在停止执行器，等待进行中的任务结束...")
+        crawl_executor.stop()
+        news_scoring_worker.stop()
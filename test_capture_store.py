@@ -0,0 +1,104 @@
+import sys
+import os
+import tempfile
+import threading
+
+# 添加项目根目录到Python路径
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import app.utils as utils
+from app.capture_store import CaptureStore, load_capture
+from app.rate_limit import HostBudget
+
+FIXTURE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'full_page.html')
+
+
+def test_save_and_load():
+    with tempfile.TemporaryDirectory() as directory:
+        store = CaptureStore(directory)
+        assert store.save('成都 地铁', 2, '<html>页面</html>', url='https://www.baidu.com/s', status=200)
+        store.flush()
+
+        paths = store.list_captures()
+        assert len(paths) == 1
+        assert os.path.basename(paths[0]).endswith('_成都_地铁_p2.json.gz')
+        capture = load_capture(paths[0])
+        assert capture['html'] == '<html>页面</html>'
+        assert (capture['keyword'], capture['page'], capture['status']) == ('成都 地铁', 2, 200)
+
+
+def test_rotation_keeps_newest_files():
+    with tempfile.TemporaryDirectory() as directory:
+        store = CaptureStore(directory, max_files=3)
+        for page in range(1, 6):
+            store.save('成都', page, f'第{page}页')
+        store.flush()
+        assert [load_capture(path)['page'] for path in store.list_captures()] == [3, 4, 5]
+
+        # 总大小超限时同样删除最早的文件，但至少保留最新的一个
+        store.max_bytes = 1
+        store.save('成都', 6, '第6页')
+        store.flush()
+        assert [load_capture(path)['page'] for path in store.list_captures()] == [6]
+
+
+def test_concurrent_saves_do_not_collide():
+    """同一关键词和页码被多个线程同时留存时各自成为独立文件"""
+    with tempfile.TemporaryDirectory() as directory:
+        store = CaptureStore(directory, queue_size=100)
+        threads = [threading.Thread(target=store.save, args=('成都', 1, f'响应{i}')) for i in range(20)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        store.flush()
+        assert sorted(load_capture(path)['html'] for path in store.list_captures()) == sorted(
+            f'响应{i}' for i in range(20))
+
+
+def test_fetch_captures_response_for_replay():
+    """抓取时留存响应而不再写 baidu_news.html，留存的响应可以重新解析"""
+    with open(FIXTURE, encoding='utf-8') as f:
+        html_content = f.read()
+
+    class FakeResponse:
+        status_code = 200
+        url = 'https://www.baidu.com/s?word=%E6%88%90%E9%83%BD'
+        text = html_content
+
+        def raise_for_status(self):
+            pass
+
+    class FakeClient:
+        def get(self, url, **kwargs):
+            return FakeResponse()
+
+    originals = utils.get_http_client, utils.get_host_budget, utils.get_capture_store
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as directory:
+        store = CaptureStore(os.path.join(directory, 'captures'))
+        utils.get_http_client = lambda: FakeClient()
+        utils.get_host_budget = lambda: HostBudget(rate=100, burst=10)
+        utils.get_capture_store = lambda: store
+        os.chdir(directory)
+        try:
+            news = utils.crawl_baidu_news('成都', page=1, num_per_page=10)
+        finally:
+            os.chdir(cwd)
+            utils.get_http_client, utils.get_host_budget, utils.get_capture_store = originals
+        store.flush()
+
+        assert not os.path.exists(os.path.join(directory, 'baidu_news.html'))
+        paths = store.list_captures()
+        assert len(paths) == 1
+        capture = load_capture(paths[0])
+        replayed = list(utils.parse_baidu_news(capture['html'], capture['keyword'], capture['page'], 10))
+        assert [item['url'] for item in replayed] == [item['url'] for item in news]
+
+
+if __name__ == '__main__':
+    test_save_and_load()
+    test_rotation_keeps_newest_files()
+    test_concurrent_saves_do_not_collide()
+    test_fetch_captures_response_for_replay()
+    print("响应留存测试全部通过")
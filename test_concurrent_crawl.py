@@ -0,0 +1,70 @@
+import sys
+import os
+import time
+
+# 添加项目根目录到Python路径
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import app.utils as utils
+
+
+def test_batch_crawl_keeps_order():
+    """并发抓取的结果顺序应与串行抓取一致"""
+    original = utils.crawl_baidu_news
+
+    def fake_crawl(keyword, page=1, num_per_page=20):
+        # 让靠前的任务更慢，验证结果不会按完成顺序打乱
+        time.sleep(0.05 if page == 1 else 0.01)
+        return [{'title': f'{keyword}-{page}', 'keyword': keyword, 'page': page}]
+
+    utils.crawl_baidu_news = fake_crawl
+    try:
+        news = utils.batch_crawl_baidu_news(['成都', '重庆'], pages=3, num_per_page=10, max_workers=4)
+    finally:
+        utils.crawl_baidu_news = original
+
+    titles = [item['title'] for item in news]
+    assert titles == ['成都-1', '成都-2', '成都-3', '重庆-1', '重庆-2', '重庆-3']
+
+
+def test_batch_crawl_skips_failed_pages():
+    """单页失败不影响其他页的结果"""
+    original = utils.crawl_baidu_news
+
+    def fake_crawl(keyword, page=1, num_per_page=20):
+        if page == 2:
+            raise RuntimeError('模拟失败')
+        return [{'title': f'{keyword}-{page}'}]
+
+    utils.crawl_baidu_news = fake_crawl
+    try:
+        news = utils.batch_crawl_baidu_news(['成都'], pages=3, max_workers=2)
+    finally:
+        utils.crawl_baidu_news = original
+
+    assert [item['title'] for item in news] == ['成都-1', '成都-3']
+
+
+def test_batch_crawl_fetches_every_page():
+    """并发抓取时每个关键词和页码各请求一次"""
+    original = utils.fetch_baidu_news_page
+    calls = []
+
+    def fake_fetch(keyword, page, num_per_page):
+        calls.append((keyword, page))
+        return ""
+
+    utils.fetch_baidu_news_page = fake_fetch
+    try:
+        utils.batch_crawl_baidu_news(['成都', '重庆'], pages=2, num_per_page=10, max_workers=4)
+    finally:
+        utils.fetch_baidu_news_page = original
+
+    assert sorted(calls) == [('成都', 1), ('成都', 2), ('重庆', 1), ('重庆', 2)]
+
+
+if __name__ == '__main__':
+    test_batch_crawl_keeps_order()
+    test_batch_crawl_skips_failed_pages()
+    test_batch_crawl_fetches_every_page()
+    print("并发抓取测试全部通过")
@@ -0,0 +1,260 @@
+import sys
+import os
+import time
+from datetime import datetime, timedelta
+
+# 添加项目根目录到Python路径
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import pytest
+
+import app.utils as utils
+from app import db
+from app.models import CrawlTask, CrawlData
+from app.news_store import insert_ignore_duplicates
+from app.tasks import CrawlTaskExecutor, run_crawl_task, split_task_keywords
+from app.url_utils import url_hash
+
+
+def fake_crawl(keyword, page=1, num_per_page=20):
+    return [{
+        'title': f'{keyword}新闻{page}-{i}',
+        'content': '新闻摘要内容',
+        'source': '人民网',
+        'source_type': '官方媒体',
+        'url': f'https://example.com/{keyword}/{page}/{i}',
+        'publish_time': '2025-12-04 10:00',
+        'publish_datetime': datetime(2025, 12, 4, 10, 0),
+        'cover_image': '',
+    } for i in range(3)]
+
+
+@pytest.fixture
+def app(app):
+    app.config['CRAWL_EXECUTOR_POLL_INTERVAL'] = 0.05
+    return app
+
+
+def test_split_task_keywords():
+    assert split_task_keywords('成都, 重庆，西安\n武汉') == ['成都', '重庆', '西安', '武汉']
+    assert split_task_keywords('成都 美食') == ['成都 美食']
+
+
+def test_run_crawl_task_updates_progress(app):
+    """每个关键词保存数据并更新进度"""
+    original = utils.iter_baidu_news
+    utils.iter_baidu_news = fake_crawl
+    try:
+        with app.app_context():
+            task = CrawlTask(keywords='成都,重庆', status='running')
+            db.session.add(task)
+            db.session.commit()
+            run_crawl_task(task.id)
+
+            task = db.session.get(CrawlTask, task.id)
+            assert task.status == 'completed'
+            assert task.progress == 100
+            assert task.crawled_items == 6
+            assert CrawlData.query.filter_by(task_id=task.id).count() == 6
+            assert CrawlData.query.first().publish_time == datetime(2025, 12, 4, 10, 0)
+    finally:
+        utils.iter_baidu_news = original
+
+
+def test_run_crawl_task_dedups_across_pages(app):
+    """同一任务不同页面中的相同URL只保存一次"""
+    original = utils.iter_baidu_news
+
+    def repeating_crawl(keyword, page=1, num_per_page=20):
+        return fake_crawl('成都', 1, num_per_page)
+
+    utils.iter_baidu_news = repeating_crawl
+    try:
+        with app.app_context():
+            task = CrawlTask(keywords='成都,重庆', status='running')
+            db.session.add(task)
+            db.session.commit()
+            run_crawl_task(task.id)
+            task = db.session.get(CrawlTask, task.id)
+            assert task.crawled_items == 3
+            assert CrawlData.query.filter_by(task_id=task.id).count() == 3
+    finally:
+        utils.iter_baidu_news = original
+
+
+def test_run_crawl_task_counts_only_inserted_rows(app):
+    """被并发写入方抢先保存的URL不计入已采集数量"""
+    original = utils.iter_baidu_news
+    task_ids = []
+
+    def racing_crawl(keyword, page=1, num_per_page=20):
+        items = fake_crawl(keyword, page, num_per_page)
+        # 模拟另一个写入方先保存了第一条
+        db.session.execute(insert_ignore_duplicates(CrawlData, ['task_id', 'url_hash']), [{
+            'task_id': task_ids[0], 'title': items[0]['title'], 'url': items[0]['url'],
+            'url_hash': url_hash(items[0]['url']), 'crawl_time': datetime.now()}])
+        return items
+
+    utils.iter_baidu_news = racing_crawl
+    try:
+        with app.app_context():
+            task = CrawlTask(keywords='成都', status='running')
+            db.session.add(task)
+            db.session.commit()
+            task_ids.append(task.id)
+            run_crawl_task(task.id)
+            task = db.session.get(CrawlTask, task.id)
+            assert task.status == 'completed'
+            assert task.crawled_items == 2
+            assert CrawlData.query.filter_by(task_id=task.id).count() == 3
+    finally:
+        utils.iter_baidu_news = original
+
+
+def test_run_crawl_task_records_failure(app):
+    original = utils.iter_baidu_news
+
+    def broken_crawl(keyword, page=1, num_per_page=20):
+        raise RuntimeError('网络错误')
+
+    utils.iter_baidu_news = broken_crawl
+    try:
+        with app.app_context():
+            task = CrawlTask(keywords='成都', status='running')
+            db.session.add(task)
+            db.session.commit()
+            run_crawl_task(task.id)
+            task = db.session.get(CrawlTask, task.id)
+            assert task.status == 'failed'
+            assert task.error_message == '网络错误'
+    finally:
+        utils.iter_baidu_news = original
+
+
+def test_run_crawl_task_keeps_committed_batches(app):
+    """中途失败时已提交的批次保留下来"""
+    original = utils.iter_baidu_news
+
+    def flaky_crawl(keyword, page=1, num_per_page=20):
+        yield from fake_crawl(keyword, page, num_per_page)
+        raise RuntimeError('解析中断')
+
+    utils.iter_baidu_news = flaky_crawl
+    os.environ['CRAWL_COMMIT_BATCH_SIZE'] = '2'
+    try:
+        with app.app_context():
+            task = CrawlTask(keywords='成都', status='running')
+            db.session.add(task)
+            db.session.commit()
+            run_crawl_task(task.id)
+            task = db.session.get(CrawlTask, task.id)
+            assert task.status == 'failed'
+            assert task.crawled_items == 2
+            assert CrawlData.query.filter_by(task_id=task.id).count() == 2
+    finally:
+        utils.iter_baidu_news = original
+        del os.environ['CRAWL_COMMIT_BATCH_SIZE']
+
+
+def test_claim_next_only_once(app):
+    """同一个任务只能被认领一次"""
+    executor = CrawlTaskExecutor(app)
+    with app.app_context():
+        db.session.add(CrawlTask(keywords='成都', status='pending'))
+        db.session.commit()
+        first = executor.claim_next()
+        assert first is not None
+        assert executor.claim_next() is None
+        assert db.session.get(CrawlTask, first).status == 'running'
+
+
+def test_recover_stale_tasks(app):
+    """长时间没有更新的 running 任务重新放回 pending"""
+    executor = CrawlTaskExecutor(app)
+    with app.app_context():
+        stale = CrawlTask(keywords='成都', status='running', crawled_items=1)
+        fresh = CrawlTask(keywords='重庆', status='running')
+        db.session.add_all([stale, fresh])
+        db.session.commit()
+        db.session.add(CrawlData(task_id=stale.id, title='半成品', url='https://example.com/1'))
+        db.session.commit()
+        CrawlTask.query.filter_by(id=stale.id).update(
+            {'updated_at': datetime.utcnow() - timedelta(hours=1)}, synchronize_session=False)
+        db.session.commit()
+
+        assert executor.recover_stale_tasks() == 1
+        assert db.session.get(CrawlTask, stale.id).status == 'pending'
+        assert db.session.get(CrawlTask, fresh.id).status == 'running'
+        assert CrawlData.query.filter_by(task_id=stale.id).count() == 0
+
+
+def test_heartbeat_keeps_running_tasks_fresh(app):
+    """执行中的任务由心跳刷新，执行器运行期间不会回收其他进程的任务"""
+    executor = CrawlTaskExecutor(app)
+    old = datetime.utcnow() - timedelta(hours=1)
+    with app.app_context():
+        ours = CrawlTask(keywords='成都', status='running')
+        other = CrawlTask(keywords='重庆', status='running')
+        db.session.add_all([ours, other])
+        db.session.commit()
+        ours_id, other_id = ours.id, other.id
+        CrawlTask.query.update({'updated_at': old}, synchronize_session=False)
+        db.session.commit()
+
+        executor._running_ids.add(ours_id)
+        assert executor.heartbeat() == 1
+        assert db.session.get(CrawlTask, ours_id).updated_at > old
+        executor._running_ids.clear()
+
+    # 启动时回收并重新执行中断的任务；启动之后才变为超时的任务
+    # （如另一个进程中执行缓慢的任务）不被回收
+    original = utils.iter_baidu_news
+    utils.iter_baidu_news = fake_crawl
+    try:
+        executor.start()
+        time.sleep(0.1)
+        with app.app_context():
+            task = CrawlTask(keywords='西安', status='running')
+            db.session.add(task)
+            db.session.commit()
+            late_id = task.id
+            CrawlTask.query.filter_by(id=late_id).update({'updated_at': old}, synchronize_session=False)
+            db.session.commit()
+        time.sleep(0.2)
+        executor.stop()
+    finally:
+        utils.iter_baidu_news = original
+    with app.app_context():
+        assert db.session.get(CrawlTask, other_id).status == 'completed'
+        assert db.session.get(CrawlTask, late_id).status == 'running'
+
+
+def test_executor_runs_pending_tasks_in_background(app):
+    executor = CrawlTaskExecutor(app)
+    original = utils.iter_baidu_news
+    utils.iter_baidu_news = fake_crawl
+    try:
+        with app.app_context():
+            task = CrawlTask(keywords='成都', status='pending')
+            db.session.add(task)
+            db.session.commit()
+            task_id = task.id
+
+        executor.submit(task_id)
+        deadline = time.time() + 5
+        status = None
+        while time.time() < deadline:
+            with app.app_context():
+                status = db.session.get(CrawlTask, task_id).status
+            if status == 'completed':
+                break
+            time.sleep(0.05)
+        executor.stop()
+        assert status == 'completed'
+    finally:
+        utils.iter_baidu_news = original
+
+
+if __name__ == '__main__':
+    # 数据库夹具由 conftest.py 提供，直接运行时交给 pytest 执行
+    sys.exit(pytest.main([__file__, '-q']))
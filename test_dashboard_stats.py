@@ -0,0 +1,129 @@
+import sys
+import os
+from datetime import datetime
+
+# 添加项目根目录到Python路径
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import pytest
+from sqlalchemy import event
+
+import app.news_store as news_store
+from app import db
+from app.dashboard_stats import adjust_counter, dashboard_stats, reconcile_counters
+from app.models import News, Topic, Comment, CrawlTask, CrawlData, StatCounter
+from app.news_store import promote_crawl_data, insert_ignore_duplicates
+from app.url_utils import url_hash
+from app.tasks import NewsScoringWorker
+
+
+def test_counts_follow_inserts_and_deletes(app):
+    with app.app_context():
+        db.session.add_all([News(title='新闻1', url='https://example.com/1'),
+                            News(title='新闻2', url='https://example.com/2'), Topic(name='成都')])
+        db.session.commit()
+
+        # 第一次读取时按实际行数建立计数
+        assert dashboard_stats.counts() == {'news': 2, 'topics': 1, 'comments': 0}
+
+        news = News(title='新闻3', url='https://example.com/3')
+        db.session.add(news)
+        db.session.flush()
+        db.session.add(Comment(news_id=news.id, content='评论'))
+        db.session.commit()
+        assert dashboard_stats.counts() == {'news': 3, 'topics': 1, 'comments': 1}
+
+        db.session.delete(Topic.query.one())
+        db.session.commit()
+        assert dashboard_stats.counts()['topics'] == 0
+
+        # 回滚的写入不计数
+        db.session.add(News(title='新闻4', url='https://example.com/4'))
+        db.session.flush()
+        db.session.rollback()
+        assert dashboard_stats.counts()['news'] == 3
+
+
+def test_counts_do_not_scan_tables(app):
+    with app.app_context():
+        db.session.add(News(title='新闻', url='https://example.com/1'))
+        db.session.commit()
+        dashboard_stats.counts()
+
+        statements = []
+        listener = lambda conn, cursor, statement, *args: statements.append(statement)
+        event.listen(db.engine, 'before_cursor_execute', listener)
+        try:
+            assert dashboard_stats.counts()['news'] == 1
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', listener)
+        assert len(statements) == 1 and 'count(' not in statements[0].lower()
+
+
+def test_promote_and_reconcile(app):
+    with app.app_context():
+        dashboard_stats.counts()
+        task = CrawlTask(keywords='成都')
+        db.session.add(task)
+        db.session.commit()
+        db.session.add_all([CrawlData(task_id=task.id, title=f'新闻{i}', content='摘要', source='人民网',
+                                      url=f'https://example.com/news/{i}', crawl_time=datetime.now())
+                            for i in range(5)])
+        db.session.commit()
+
+        promote_crawl_data(task_id=task.id)
+        db.session.commit()
+        assert dashboard_stats.counts()['news'] == 5
+
+        # 批量删除不经过ORM事件，校准后恢复一致
+        News.query.filter(News.id > 3).delete(synchronize_session=False)
+        db.session.commit()
+        assert dashboard_stats.counts()['news'] == 5
+        assert reconcile_counters() == {'news': -2, 'topics': 0, 'comments': 0}
+        assert dashboard_stats.counts()['news'] == 3
+        assert StatCounter.query.count() == 3
+
+
+def test_promote_race_does_not_drift(app):
+    """并发写入方抢先插入的新闻只由它自己计数，计数器与实际行数一致"""
+    original = news_store.insert_rows_ignore_duplicates
+
+    def racing_insert(model, index_elements, rows):
+        url = 'https://example.com/news/0'
+        db.session.execute(insert_ignore_duplicates(News, ['url_hash']),
+                           [{'title': '并发写入', 'url': url, 'url_hash': url_hash(url)}])
+        adjust_counter('news', 1)
+        return original(model, index_elements, rows)
+
+    news_store.insert_rows_ignore_duplicates = racing_insert
+    try:
+        with app.app_context():
+            dashboard_stats.counts()
+            task = CrawlTask(keywords='成都')
+            db.session.add(task)
+            db.session.commit()
+            db.session.add_all([CrawlData(task_id=task.id, title=f'新闻{i}', content='摘要', source='人民网',
+                                          url=f'https://example.com/news/{i}', crawl_time=datetime.now())
+                                for i in range(3)])
+            db.session.commit()
+
+            promote_crawl_data(task_id=task.id)
+            db.session.commit()
+            assert dashboard_stats.counts()['news'] == News.query.count() == 3
+            assert reconcile_counters()['news'] == 0
+    finally:
+        news_store.insert_rows_ignore_duplicates = original
+
+
+def test_worker_reconciles_on_schedule(app):
+    app.config['DASHBOARD_RECONCILE_INTERVAL'] = 3600
+    worker = NewsScoringWorker(app)
+    with app.app_context():
+        assert worker.reconcile_stats_if_due()
+        assert not worker.reconcile_stats_if_due()  # 间隔未到
+        assert dashboard_stats.counts() == {'news': 0, 'topics': 0, 'comments': 0}
+
+
+if __name__ == '__main__':
+    # 数据库夹具由 conftest.py 提供，直接运行时交给 pytest 执行
+    sys.exit(pytest.main([__file__, '-q']))
@@ -0,0 +1,177 @@
+import sys
+import os
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime
+
+# 添加项目根目录到Python路径
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import pytest
+import app.utils as utils
+import app.deep_crawl as deep_crawl_module
+from app import db
+from app.article_extractor import extract_article_text
+from app.html_parser import available_backends
+from app.models import CrawlTask, CrawlData, User
+from app.rate_limit import HostBudget
+
+PARAGRAPHS = [
+    '记者获悉，成都地铁18号线三期工程今日正式开工建设，线路全长约20公里，设站6座，预计2028年建成通车。',
+    '该工程建成后，将进一步完善成都东部新区的轨道交通网络，方便市民出行，带动沿线区域发展。',
+    '相关负责人表示，项目将严格落实安全生产责任，确保工程质量，按期完成建设任务。',
+]
+
+ARTICLE_HTML = """<html><head><script>var s = '脚本里的文字，不应出现在正文中，也不应参与打分，很长很长';</script></head><body>
+<div class="nav"><p>首页 新闻 体育 财经 娱乐 科技 汽车 房产 教育 旅游 健康 文化 时尚</p></div>
+<div class="main"><div class="article-content">
+<h1>成都地铁18号线三期工程今日开工</h1>
+<p>{}</p><p>{}</p><p>相关负责人表示，<a href="/x">项目</a>将严格落实安全生产责任，确保工程质量，按期完成建设任务。</p>
+</div>
+<div class="related-news">
+<p><a href="/1">成都地铁19号线二期开通运营，沿线市民出行更方便快捷了</a></p>
+<p><a href="/2">成都轨道交通第五期建设规划获批，新增线路多条，覆盖更多区域</a></p>
+</div></div>
+<div class="footer"><p>版权所有 © 2025 某某新闻网 京ICP备12345678号 联系我们 关于我们 广告服务</p></div>
+</body></html>""".format(*PARAGRAPHS[:2])
+
+
+def add_crawl_data(task, urls):
+    rows = [CrawlData(task_id=task.id, title=f'新闻{i}', content='摘要', url=url, crawl_time=datetime.now())
+            for i, url in enumerate(urls)]
+    db.session.add_all(rows)
+    db.session.commit()
+    return [row.id for row in rows]
+
+
+def test_extract_article_text():
+    """只保留正文区域的段落，去掉导航、相关新闻和页脚"""
+    for backend in available_backends():
+        assert extract_article_text(ARTICLE_HTML, backend) == '\n'.join(PARAGRAPHS), backend
+    assert extract_article_text('') == ''
+    assert extract_article_text('<html><body><p>太短</p></body></html>') == ''
+
+
+def test_deep_crawl_task_fills_content(app):
+    original = deep_crawl_module.fetch_article
+    deep_crawl_module.fetch_article = lambda url: '' if url.endswith('/bad') else f'{url} 的正文' * 10
+    try:
+        with app.app_context():
+            task = CrawlTask(keywords='成都')
+            db.session.add(task)
+            db.session.commit()
+            ids = add_crawl_data(task, ['https://a.com/1', 'https://b.com/2', 'https://a.com/bad'])
+
+            assert deep_crawl_module.deep_crawl(task_id=task.id) == (2, 1)
+            first, second, bad = [db.session.get(CrawlData, data_id) for data_id in ids]
+            assert first.is_deep_crawled and first.deep_crawl_time is not None
+            assert first.content.startswith('https://a.com/1 的正文')
+            assert not bad.is_deep_crawled and bad.content == '摘要'
+
+            # 已深度采集的数据不再重复抓取
+            assert deep_crawl_module.deep_crawl(task_id=task.id) == (0, 1)
+    finally:
+        deep_crawl_module.fetch_article = original
+
+
+def test_per_host_concurrency_is_capped(app):
+    """不同站点并发抓取，同一站点的并发数不超过上限"""
+    active = defaultdict(int)
+    peak = defaultdict(int)
+    overall = [0, 0]
+    lock = threading.Lock()
+
+    def fake_fetch(url, timeout=10):
+        host = url.split('/')[2]
+        with lock:
+            active[host] += 1
+            overall[0] += 1
+            peak[host] = max(peak[host], active[host])
+            overall[1] = max(overall[1], overall[0])
+        time.sleep(0.05)
+        with lock:
+            active[host] -= 1
+            overall[0] -= 1
+        return ARTICLE_HTML
+
+    originals = utils.fetch_web_content, deep_crawl_module.get_article_budget
+    budget = HostBudget(max_concurrency=2, rate=1000, burst=100, max_rate=1000)
+    utils.fetch_web_content = fake_fetch
+    deep_crawl_module.get_article_budget = lambda: budget
+    try:
+        with app.app_context():
+            task = CrawlTask(keywords='成都')
+            db.session.add(task)
+            db.session.commit()
+            add_crawl_data(task, [f'https://{host}.com/{i}' for host in ('a', 'b', 'c') for i in range(6)])
+
+            assert deep_crawl_module.deep_crawl(task_id=task.id, max_workers=9) == (18, 0)
+    finally:
+        utils.fetch_web_content, deep_crawl_module.get_article_budget = originals
+
+    assert max(peak.values()) <= 2
+    assert overall[1] > 2
+
+
+def test_runner_runs_task_in_background(app):
+    original = deep_crawl_module.fetch_article
+    release = threading.Event()
+
+    def fake_fetch_article(url):
+        release.wait(5)
+        return '后台采集的正文内容' * 10
+
+    deep_crawl_module.fetch_article = fake_fetch_article
+    runner = deep_crawl_module.DeepCrawlRunner(app)
+    try:
+        with app.app_context():
+            task = CrawlTask(keywords='成都')
+            db.session.add(task)
+            db.session.commit()
+            add_crawl_data(task, ['https://a.com/1', 'https://a.com/2'])
+
+            assert runner.submit(task.id)
+            assert not runner.submit(task.id)  # 正在执行时重复提交被忽略
+            release.set()
+            for _ in range(100):
+                if not runner.is_running(task.id):
+                    break
+                time.sleep(0.05)
+            db.session.expire_all()
+            assert CrawlData.query.filter_by(task_id=task.id, is_deep_crawled=True).count() == 2
+    finally:
+        deep_crawl_module.fetch_article = original
+
+
+def test_deep_crawl_route(app):
+    """单条深度采集路由调用采集函数并写回正文"""
+    original = deep_crawl_module.fetch_article
+    deep_crawl_module.fetch_article = lambda url: '' if url.endswith('/bad') else '路由采集的正文内容' * 10
+    try:
+        with app.app_context():
+            user = User(username='admin', email='admin@example.com')
+            db.session.add(user)
+            db.session.commit()
+            task = CrawlTask(keywords='成都', user_id=user.id)
+            db.session.add(task)
+            db.session.commit()
+            good_id, bad_id = add_crawl_data(task, ['https://a.com/1', 'https://a.com/bad'])
+            user_id = user.id
+
+        client = app.test_client()
+        with client.session_transaction() as session:
+            session['_user_id'] = str(user_id)
+            session['_fresh'] = True
+
+        assert client.get(f'/deep_crawl/{good_id}').get_json() == {'status': 'success', 'message': '深度采集完成'}
+        assert client.get(f'/deep_crawl/{bad_id}').get_json()['message'] == '未能从原文中提取到正文'
+        with app.app_context():
+            assert db.session.get(CrawlData, good_id).content.startswith('路由采集的正文内容')
+    finally:
+        deep_crawl_module.fetch_article = original
+
+
+if __name__ == '__main__':
+    # 数据库夹具由 conftest.py 提供，直接运行时交给 pytest 执行
+    sys.exit(pytest.main([__file__, '-q']))
@@ -0,0 +1,114 @@
+import sys
+import os
+import time
+
+# 添加项目根目录到Python路径
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import requests
+
+import app.encoding as encoding
+from app.encoding import resolve_encoding, normalize_encoding
+
+BODY = '<p>成都地铁18号线三期工程今日正式开工建设，线路全长约20公里，设站6座，预计2028年建成通车。</p>\n'
+
+
+def make_response(content, content_type='text/html', url='https://news.example.com/a.html'):
+    response = requests.Response()
+    response.status_code = 200
+    response.url = url
+    response.headers['Content-Type'] = content_type
+    response._content = content
+    return response
+
+
+def test_header_charset_wins():
+    response = make_response(BODY.encode('gbk'), 'text/html; charset=GBK')
+    assert resolve_encoding(response) == 'gb18030'
+    response.encoding = resolve_encoding(response)
+    assert response.text == BODY
+
+
+def test_meta_charset():
+    html = '<html><head><meta http-equiv="Content-Type" content="text/html; charset=gb2312"></head>' + BODY
+    assert resolve_encoding(make_response(html.encode('gb18030'))) == 'gb18030'
+    html = '<html><head><meta charset="utf-8"></head>' + BODY
+    assert resolve_encoding(make_response(html.encode('utf-8'))) == 'utf-8'
+
+
+def test_bom_and_unknown_names():
+    assert resolve_encoding(make_response(b'\xef\xbb\xbf' + BODY.encode('utf-8'))) == 'utf-8-sig'
+    assert normalize_encoding('no-such-codec') is None
+    # 无法识别的声明被忽略，继续检测
+    html = '<meta charset="no-such-codec">' + BODY * 20
+    assert resolve_encoding(make_response(html.encode('utf-8'), url='https://unknown.example.com/')) == 'utf-8'
+
+
+def test_detection_is_cached_per_domain():
+    encoding._domain_encodings.clear()
+    content = ('<html><body>' + BODY * 50 + '</body></html>').encode('gb18030')
+    first = resolve_encoding(make_response(content, url='https://gbk.example.com/1.html'))
+    assert first == 'gb18030'
+    assert encoding._domain_encodings['gbk.example.com'] == 'gb18030'
+
+    original = encoding.chardet.detect
+    encoding.chardet.detect = lambda data: (_ for _ in ()).throw(AssertionError('不应再次检测'))
+    try:
+        assert resolve_encoding(make_response(content, url='https://gbk.example.com/2.html')) == 'gb18030'
+    finally:
+        encoding.chardet.detect = original
+
+
+def test_detection_reads_only_a_prefix():
+    """大页面只检测开头，耗时与页面大小无关"""
+    encoding._domain_encodings.clear()
+    content = ('<html><body>' + BODY * 20000 + '</body></html>').encode('utf-8')
+    start = time.time()
+    assert resolve_encoding(make_response(content, url='https://big.example.com/')) == 'utf-8'
+    elapsed = time.time() - start
+    print(f"{len(content) // 1024}KB页面编码检测耗时: {elapsed * 1000:.1f}毫秒")
+    assert elapsed < 1
+
+
+def test_ascii_head_is_skipped():
+    """开头是大段纯 ASCII 脚本时不会被判为 ascii，也不缓存无法确定的结果"""
+    encoding._domain_encodings.clear()
+    script = '<script>var config = {};</script>\n' * 700
+    content = ('<html><head>' + script + '</head><body>' + BODY * 20 + '</body></html>').encode('gbk')
+    assert len(content) > encoding.DETECT_PREFIX_BYTES
+    response = make_response(content, url='https://script.example.com/1.html')
+    assert resolve_encoding(response) == 'gb18030'
+    response.encoding = resolve_encoding(response)
+    assert BODY in response.text
+
+    ascii_page = ('<html><body>' + script + '</body></html>').encode('ascii')
+    assert resolve_encoding(make_response(ascii_page, url='https://ascii.example.com/')) == 'utf-8'
+    assert 'ascii.example.com' not in encoding._domain_encodings
+
+
+def test_domain_cache_is_bounded():
+    """域名编码缓存有上限，淘汰最久未用的域名"""
+    encoding._domain_encodings.clear()
+    original = encoding.DOMAIN_ENCODING_CACHE_SIZE
+    encoding.DOMAIN_ENCODING_CACHE_SIZE = 3
+    content = ('<html><body>' + BODY * 50 + '</body></html>').encode('gb18030')
+    try:
+        for name in 'abcd':
+            resolve_encoding(make_response(content, url=f'https://{name}.example.com/'))
+            if name == 'b':
+                resolve_encoding(make_response(content, url='https://a.example.com/'))
+        assert list(encoding._domain_encodings) == ['a.example.com', 'c.example.com', 'd.example.com']
+    finally:
+        encoding.DOMAIN_ENCODING_CACHE_SIZE = original
+        encoding._domain_encodings.clear()
+
+
+if __name__ == '__main__':
+    test_header_charset_wins()
+    test_meta_charset()
+    test_bom_and_unknown_names()
+    test_detection_is_cached_per_domain()
+    test_detection_reads_only_a_prefix()
+    test_ascii_head_is_skipped()
+    test_domain_cache_is_bounded()
+    print("编码识别测试全部通过")
@@ -0,0 +1,82 @@
+import sys
+import os
+import time
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+# 添加项目根目录到Python路径
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import random
+
+import pytest
+
+from app import db
+from app.heat import compute_heat_scores
+from app.models import News
+from app.news_store import recompute_heat_scores
+from app.tasks import NewsScoringWorker
+from app.utils import calculate_heat
+
+
+def random_rows(count, seed=0):
+    rnd = random.Random(seed)
+    now = datetime(2025, 12, 4, 12, 0)
+    return [(rnd.randint(0, 500), rnd.randint(0, 100000),
+             None if rnd.random() < 0.1 else now - timedelta(minutes=rnd.randint(-120, 60 * 24 * 30)),
+             rnd.uniform(-1, 1)) for _ in range(count)], now
+
+
+def test_matches_calculate_heat():
+    rows, now = random_rows(2000)
+    scores = compute_heat_scores(*zip(*rows), now=now)
+    for (comments, views, published, sentiment), score in zip(rows, scores):
+        news = SimpleNamespace(comments_count=comments, views_count=views,
+                               publish_time=published, sentiment_score=sentiment)
+        assert abs(calculate_heat(news, now=now) - score) <= 0.011
+
+
+def test_missing_values():
+    now = datetime(2025, 12, 4, 12, 0)
+    scores = compute_heat_scores([None, 10], [None, 0], [None, now + timedelta(hours=1)], [None, 1.0], now=now)
+    assert list(scores) == [0.0, 30.0]
+
+
+def test_recompute_heat_scores(app):
+    with app.app_context():
+        rows, _ = random_rows(300, seed=1)
+        db.session.add_all([News(title=f'新闻{i}', url=f'https://example.com/{i}', comments_count=comments,
+                                 views_count=views, publish_time=published, sentiment_score=sentiment)
+                            for i, (comments, views, published, sentiment) in enumerate(rows)])
+        db.session.commit()
+
+        start = time.time()
+        checked, updated = recompute_heat_scores(chunk_size=128)
+        elapsed = time.time() - start
+        assert checked == 300 and updated > 250
+
+        now = datetime.now()
+        for news in News.query.all():
+            assert abs(news.heat_score - calculate_heat(news, now=now)) <= 0.011
+
+        # 紧接着再算一次，只有极少数行因时间衰减变化
+        assert recompute_heat_scores()[1] < 30
+        print(f"重算300条新闻热度耗时: {elapsed * 1000:.1f}毫秒")
+
+
+def test_worker_refreshes_heat_on_schedule(app):
+    app.config['NEWS_HEAT_REFRESH_INTERVAL'] = 3600
+    worker = NewsScoringWorker(app)
+    with app.app_context():
+        db.session.add(News(title='新闻', url='https://example.com/a', comments_count=10, views_count=0,
+                            sentiment_score=0.0, heat_score=0.0, is_processed=True))
+        db.session.commit()
+
+        assert worker.refresh_heat_if_due()
+        assert not worker.refresh_heat_if_due()  # 间隔未到
+        assert News.query.one().heat_score == 20.0
+
+
+if __name__ == '__main__':
+    # 数据库夹具由 conftest.py 提供，直接运行时交给 pytest 执行
+    sys.exit(pytest.main([__file__, '-q']))
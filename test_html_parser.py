@@ -0,0 +1,97 @@
+import sys
+import os
+import glob
+
+# 添加项目根目录到Python路径
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.html_parser import parse_html, available_backends, get_parser_backend
+from app.utils import parse_baidu_news, find_result_containers
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+# 仓库根目录下保存的页面，包括有搜索结果和没有搜索结果的页面
+FIXTURES = sorted(glob.glob(os.path.join(ROOT, '*.html'))) + [os.path.join(ROOT, 'baidu_news_debug.txt')]
+
+
+def read_fixture(path):
+    with open(path, encoding='utf-8', errors='replace') as f:
+        return f.read()
+
+
+def parse_with(html, backend):
+    news_list = list(parse_baidu_news(html, '成都', 1, 100, parser_backend=backend))
+    for news in news_list:
+        news.pop('crawl_time')
+    return news_list
+
+
+def test_backends_extract_same_news():
+    """所有可用后端在保存的页面上提取出完全相同的新闻"""
+    for path in FIXTURES:
+        html = read_fixture(path)
+        expected = parse_with(html, 'html.parser')
+        for backend in available_backends():
+            assert parse_with(html, backend) == expected, f'{backend}: {os.path.basename(path)}'
+
+
+def test_backends_find_same_container_text():
+    for path in FIXTURES:
+        html = read_fixture(path)
+        expected = [[container.get_text() for container in containers]
+                    for _, containers in find_result_containers(parse_html(html, 'html.parser'))]
+        for backend in available_backends():
+            texts = [[container.get_text() for container in containers]
+                     for _, containers in find_result_containers(parse_html(html, backend))]
+            assert texts == expected, f'{backend}: {os.path.basename(path)}'
+
+
+def test_get_text_skips_scripts_and_comments():
+    html = '<div id="a"> a <script>x</script>b<!--c-->d<style>y</style>&amp;<br>\n  <pre>  </pre></div>'
+    for backend in available_backends():
+        div = parse_html(html, backend).find('div')
+        assert div.get_text() == ' a bd&\n  ', backend
+        assert div.get_text(strip=True) == 'abd&', backend
+
+
+def test_fallback_containers():
+    """没有h3时退化为链接的父元素，各后端一致"""
+    html = '<p><a href="https://example.com/a">成都新闻标题</a></p><span><a href="/b">链接</a></span>'
+    for backend in available_backends():
+        groups = find_result_containers(parse_html(html, backend))
+        assert [containers[0].name for _, containers in groups] == ['p', 'span'], backend
+
+
+def test_documents_without_elements():
+    """只有注释或XML声明的页面解析为空文档，不抛异常"""
+    for html in ('<!-- c -->', '<?xml version="1.0"?>', ''):
+        for backend in available_backends():
+            assert parse_with(html, backend) == [], backend
+            assert parse_html(html, backend).find('div') is None, backend
+
+
+def test_backend_selection():
+    previous = os.environ.get('CRAWL_HTML_PARSER')
+    os.environ['CRAWL_HTML_PARSER'] = 'html.parser'
+    try:
+        assert get_parser_backend() == 'html.parser'
+        os.environ['CRAWL_HTML_PARSER'] = 'unknown'
+        assert get_parser_backend() == 'html.parser'
+        os.environ['CRAWL_HTML_PARSER'] = 'auto'
+        assert get_parser_backend() == available_backends()[0]
+    finally:
+        # 恢复调用前的设置，不影响其他测试
+        if previous is None:
+            del os.environ['CRAWL_HTML_PARSER']
+        else:
+            os.environ['CRAWL_HTML_PARSER'] = previous
+
+
+if __name__ == '__main__':
+    test_backends_extract_same_news()
+    test_backends_find_same_container_text()
+    test_get_text_skips_scripts_and_comments()
+    test_fallback_containers()
+    test_documents_without_elements()
+    test_backend_selection()
+    print(f"HTML解析后端测试全部通过（可用后端: {', '.join(available_backends())}）")
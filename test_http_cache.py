@@ -0,0 +1,164 @@
+import sys
+import os
+import tempfile
+import threading
+
+# 添加项目根目录到Python路径
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import requests
+
+import app.utils as utils
+from app.http_cache import HttpCache
+
+
+def make_response(url, body, status=200, headers=None):
+    response = requests.Response()
+    response.status_code = status
+    response.url = url
+    response.headers.update(headers or {})
+    response._content = body
+    return response
+
+
+class FakeClient:
+    """按脚本返回响应，并记录每次请求的请求头"""
+
+    def __init__(self, etag='"v1"', body='<html>新闻正文</html>'.encode('utf-8') * 100):
+        self.etag = etag
+        self.body = body
+        self.requests = []
+
+    def get(self, url, headers=None, **kwargs):
+        self.requests.append(headers or {})
+        if headers and headers.get('If-None-Match') == self.etag:
+            return make_response(url, b'', status=304)
+        return make_response(url, self.body, headers={
+            'Content-Type': 'text/html; charset=utf-8', 'ETag': self.etag})
+
+
+def test_fresh_entry_skips_request():
+    with tempfile.TemporaryDirectory() as directory:
+        cache = HttpCache(os.path.join(directory, 'cache.sqlite'), ttl=60)
+        client = FakeClient()
+        first = cache.get(client, 'https://example.com/a')
+        second = cache.get(client, 'https://example.com/a')
+        assert len(client.requests) == 1
+        assert not first.from_cache and second.from_cache
+        assert second.text == first.text
+        assert second.headers['ETag'] == '"v1"'
+
+
+def test_expired_entry_revalidates_with_etag():
+    with tempfile.TemporaryDirectory() as directory:
+        cache = HttpCache(os.path.join(directory, 'cache.sqlite'), ttl=0)
+        client = FakeClient()
+        body = cache.get(client, 'https://example.com/a').content
+
+        response = cache.get(client, 'https://example.com/a')
+        assert client.requests[-1]['If-None-Match'] == '"v1"'
+        assert response.from_cache and response.content == body
+
+        # 内容变化时服务器返回新正文，缓存随之更新
+        client.etag, client.body = '"v2"', '<html>更新后的正文</html>'.encode('utf-8')
+        assert cache.get(client, 'https://example.com/a').text == '<html>更新后的正文</html>'
+        assert cache.lookup('https://example.com/a', ttl=60).text == '<html>更新后的正文</html>'
+
+
+def test_bodies_are_compressed_and_evicted_lru():
+    with tempfile.TemporaryDirectory() as directory:
+        cache = HttpCache(os.path.join(directory, 'cache.sqlite'), ttl=60, evict_every=1)
+        client = FakeClient()
+        cache.get(client, 'https://example.com/a')
+        size = cache._connection().execute('SELECT size FROM http_cache').fetchone()[0]
+        assert size < len(client.body) / 10
+
+        cache.max_bytes = size * 2
+        cache.get(client, 'https://example.com/b')
+        cache.get(client, 'https://example.com/a')  # a 最近访问过，应淘汰 b
+        cache.get(client, 'https://example.com/c')
+        assert cache.lookup('https://example.com/a') is not None
+        assert cache.lookup('https://example.com/b') is None
+        assert cache.lookup('https://example.com/c') is not None
+
+
+def test_eviction_checked_every_n_writes():
+    """总大小只在每写入 evict_every 条时统计一次"""
+    with tempfile.TemporaryDirectory() as directory:
+        cache = HttpCache(os.path.join(directory, 'cache.sqlite'), ttl=60, max_bytes=0, evict_every=3)
+        client = FakeClient()
+        for name in 'ab':
+            cache.get(client, f'https://example.com/{name}')
+        assert cache._connection().execute('SELECT COUNT(*) FROM http_cache').fetchone()[0] == 2
+        cache.get(client, 'https://example.com/c')
+        assert cache._connection().execute('SELECT COUNT(*) FROM http_cache').fetchone()[0] == 0
+
+
+def test_304_without_cached_body_is_retried():
+    """没有缓存时收到304，去掉校验头重新请求，不把空正文当作成功"""
+    with tempfile.TemporaryDirectory() as directory:
+        cache = HttpCache(os.path.join(directory, 'cache.sqlite'), ttl=60)
+        client = FakeClient()
+        response = cache.get(client, 'https://example.com/a', headers={'If-None-Match': '"v1"'})
+        assert response.status_code == 200 and response.content == client.body
+        assert len(client.requests) == 2 and 'If-None-Match' not in client.requests[-1]
+        assert cache.lookup('https://example.com/a') is not None
+
+
+def test_errors_and_no_store_are_not_cached():
+    with tempfile.TemporaryDirectory() as directory:
+        cache = HttpCache(os.path.join(directory, 'cache.sqlite'), ttl=60)
+        assert not cache.store('https://example.com/a', make_response('https://example.com/a', b'x', status=500))
+        assert not cache.store('https://example.com/b', make_response(
+            'https://example.com/b', b'x', headers={'Cache-Control': 'no-store'}))
+        assert cache.lookup('https://example.com/a') is None
+        assert cache.lookup('https://example.com/b') is None
+
+
+def test_shared_between_threads():
+    with tempfile.TemporaryDirectory() as directory:
+        cache = HttpCache(os.path.join(directory, 'cache.sqlite'), ttl=60)
+        client = FakeClient()
+        errors = []
+
+        def worker(i):
+            try:
+                for j in range(20):
+                    assert cache.get(client, f'https://example.com/{(i + j) % 5}').status_code == 200
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=worker, args=(i,)) for i in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert not errors
+
+
+def test_fetch_web_content_uses_cache():
+    with tempfile.TemporaryDirectory() as directory:
+        cache = HttpCache(os.path.join(directory, 'cache.sqlite'), ttl=60)
+        client = FakeClient()
+        originals = utils.get_http_client, utils.get_http_cache
+        utils.get_http_client = lambda: client
+        utils.get_http_cache = lambda: cache
+        try:
+            first = utils.fetch_web_content('https://example.com/article')
+            second = utils.fetch_web_content('https://example.com/article')
+        finally:
+            utils.get_http_client, utils.get_http_cache = originals
+        assert first == second and '新闻正文' in first
+        assert len(client.requests) == 1
+
+
+if __name__ == '__main__':
+    test_fresh_entry_skips_request()
+    test_expired_entry_revalidates_with_etag()
+    test_bodies_are_compressed_and_evicted_lru()
+    test_eviction_checked_every_n_writes()
+    test_304_without_cached_body_is_retried()
+    test_errors_and_no_store_are_not_cached()
+    test_shared_between_threads()
+    test_fetch_web_content_uses_cache()
+    print("HTTP缓存测试全部通过")
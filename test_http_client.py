@@ -0,0 +1,116 @@
+import sys
+import os
+import threading
+
+# 添加项目根目录到Python路径
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.http_client import CrawlerHttpClient, domain_matches
+
+
+class FakeResponse:
+    status_code = 200
+    text = 'ok'
+
+    def raise_for_status(self):
+        pass
+
+
+def make_client(cookie_ttl=1800):
+    """构造一个不发出真实请求的客户端，记录请求过的URL"""
+    client = CrawlerHttpClient(cookie_ttl=cookie_ttl)
+    calls = []
+
+    def fake_get(url, **kwargs):
+        calls.append(url)
+        if url == 'https://www.baidu.com/':
+            client.session.cookies.set('BAIDUID', 'abc', domain='.baidu.com', path='/')
+        return FakeResponse()
+
+    client.session.get = fake_get
+    return client, calls
+
+
+def test_cookies_reused_across_requests():
+    """预热页面只在首次请求时访问一次"""
+    client, calls = make_client()
+    for page in range(3):
+        client.get(f'https://www.baidu.com/s?pn={page}', warmup_url='https://www.baidu.com/')
+    assert calls.count('https://www.baidu.com/') == 1
+    assert len(calls) == 4
+
+
+def test_cookies_refetched_after_ttl():
+    """Cookie过期后重新访问预热页面"""
+    client, calls = make_client(cookie_ttl=0)
+    client.get('https://www.baidu.com/s?pn=0', warmup_url='https://www.baidu.com/')
+    client.get('https://www.baidu.com/s?pn=10', warmup_url='https://www.baidu.com/')
+    assert calls.count('https://www.baidu.com/') == 2
+
+
+def test_reset_cookies():
+    """重置后丢弃Cookie并在下次请求时重新获取"""
+    client, calls = make_client()
+    client.get('https://www.baidu.com/s?pn=0', warmup_url='https://www.baidu.com/')
+    client.reset_cookies('www.baidu.com')
+    assert not [c for c in client.session.cookies if c.domain.endswith('baidu.com')]
+    client.get('https://www.baidu.com/s?pn=10', warmup_url='https://www.baidu.com/')
+    assert calls.count('https://www.baidu.com/') == 2
+
+
+def test_cookie_domains_match_on_label_boundary():
+    """相似域名的Cookie不影响目标主机"""
+    assert domain_matches('www.baidu.com', '.baidu.com')
+    assert domain_matches('baidu.com', 'baidu.com')
+    assert not domain_matches('evil-baidu.com', '.baidu.com')
+    assert not domain_matches('www.baidu.com', '')
+
+    client, calls = make_client()
+    client.get('https://www.baidu.com/s?pn=0', warmup_url='https://www.baidu.com/')
+    client.session.cookies.set('other', 'x', domain='.evil-baidu.com', path='/')
+    client.reset_cookies('evil-baidu.com')
+    assert [c.name for c in client.session.cookies] == ['BAIDUID']
+
+
+def test_adapter_shared_by_all_hosts():
+    """http和https共用同一个连接池适配器"""
+    client = CrawlerHttpClient(pool_connections=4, pool_maxsize=8)
+    adapter = client.session.get_adapter('https://news.example.com/')
+    assert adapter is client.session.get_adapter('http://www.example.com/')
+    assert adapter._pool_maxsize == 8
+
+
+def test_cookie_checks_while_other_threads_write():
+    """其他线程写入Cookie时检查和重置Cookie不会因容器变化而出错"""
+    client, _ = make_client()
+    client.get('https://www.baidu.com/s?pn=0', warmup_url='https://www.baidu.com/')
+    stop = threading.Event()
+
+    def writer():
+        i = 0
+        while not stop.is_set():
+            # 轮流新增和删除域名，Cookie容器的字典大小持续变化
+            domain = f'h{i % 50}.example.com'
+            client.session.cookies.set('c', 'v', domain=domain, path='/')
+            client.session.cookies.clear(domain)
+            i += 1
+
+    thread = threading.Thread(target=writer)
+    thread.start()
+    try:
+        for _ in range(2000):
+            client._cookies_valid('www.baidu.com')
+        client.reset_cookies('www.baidu.com')
+    finally:
+        stop.set()
+        thread.join()
+
+
+if __name__ == '__main__':
+    test_cookies_reused_across_requests()
+    test_cookies_refetched_after_ttl()
+    test_reset_cookies()
+    test_cookie_domains_match_on_label_boundary()
+    test_adapter_shared_by_all_hosts()
+    test_cookie_checks_while_other_threads_write()
+    print("HTTP客户端测试全部通过")
@@ -0,0 +1,92 @@
+import sys
+import os
+import json
+import logging
+
+# 添加项目根目录到Python路径
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.logging_config import StructuredFormatter, JsonFormatter, _DeferredQueueHandler, parse_module_levels
+from app.utils import parse_baidu_news
+
+FIXTURE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'full_page.html')
+
+
+class ListHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.records = []
+
+    def emit(self, record):
+        self.records.append(record)
+
+
+def make_record(msg, args=(), **fields):
+    record = logging.LogRecord('app.utils', logging.INFO, __file__, 1, msg, args, None)
+    record.__dict__.update(fields)
+    return record
+
+
+def test_structured_formatter_appends_fields():
+    formatter = StructuredFormatter('%(levelname)s %(name)s: %(message)s')
+    line = formatter.format(make_record('第 %d 页处理完成', (1,), keyword='成都 地铁', page=1))
+    assert line == 'INFO app.utils: 第 1 页处理完成 keyword="成都 地铁" page=1'
+    assert formatter.format(make_record('无字段')) == 'INFO app.utils: 无字段'
+
+
+def test_json_formatter():
+    entry = json.loads(JsonFormatter().format(make_record('抓取完成', keyword='成都')))
+    assert entry['message'] == '抓取完成'
+    assert entry['keyword'] == '成都'
+    assert entry['logger'] == 'app.utils'
+
+
+def test_parse_module_levels():
+    levels = parse_module_levels('app.utils=debug, app.main=WARNING,bad,x=NOPE')
+    assert levels == {'app.utils': logging.DEBUG, 'app.main': logging.WARNING}
+
+
+def test_queue_handler_defers_formatting():
+    """入队时不拼接消息，格式化留给监听线程"""
+    class Queue(list):
+        put_nowait = list.append
+
+    log_queue = Queue()
+    _DeferredQueueHandler(log_queue).handle(make_record('第 %d 页', (2,)))
+    record = log_queue[0]
+    assert record.msg == '第 %d 页' and record.args == (2,)
+
+
+def test_info_level_skips_per_item_logging():
+    """INFO级别下逐条新闻不产生日志记录，DEBUG级别下逐条输出明细"""
+    with open(FIXTURE, encoding='utf-8') as f:
+        html_content = f.read()
+
+    logger = logging.getLogger('app.utils')
+    handler = ListHandler()
+    logger.addHandler(handler)
+    old_level = logger.level
+    try:
+        logger.setLevel(logging.INFO)
+        news = list(parse_baidu_news(html_content, '成都', num_per_page=10))
+        assert news
+        assert [record.levelno for record in handler.records] == [logging.INFO]
+
+        handler.records.clear()
+        logger.setLevel(logging.DEBUG)
+        assert list(parse_baidu_news(html_content, '成都', num_per_page=10)) == news
+        items = [record for record in handler.records if hasattr(record, 'summary')]
+        assert len(items) == len(news)
+        assert items[0].url == news[0]['url']
+    finally:
+        logger.setLevel(old_level)
+        logger.removeHandler(handler)
+
+
+if __name__ == '__main__':
+    test_structured_formatter_appends_fields()
+    test_json_formatter()
+    test_parse_module_levels()
+    test_queue_handler_defers_formatting()
+    test_info_level_skips_per_item_logging()
+    print("日志配置测试全部通过")
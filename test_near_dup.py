@@ -0,0 +1,155 @@
+import sys
+import os
+
+# 添加项目根目录到Python路径
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import pytest
+from app import db
+import app.near_dup as near_dup
+from app.models import News, NewsLshBucket, CrawlTask, CrawlData
+from app.near_dup import MinHashIndex, minhash, similarity, lsh_buckets, LSH_BANDS
+from app.news_store import promote_crawl_data, index_near_duplicates
+
+METRO = ('成都地铁18号线三期工程正式开工 预计2028年建成通车',
+         '记者从成都轨道集团获悉，成都地铁18号线三期工程今日正式开工建设，线路全长约30公里，预计2028年建成通车。')
+METRO_REPOST = ('成都地铁18号线三期正式开工，预计2028年建成通车',
+                '记者从成都轨道集团获悉，成都地铁18号线三期工程今日正式开工建设，线路全长约30公里，预计2028年建成通车。')
+RAIN = ('四川发布暴雨蓝色预警 成都等地有大到暴雨',
+        '四川省气象台发布暴雨蓝色预警，预计今晚到明天，成都、德阳、绵阳等地部分地区有大到暴雨，局地大暴雨。')
+RAIN_REPOST = ('四川省气象台发布暴雨蓝色预警：成都等地有大到暴雨',
+               '四川省气象台今日发布暴雨蓝色预警，预计今晚到明天，成都、德阳、绵阳等地部分地区有大到暴雨，局地大暴雨。请注意防范。')
+METRO_OTHER = ('成都地铁19号线二期工程正式开通运营',
+               '记者从成都轨道集团获悉，成都地铁19号线二期工程今日正式开通运营，线路全长约43公里，设站12座。')
+
+
+def test_signature_similarity():
+    """转载稿件相似度高，同主题的不同新闻相似度低"""
+    assert similarity(minhash(*METRO), minhash(*METRO_REPOST)) >= 0.8
+    assert similarity(minhash(*METRO), minhash(*METRO_OTHER)) < 0.6
+    assert minhash('新闻', '') is None
+    assert len(lsh_buckets(minhash(*METRO))) == LSH_BANDS
+
+
+def test_index_finds_near_copies():
+    index = MinHashIndex()
+    index.add(minhash(*METRO), 'metro')
+    index.add(minhash(*RAIN), 'rain')
+    assert index.find(minhash(*METRO_REPOST)) == 'metro'
+    assert index.find(minhash(*RAIN_REPOST)) == 'rain'
+    assert index.find(minhash(*METRO_OTHER)) is None
+
+
+def test_find_scores_each_candidate_once():
+    """与签名共享多个桶的候选只比较一次"""
+    index = MinHashIndex()
+    index.add(minhash(*METRO), 'metro')
+    calls = []
+    original = near_dup.similarity
+    near_dup.similarity = lambda a, b: calls.append(1) or original(a, b)
+    try:
+        assert index.find(minhash(*METRO)) == 'metro'
+    finally:
+        near_dup.similarity = original
+    assert len(calls) == 1
+
+
+def test_promote_does_not_tokenize(app):
+    """保存请求不计算签名，由后台任务建立索引"""
+    original = near_dup.tokenize
+    near_dup.tokenize = lambda text: (_ for _ in ()).throw(AssertionError('保存时不应分词'))
+    try:
+        with app.app_context():
+            task = CrawlTask(keywords='成都')
+            db.session.add(task)
+            db.session.commit()
+            row = CrawlData(task_id=task.id, title=METRO[0], content=METRO[1], url='https://site0.com/a')
+            db.session.add(row)
+            db.session.commit()
+            assert promote_crawl_data([row.id]) == (1, 0)
+            db.session.commit()
+            assert News.query.one().minhash is None
+    finally:
+        near_dup.tokenize = original
+
+
+def test_promote_clusters_near_duplicates(app):
+    """URL不同的转载稿件照常保存，建立索引后归入最早一条新闻的簇"""
+    with app.app_context():
+        db.session.add(News(title='已存在', url='https://example.com/old'))
+        task = CrawlTask(keywords='成都')
+        db.session.add(task)
+        db.session.commit()
+        rows = [CrawlData(task_id=task.id, title=title, content=content, url=f'https://site{i}.com/a')
+                for i, (title, content) in enumerate((METRO, RAIN, METRO_REPOST, METRO_OTHER))]
+        db.session.add_all(rows)
+        db.session.commit()
+        promote_crawl_data([row.id for row in rows[:2]])
+        db.session.commit()
+        assert index_near_duplicates() == (3, 0)
+        promote_crawl_data([row.id for row in rows[2:]])
+        db.session.commit()
+        assert index_near_duplicates() == (2, 1)
+
+        metro = News.query.filter_by(url='https://site0.com/a').one()
+        assert metro.cluster_id is None
+        assert News.query.filter_by(url='https://site2.com/a').one().cluster_id == metro.id
+        assert News.query.filter_by(url='https://site3.com/a').one().cluster_id is None
+        # 只有簇首写入分桶，无法计算签名的新闻也不再重复处理
+        assert NewsLshBucket.query.count() == 3 * LSH_BANDS
+        assert News.query.filter_by(url='https://example.com/old').one().minhash == ''
+
+
+def test_promote_clusters_within_batch(app):
+    with app.app_context():
+        task = CrawlTask(keywords='成都')
+        db.session.add(task)
+        db.session.commit()
+        rows = [CrawlData(task_id=task.id, title=title, content=content, url=f'https://site{i}.com/a')
+                for i, (title, content) in enumerate((RAIN, RAIN_REPOST, RAIN_REPOST))]
+        db.session.add_all(rows)
+        db.session.commit()
+        promote_crawl_data([row.id for row in rows])
+        db.session.commit()
+        index_near_duplicates()
+
+        rain = News.query.filter_by(url='https://site0.com/a').one()
+        assert [news.cluster_id for news in News.query.order_by(News.id)] == [None, rain.id, rain.id]
+
+
+def test_syndicated_story_is_linear(app):
+    """同一稿件的大量转载只与簇首比较，比较次数随条数线性增长"""
+    calls = []
+    original = near_dup.similarity
+    near_dup.similarity = lambda a, b: calls.append(1) or original(a, b)
+    try:
+        with app.app_context():
+            db.session.add_all([News(title=f'{METRO[0]} 来源{i}', content=METRO[1], url=f'https://site{i}.com/a')
+                                for i in range(300)])
+            db.session.commit()
+            assert index_near_duplicates(chunk_size=100) == (300, 299)
+    finally:
+        near_dup.similarity = original
+    assert len(calls) < 2 * 300
+    with app.app_context():
+        assert NewsLshBucket.query.count() == LSH_BANDS
+
+
+def test_backfill_existing_news(app):
+    """为建立索引之前保存的新闻补建索引"""
+    with app.app_context():
+        db.session.add_all([News(title=title, content=content, url=f'https://site{i}.com/a')
+                            for i, (title, content) in enumerate((METRO, RAIN, METRO_REPOST))])
+        db.session.commit()
+
+        assert index_near_duplicates(chunk_size=2, max_batches=1) == (2, 0)
+        indexed, clustered = index_near_duplicates(chunk_size=2)
+        assert (indexed, clustered) == (1, 1)
+        metro = News.query.filter_by(url='https://site0.com/a').one()
+        assert News.query.filter_by(url='https://site2.com/a').one().cluster_id == metro.id
+        assert index_near_duplicates() == (0, 0)
+
+
+if __name__ == '__main__':
+    # 数据库夹具由 conftest.py 提供，直接运行时交给 pytest 执行
+    sys.exit(pytest.main([__file__, '-q']))
@@ -0,0 +1,90 @@
+import sys
+import os
+import time
+from datetime import datetime, timedelta
+
+# 添加项目根目录到Python路径
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import pytest
+
+from app import db
+from app.models import News, CrawlTask, CrawlData
+from app.news_store import promote_crawl_data
+from app.tasks import NewsScoringWorker
+from app.utils import analyze_sentiment, calculate_heat
+
+
+@pytest.fixture
+def app(app):
+    app.config['NEWS_SCORING_BATCH_SIZE'] = 2
+    app.config['NEWS_SCORING_POLL_INTERVAL'] = 0.05
+    return app
+
+
+def add_news(count):
+    rows = [News(title=f'成都新闻{i}', content='项目进展顺利，获得成功，市民非常满意。',
+                 url=f'https://example.com/{i}', publish_time=datetime.now() - timedelta(hours=i),
+                 comments_count=i, views_count=100 * i) for i in range(count)]
+    db.session.add_all(rows)
+    db.session.commit()
+    return rows
+
+
+def test_process_batch_is_incremental_and_idempotent(app):
+    worker = NewsScoringWorker(app)
+    with app.app_context():
+        add_news(5)
+        # 每批评分2条，并为2条新闻建立近似重复索引
+        assert [worker.process_batch() for _ in range(4)] == [4, 4, 2, 0]
+
+        for news in News.query.all():
+            assert news.is_processed
+            assert news.sentiment_score == analyze_sentiment(f'{news.title}\n{news.content}') == 1.0
+            # 热度按写入时的时间计算，与重新计算的结果只差几毫秒的时间衰减
+            assert abs(news.heat_score - calculate_heat(news)) < 0.1
+            assert news.heat_score > 0 or news.comments_count == 0
+
+        # 重复处理得到相同的结果
+        scores = [(news.sentiment_score, news.heat_score) for news in News.query.order_by(News.id)]
+        News.query.update({'is_processed': False})
+        db.session.commit()
+        while worker.process_batch():
+            pass
+        assert [(news.sentiment_score, news.heat_score) for news in News.query.order_by(News.id)] == scores
+
+
+def test_worker_scores_promoted_news_in_background(app):
+    """保存后台新闻只需唤醒评分线程，评分在后台完成"""
+    worker = NewsScoringWorker(app)
+    with app.app_context():
+        task = CrawlTask(keywords='成都')
+        db.session.add(task)
+        db.session.commit()
+        rows = [CrawlData(task_id=task.id, title=f'成都新闻{i}', content='这个方案很好，大家都很满意',
+                          url=f'https://example.com/news/{i}') for i in range(5)]
+        db.session.add_all(rows)
+        db.session.commit()
+        promote_crawl_data([row.id for row in rows])
+        db.session.commit()
+        assert News.query.filter_by(is_processed=False).count() == 5
+
+    worker.notify()
+    deadline = time.time() + 5
+    remaining = None
+    while time.time() < deadline:
+        with app.app_context():
+            remaining = News.query.filter(News.is_processed.isnot(True)).count()
+        if remaining == 0:
+            break
+        time.sleep(0.05)
+    worker.stop()
+    assert remaining == 0
+    with app.app_context():
+        assert all(news.sentiment_score == 1.0 for news in News.query.all())
+        assert News.query.filter(News.minhash.is_(None)).count() == 0
+
+
+if __name__ == '__main__':
+    # 数据库夹具由 conftest.py 提供，直接运行时交给 pytest 执行
+    sys.exit(pytest.main([__file__, '-q']))
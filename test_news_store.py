@@ -0,0 +1,163 @@
+import sys
+import os
+import time
+from datetime import datetime
+
+# 添加项目根目录到Python路径
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import pytest
+from sqlalchemy import event
+
+import app.news_store as news_store
+from app import db
+from app.models import News, CrawlTask, CrawlData
+from app.news_store import promote_crawl_data, insert_ignore_duplicates, insert_rows_ignore_duplicates
+from app.url_utils import url_hash
+
+
+def add_crawl_data(task, count, prefix='https://example.com/news/'):
+    rows = [CrawlData(task_id=task.id, title=f'新闻{i}', content='摘要', source='人民网',
+                      url=f'{prefix}{i}', crawl_time=datetime.now()) for i in range(count)]
+    db.session.add_all(rows)
+    db.session.commit()
+    return [row.id for row in rows]
+
+
+def test_promote_skips_existing_urls(app):
+    with app.app_context():
+        task = CrawlTask(keywords='成都')
+        db.session.add(task)
+        db.session.add(News(title='已存在', url='https://example.com/news/1'))
+        db.session.commit()
+        data_ids = add_crawl_data(task, 5)
+
+        saved, exists = promote_crawl_data(data_ids)
+        db.session.commit()
+
+        assert (saved, exists) == (4, 1)
+        assert News.query.count() == 5
+        linked = CrawlData.query.filter(CrawlData.news_id.isnot(None)).count()
+        assert linked == 4
+        news = News.query.filter_by(url='https://example.com/news/3').one()
+        assert CrawlData.query.filter_by(url=news.url).one().news_id == news.id
+
+
+def test_promote_duplicate_urls_in_selection(app):
+    """不同任务采集到相同URL、同批选中时只保存一次"""
+    with app.app_context():
+        task = CrawlTask(keywords='成都')
+        other = CrawlTask(keywords='成都')
+        db.session.add_all([task, other])
+        db.session.commit()
+        data_ids = add_crawl_data(task, 3) + add_crawl_data(other, 3)
+
+        saved, exists = promote_crawl_data(data_ids)
+        db.session.commit()
+        assert (saved, exists) == (3, 3)
+
+
+def test_promote_by_task(app):
+    with app.app_context():
+        task = CrawlTask(keywords='成都')
+        other = CrawlTask(keywords='重庆')
+        db.session.add_all([task, other])
+        db.session.commit()
+        add_crawl_data(task, 3)
+        add_crawl_data(other, 2, prefix='https://example.com/other/')
+
+        saved, exists = promote_crawl_data(task_id=task.id)
+        db.session.commit()
+        assert (saved, exists) == (3, 0)
+
+
+def test_promote_dedups_normalized_urls(app):
+    """只有跟踪参数、锚点或大小写不同的URL视为同一条新闻"""
+    with app.app_context():
+        tasks = [CrawlTask(keywords='成都') for _ in range(3)]
+        db.session.add_all(tasks)
+        db.session.add(News(title='已存在', url='https://Example.com/news/1/?utm_source=baidu'))
+        db.session.commit()
+        rows = [CrawlData(task_id=task.id, title='新闻', url=url) for task, url in zip(tasks, (
+            'https://example.com/news/1#comments',
+            'https://example.com/news/2?b=2&a=1',
+            'https://example.com/news/2?a=1&b=2&from=baidu',
+        ))]
+        db.session.add_all(rows)
+        db.session.commit()
+
+        saved, exists = promote_crawl_data([row.id for row in rows])
+        db.session.commit()
+        assert (saved, exists) == (1, 2)
+
+
+def test_insert_ignores_conflicts(app):
+    """唯一索引冲突时跳过而不是报错"""
+    with app.app_context():
+        db.session.add(News(title='已存在', url='https://example.com/a'))
+        db.session.commit()
+        rows = [{'title': '重复', 'url': 'https://example.com/a', 'url_hash': url_hash('https://example.com/a')},
+                {'title': '新的', 'url': 'https://example.com/b', 'url_hash': url_hash('https://example.com/b')}]
+        assert insert_rows_ignore_duplicates(News, ['url_hash'], rows) == 1
+        db.session.commit()
+        assert News.query.count() == 2
+        assert News.query.filter_by(url='https://example.com/a').one().title == '已存在'
+        assert insert_rows_ignore_duplicates(News, ['url_hash'], rows) == 0
+        assert insert_rows_ignore_duplicates(News, ['url_hash'], []) == 0
+
+
+def test_promote_counts_only_inserted_rows(app):
+    """判重之后被并发写入方抢先插入的新闻不计入保存数量"""
+    original = news_store.insert_rows_ignore_duplicates
+
+    def racing_insert(model, index_elements, rows):
+        # 模拟另一个写入方在判重查询之后插入了同一URL
+        url = 'https://example.com/news/0'
+        db.session.execute(insert_ignore_duplicates(News, ['url_hash']),
+                           [{'title': '并发写入', 'url': url, 'url_hash': url_hash(url)}])
+        return original(model, index_elements, rows)
+
+    news_store.insert_rows_ignore_duplicates = racing_insert
+    try:
+        with app.app_context():
+            task = CrawlTask(keywords='成都')
+            db.session.add(task)
+            db.session.commit()
+            ids = add_crawl_data(task, 3)
+            saved, exists = promote_crawl_data(ids)
+            db.session.commit()
+            assert (saved, exists) == (2, 1)
+            assert News.query.count() == 3
+            assert all(row.news_id for row in CrawlData.query)
+    finally:
+        news_store.insert_rows_ignore_duplicates = original
+
+
+def test_promote_query_count_is_constant(app):
+    """保存500条数据的查询次数与条数无关"""
+    with app.app_context():
+        task = CrawlTask(keywords='成都')
+        db.session.add(task)
+        db.session.commit()
+        data_ids = add_crawl_data(task, 500)
+
+        statements = []
+        listener = lambda conn, cursor, statement, *args: statements.append(statement)
+        event.listen(db.engine, 'before_cursor_execute', listener)
+        try:
+            start = time.time()
+            saved, exists = promote_crawl_data(data_ids)
+            db.session.commit()
+            elapsed = time.time() - start
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', listener)
+
+        assert saved == 500
+        # 含已存在URL查询、批量插入、回写 news_id 和仪表盘计数
+        assert len(statements) <= 9
+        print(f"保存500条数据耗时: {elapsed * 1000:.1f}毫秒")
+
+
+if __name__ == '__main__':
+    # 数据库夹具由 conftest.py 提供，直接运行时交给 pytest 执行
+    sys.exit(pytest.main([__file__, '-q']))
@@ -0,0 +1,96 @@
+import sys
+import os
+import time
+import subprocess
+import tempfile
+from datetime import datetime
+
+# 添加项目根目录到Python路径
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import pytest
+import jieba
+import jieba.analyse
+
+from app import db
+from app.models import News, Topic
+from app.nlp import analyze_document, analyze_documents, keywords_from_tokens, tokenize
+from app.news_store import analyze_stored_news
+from app.utils import analyze_sentiment, extract_keywords
+
+TEXTS = [
+    '成都地铁18号线三期工程今日正式开工建设，线路全长约20公里，设站6座，预计2028年建成通车。',
+    '市民反映小区停车难问题突出，物业管理混乱，大家对此非常失望，希望尽快解决。',
+    '这款新手机的拍照效果很好，续航也不错，性价比优秀，推荐购买。但是价格偏高是个缺点。',
+    '成都大运会场馆赛后利用情况良好，多个场馆向市民开放，受到广泛欢迎。',
+]
+
+
+def test_keywords_match_extract_tags():
+    """复用分词结果提取的关键词与 jieba.analyse.extract_tags 相同"""
+    for text in TEXTS:
+        assert keywords_from_tokens(tokenize(text), 10) == jieba.analyse.extract_tags(text, topK=10)
+        assert extract_keywords(text) == jieba.analyse.extract_tags(text, topK=10)
+
+
+def test_analyze_document():
+    result = analyze_document(TEXTS[2], topic_names=['手机', '成都'])
+    assert result.sentiment == analyze_sentiment(TEXTS[2])
+    assert result.topics == ['手机']
+    assert analyze_document('', topic_names=['成都']) == (0.0, [], [])
+
+
+def test_process_pool_matches_serial():
+    texts = TEXTS * 50
+    serial = analyze_documents(texts, topic_names=['成都'], workers=1, chunk_size=20)
+    parallel = analyze_documents(texts, topic_names=['成都'], workers=2, chunk_size=20)
+    assert parallel == serial
+    assert [result.sentiment for result in serial[:4]] == [analyze_sentiment(text) for text in TEXTS]
+
+
+def test_analyze_stored_news(app):
+    with app.app_context():
+        topic = Topic(name='成都')
+        db.session.add(topic)
+        db.session.add_all([News(title=f'新闻{i}', content=text, url=f'https://example.com/{i}',
+                                 crawl_time=datetime.now()) for i, text in enumerate(TEXTS)])
+        db.session.commit()
+
+        start = time.time()
+        assert analyze_stored_news(chunk_size=3, workers=1) == 4
+        elapsed = time.time() - start
+        assert analyze_stored_news(chunk_size=3, workers=1) == 0  # 已处理的不再重复处理
+
+        rows = News.query.order_by(News.id).all()
+        assert all(news.is_processed for news in rows)
+        assert [news.sentiment_score for news in rows] == [analyze_sentiment(f'新闻{i}\n{text}')
+                                                           for i, text in enumerate(TEXTS)]
+        assert sorted(news.title for news in topic.news_list) == ['新闻0', '新闻3']
+
+        # 重新处理时不会重复关联话题
+        assert analyze_stored_news(workers=1, reprocess=True) == 4
+        assert topic.news_list.count() == 2
+        print(f"分析4条新闻耗时: {elapsed * 1000:.1f}毫秒")
+
+
+def test_jieba_loaded_lazily():
+    """导入应用模块时不加载jieba，第一次分词时才加载并写入词典缓存"""
+    script = (
+        "import sys\n"
+        "import run, app.news_store, app.near_dup\n"
+        "assert 'jieba' not in sys.modules\n"
+        "from app.utils import analyze_sentiment\n"
+        "assert analyze_sentiment('效果很好') == 1.0\n"
+    )
+    root = os.path.dirname(os.path.abspath(__file__))
+    with tempfile.TemporaryDirectory() as temp_dir:
+        cache_path = os.path.join(temp_dir, 'nlp', 'jieba.cache')
+        env = dict(os.environ, JIEBA_CACHE_PATH=cache_path, NLP_WARMUP='0', DATABASE_URL='sqlite://')
+        subprocess.run([sys.executable, '-c', script], cwd=root, env=env, check=True,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        assert os.path.getsize(cache_path) > 0
+
+
+if __name__ == '__main__':
+    # 数据库夹具由 conftest.py 提供，直接运行时交给 pytest 执行
+    sys.exit(pytest.main([__file__, '-q']))
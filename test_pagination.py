@@ -0,0 +1,125 @@
+import sys
+import os
+from datetime import datetime, timedelta
+
+# 添加项目根目录到Python路径
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import pytest
+from sqlalchemy import event
+
+from app import db
+from app.models import News, Topic, User
+from app.pagination import decode_cursor, encode_cursor, keyset_paginate
+
+BASE_TIME = datetime(2026, 1, 1, 8, 0)
+
+
+@pytest.fixture
+def user_id(app):
+    """写入分页用的新闻、话题和登录用户，返回用户ID"""
+    with app.app_context():
+        # 每三条新闻的采集时间相同，顺序由ID决定
+        db.session.add_all([News(title=f'新闻{i}', url=f'https://example.com/{i}',
+                                 crawl_time=BASE_TIME + timedelta(minutes=i // 3)) for i in range(57)])
+        db.session.add_all([Topic(name=f'话题{i}', updated_at=BASE_TIME + timedelta(hours=i)) for i in range(12)])
+        user = User(username='admin', email='admin@example.com')
+        db.session.add(user)
+        db.session.commit()
+        return user.id
+
+
+def test_cursor_round_trip():
+    cursor = encode_cursor([BASE_TIME, 42], 'prev')
+    assert decode_cursor(cursor) == ('prev', [BASE_TIME, 42])
+    for bad in ('abc', encode_cursor([1], 'sideways'), '', encode_cursor([{'a': 1}, 2]), encode_cursor([[1], 2]),
+                encode_cursor([None, 2]), encode_cursor([True, 2])):
+        try:
+            decode_cursor(bad)
+        except ValueError:
+            continue
+        raise AssertionError(bad)
+
+
+def test_walk_forward_and_back(app, user_id):
+    with app.app_context():
+        expected = [news.id for news in News.query.order_by(News.crawl_time.desc(), News.id.desc())]
+        columns = (News.crawl_time, News.id)
+
+        pages = []
+        pagination = keyset_paginate(News.query, columns, 10)
+        assert not pagination.has_prev and pagination.prev_cursor is None
+        while True:
+            pages.append([news.id for news in pagination.items])
+            if not pagination.has_next:
+                break
+            pagination = keyset_paginate(News.query, columns, 10, pagination.next_cursor)
+        assert [news_id for page in pages for news_id in page] == expected
+        assert [len(page) for page in pages] == [10, 10, 10, 10, 10, 7]
+
+        # 从最后一页往回翻，每一页与向后翻时相同
+        for page in reversed(pages[:-1]):
+            pagination = keyset_paginate(News.query, columns, 10, pagination.prev_cursor)
+            assert [news.id for news in pagination.items] == page
+            assert pagination.has_next
+        assert not pagination.has_prev
+
+
+def test_cursor_keys_must_match_columns(app, user_id):
+    with app.app_context():
+        columns = (News.crawl_time, News.id)
+        for keys in (['abc', 1], [BASE_TIME, 'abc'], [1, 2]):
+            try:
+                keyset_paginate(News.query, columns, 10, encode_cursor(keys))
+            except ValueError:
+                continue
+            raise AssertionError(keys)
+
+
+def test_deep_page_uses_index(app, user_id):
+    """深处的页也只按复合索引读取一页，不用 OFFSET 跳过前面的行，也不另外排序"""
+    with app.app_context():
+        cursor = encode_cursor([BASE_TIME + timedelta(minutes=5), 16])
+        statements = []
+        listener = lambda conn, cursor, statement, parameters, *args: statements.append((statement, parameters))
+        event.listen(db.engine, 'before_cursor_execute', listener)
+        try:
+            pagination = keyset_paginate(News.query, (News.crawl_time, News.id), 5, cursor)
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', listener)
+        assert [news.id for news in pagination.items] == [15, 14, 13, 12, 11]
+
+        assert len(statements) == 1
+        statement, parameters = statements[0]
+        assert parameters[-1] == 0  # OFFSET 0
+        with db.engine.connect() as connection:
+            plan = ' '.join(str(row) for row in connection.exec_driver_sql('EXPLAIN QUERY PLAN ' + statement, parameters))
+        assert 'ix_news_crawl_time_id' in plan and 'TEMP B-TREE' not in plan
+
+
+def test_routes(app, user_id):
+    client = app.test_client()
+    with client.session_transaction() as session:
+        session['_user_id'] = str(user_id)
+        session['_fresh'] = True
+
+    data = client.get('/api/news?per_page=20').get_json()
+    assert len(data['items']) == 20 and data['total'] == 57 and data['prev_cursor'] is None
+    second = client.get(f"/api/news?per_page=20&cursor={data['next_cursor']}").get_json()
+    assert second['items'][0]['id'] == data['items'][-1]['id'] - 1
+    assert client.get('/api/news?cursor=invalid').status_code == 400
+    tampered = encode_cursor([{'a': 1}, 2])
+    assert client.get(f'/api/news?cursor={tampered}').status_code == 400
+    assert client.get(f'/news?cursor={tampered}').status_code == 200
+    assert client.get(f'/topics?cursor={tampered}').status_code == 200
+
+    response = client.get('/news')
+    assert response.status_code == 200 and 'cursor=' in response.get_data(as_text=True)
+    assert client.get('/news?cursor=invalid').status_code == 200
+    response = client.get('/topics')
+    assert response.status_code == 200 and '话题11' in response.get_data(as_text=True)
+
+
+if __name__ == '__main__':
+    # 数据库夹具由 conftest.py 提供，直接运行时交给 pytest 执行
+    sys.exit(pytest.main([__file__, '-q']))
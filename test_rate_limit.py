@@ -0,0 +1,89 @@
+import sys
+import os
+import time
+import threading
+
+# 添加项目根目录到Python路径
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.rate_limit import TokenBucket, HostBudget
+
+
+def test_token_bucket_spacing():
+    """令牌用完后按速率预约等待时间"""
+    bucket = TokenBucket(rate=10, capacity=1)
+    assert bucket.reserve() == 0.0
+    waits = [bucket.reserve() for _ in range(3)]
+    assert 0.08 <= waits[0] <= 0.11
+    assert 0.18 <= waits[1] <= 0.21
+    assert 0.28 <= waits[2] <= 0.31
+
+
+def test_host_budget_limits_concurrency_and_rate():
+    """同一主机的并发数和请求速率受预算限制"""
+    budget = HostBudget(max_concurrency=1, rate=20, burst=1)
+    starts = []
+    active = []
+    peak = [0]
+    lock = threading.Lock()
+
+    def worker():
+        with budget.slot('www.baidu.com'):
+            with lock:
+                starts.append(time.monotonic())
+                active.append(1)
+                peak[0] = max(peak[0], len(active))
+            time.sleep(0.01)
+            with lock:
+                active.pop()
+
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    starts.sort()
+    assert peak[0] == 1
+    for earlier, later in zip(starts, starts[1:]):
+        assert later - earlier >= 0.04
+
+
+def test_host_budget_hosts_are_independent():
+    """不同主机之间互不等待"""
+    budget = HostBudget(max_concurrency=1, rate=1, burst=1)
+    begin = time.monotonic()
+    with budget.slot('a.example.com'):
+        pass
+    with budget.slot('b.example.com'):
+        pass
+    assert time.monotonic() - begin < 0.5
+
+
+def test_adaptive_backoff():
+    """异常响应时降速，正常响应时逐步恢复"""
+    budget = HostBudget(rate=1.0, min_rate=0.2, max_rate=1.5)
+    assert budget.report('www.baidu.com', False) == 0.5
+    assert budget.report('www.baidu.com', False) == 0.25
+    assert budget.report('www.baidu.com', False) == 0.2
+    rate = budget.report('www.baidu.com', True)
+    assert abs(rate - 0.3) < 1e-9
+    for _ in range(20):
+        rate = budget.report('www.baidu.com', True)
+    assert rate == 1.5
+
+
+def test_backoff_drains_tokens():
+    """异常响应后下一次请求至少等待一个令牌周期"""
+    budget = HostBudget(rate=100, burst=5, min_rate=1)
+    budget.report('www.baidu.com', False)
+    assert budget.bucket('www.baidu.com').reserve() > 0
+
+
+if __name__ == '__main__':
+    test_token_bucket_spacing()
+    test_host_budget_limits_concurrency_and_rate()
+    test_host_budget_hosts_are_independent()
+    test_adaptive_backoff()
+    test_backoff_drains_tokens()
+    print("限速测试全部通过")
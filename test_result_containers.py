@@ -0,0 +1,71 @@
+import sys
+import os
+
+# 添加项目根目录到Python路径
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from bs4 import BeautifulSoup
+
+from app.utils import find_result_containers, parse_baidu_news
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+FIXTURES = ['full_page.html', 'baidu_news_debug.html']
+
+
+def load_soup(name):
+    with open(os.path.join(ROOT, name), encoding='utf-8') as f:
+        return BeautifulSoup(f.read(), 'html.parser')
+
+
+def scan_all_divs(soup):
+    """原来的查找方式：遍历所有div，保留其中第一个h3带链接的div"""
+    containers = []
+    for div in soup.find_all('div'):
+        h3_tag = div.find('h3')
+        if h3_tag:
+            a_tag = h3_tag.find('a')
+            if a_tag and a_tag.get('href'):
+                containers.append(div)
+    return containers
+
+
+def test_same_containers_as_div_scan():
+    """单次遍历找到的容器与遍历所有div的结果一致，顺序相同"""
+    for name in FIXTURES:
+        soup = load_soup(name)
+        groups = find_result_containers(soup)
+        flattened = [container for _, containers in groups for container in containers]
+        assert [id(c) for c in flattened] == [id(c) for c in scan_all_divs(soup)]
+        for h3_tag, containers in groups:
+            assert all(container.find('h3') is h3_tag for container in containers)
+
+
+def test_each_result_found_once():
+    for name in FIXTURES:
+        groups = find_result_containers(load_soup(name))
+        h3_tags = [h3_tag for h3_tag, _ in groups]
+        assert len(h3_tags) == 10
+        assert len({id(h3_tag) for h3_tag in h3_tags}) == len(h3_tags)
+
+
+def test_fallback_without_h3():
+    soup = BeautifulSoup('<p><a href="https://example.com/a">成都新闻标题</a></p>', 'html.parser')
+    groups = find_result_containers(soup)
+    assert len(groups) == 1
+    assert groups[0][0] is None
+    assert groups[0][1][0].name == 'p'
+
+
+def test_parse_fixture():
+    with open(os.path.join(ROOT, 'full_page.html'), encoding='utf-8') as f:
+        news_list = list(parse_baidu_news(f.read(), '成都', 1, 20))
+    assert len(news_list) == 10
+    assert len({news['url'] for news in news_list}) == 10
+
+
+if __name__ == '__main__':
+    test_same_containers_as_div_scan()
+    test_each_result_found_once()
+    test_fallback_without_h3()
+    test_parse_fixture()
+    print("搜索结果容器测试全部通过")
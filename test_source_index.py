@@ -0,0 +1,98 @@
+import sys
+import os
+import time
+import tempfile
+
+# 添加项目根目录到Python路径
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import pytest
+import app.source_index as source_index
+from app import db
+from app.models import News
+from app.news_store import rebuild_source_index
+from app.source_index import SourceIndex, build_host_sources
+from app.utils import parse_baidu_news
+
+FIXTURE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'full_page.html')
+
+
+def test_build_host_sources():
+    pairs = ([('https://www.thepaper.cn/news/%d' % i, '澎湃新闻') for i in range(4)]
+             + [('https://baijiahao.baidu.com/s?id=%d' % i, '作者%d' % i) for i in range(5)]
+             + [('https://news.sina.com.cn/a', '新浪新闻'), ('https://news.sina.com.cn/b', '新浪新闻')]
+             + [('https://www.cnr.cn/%d' % i, '央广网') for i in range(5)] + [('https://www.cnr.cn/x', '其他')])
+    entries = {entry[0]: entry for entry in build_host_sources(pairs)}
+    assert entries['www.thepaper.cn'] == ('www.thepaper.cn', '澎湃新闻', '商业媒体', 4)
+    assert entries['www.cnr.cn'][1] == '央广网'  # 5/6 超过 80%
+    assert 'baijiahao.baidu.com' not in entries  # 同一主机下来源各不相同
+    assert 'news.sina.com.cn' not in entries  # 样本不足
+
+
+def test_lookup_cache():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        index = SourceIndex(os.path.join(temp_dir, 'index.sqlite'), cache_size=2, cache_ttl=0.2)
+        assert index.lookup('www.cnr.cn') is None
+        assert index.replace([('www.cnr.cn', '央广网', '其他媒体', 5), ('www.thepaper.cn', '澎湃新闻', '商业媒体', 4)]) == 2
+        # 替换索引时清空了进程内缓存
+        assert index.lookup_url('https://www.cnr.cn/a.html') == ('央广网', '其他媒体')
+        assert index.lookup('www.thepaper.cn') == ('澎湃新闻', '商业媒体')
+        assert len(index._cache) == 2
+
+        index.lookup('example.com')
+        assert len(index._cache) == 2 and 'www.cnr.cn' not in index._cache
+
+        # 其他连接重建索引后，缓存过期即可看到
+        other = SourceIndex(index.path)
+        other.replace([('example.com', '示例网', '其他媒体', 3)])
+        assert index.lookup('example.com') is None
+        time.sleep(0.25)
+        assert index.lookup('example.com') == ('示例网', '其他媒体')
+        assert len(other) == 1
+
+
+def test_rebuild_and_parse_with_index(app):
+    with tempfile.TemporaryDirectory() as temp_dir:
+        os.environ['SOURCE_INDEX_PATH'] = os.path.join(temp_dir, 'index.sqlite')
+        source_index._source_index = None
+        try:
+            with app.app_context():
+                db.session.add_all([News(title=f'新闻{i}', url=f'https://www.cnr.cn/n/{i}.html', source='央广网')
+                                    for i in range(3)])
+                db.session.add(News(title='新闻', url='https://baijiahao.baidu.com/s?id=1', source='某作者'))
+                db.session.commit()
+                assert rebuild_source_index(chunk_size=2) == (4, 1)
+
+            with open(FIXTURE, 'r', encoding='utf-8') as f:
+                html_content = f.read()
+            items = list(parse_baidu_news(html_content, '成都'))
+            cnr_items = [item for item in items if '//www.cnr.cn/' in item['url']]
+            assert cnr_items
+            for item in cnr_items:
+                assert item['source'] == '央广网'
+                assert item['source_type'] == '其他媒体'
+        finally:
+            del os.environ['SOURCE_INDEX_PATH']
+            source_index._source_index = None
+
+
+def test_registry_domains_back_up_empty_index():
+    """索引中没有的主机按媒体名录的域名得到来源，不走正则匹配"""
+    html_content = '''<html><body><div id="content_left"><div class="result-op c-container">
+<h3 class="news-title_1YtI1"><a href="https://finance.sina.com.cn/a.html">成都地铁18号线三期工程今日开工</a></h3>
+<div class="c-summary"><span>3小时前</span> 记者获悉，线路全长约20公里，预计2028年建成通车。</div>
+</div></div></body></html>'''
+    with tempfile.TemporaryDirectory() as temp_dir:
+        os.environ['SOURCE_INDEX_PATH'] = os.path.join(temp_dir, 'index.sqlite')
+        source_index._source_index = None
+        try:
+            items = list(parse_baidu_news(html_content, '成都'))
+            assert [(item['source'], item['source_type']) for item in items] == [('新浪', '商业媒体')]
+        finally:
+            del os.environ['SOURCE_INDEX_PATH']
+            source_index._source_index = None
+
+
+if __name__ == '__main__':
+    # 数据库夹具由 conftest.py 提供，直接运行时交给 pytest 执行
+    sys.exit(pytest.main([__file__, '-q']))
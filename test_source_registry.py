@@ -0,0 +1,86 @@
+import sys
+import os
+import time
+import json
+import tempfile
+
+# 添加项目根目录到Python路径
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.source_registry import SourceClassifier, get_source_classifier
+from app.utils import determine_source_type
+
+
+def legacy_source_type(source):
+    """原来逐个列表做子串查找的实现，用于对照"""
+    if not source:
+        return "未知"
+    official_media = ["央视", "新华社", "人民网", "光明网", "中国日报", "中新网", "环球网", "中国新闻网"]
+    commercial_media = ["澎湃新闻", "界面新闻", "财经网", "科技日报", "成都商报", "华西都市报", "凤凰网", "新浪", "网易", "腾讯"]
+    we_media = ["微信", "微博", "知乎", "抖音", "小红书", "头条", "搜狐号", "百家号"]
+    if any(media in source for media in official_media):
+        return "官方媒体"
+    if any(media in source for media in commercial_media):
+        return "商业媒体"
+    if any(media in source for media in we_media):
+        return "自媒体"
+    return "其他媒体"
+
+
+SOURCES = ['', '新华社', '新浪微博', '新浪财经', '腾讯新闻', '澎湃新闻', '成都商报电子版', '网易号', '百家号',
+           '央视新闻客户端', '中国新闻网四川', '四川在线', '红星新闻', '今日头条号', '环球网微博', '知乎专栏', '搜狐']
+
+
+def test_matches_legacy_rules():
+    for source in SOURCES:
+        assert determine_source_type(source) == legacy_source_type(source), source
+
+
+def test_aliases_and_domains():
+    classifier = get_source_classifier()
+    assert classifier.classify('人民日报客户端') == '官方媒体'
+    assert classifier.classify('cctv-13') == '官方媒体'
+    assert classifier.match('中国新闻网').name == '中新网'
+    assert classifier.match_host('finance.sina.com.cn').name == '新浪'
+    assert classifier.match_host('mp.weixin.qq.com').source_type == '自媒体'
+    assert classifier.match_host('news.qq.com').name == '腾讯'
+    assert classifier.match_host('example.com') is None
+
+
+def test_registry_file_and_priority():
+    registry = {'categories': [
+        {'type': '官方媒体', 'outlets': [{'name': '日报', 'aliases': [], 'domains': []}]},
+        {'type': '自媒体', 'outlets': [{'name': '都市日报号', 'aliases': ['abc'], 'domains': ['abc.com']}]},
+    ]}
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, 'registry.json')
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(registry, f, ensure_ascii=False)
+        classifier = SourceClassifier.from_file(path)
+    # 两个名称重叠时按类别顺序取官方媒体
+    assert classifier.classify('某都市日报号') == '官方媒体'
+    assert classifier.classify('ABC频道') == '自媒体'
+    assert classifier.classify('其他') == '其他媒体'
+    assert classifier.classify(None) == '未知'
+
+
+def test_large_registry():
+    outlets = [{'name': f'媒体{i:05d}号', 'aliases': [f'outlet{i:05d}'], 'domains': [f'site{i}.com']}
+               for i in range(5000)]
+    classifier = SourceClassifier({'categories': [{'type': '商业媒体', 'outlets': outlets}]})
+    assert classifier.size == 10000
+
+    start = time.time()
+    for i in range(20000):
+        assert classifier.classify(f'来自媒体{i % 5000:05d}号的报道') == '商业媒体'
+    elapsed = time.time() - start
+    assert classifier.match_host('www.site4999.com').name == '媒体04999号'
+    print(f"5000家媒体的名录分类20000条来源耗时: {elapsed * 1000:.1f}毫秒")
+
+
+if __name__ == '__main__':
+    test_matches_legacy_rules()
+    test_aliases_and_domains()
+    test_registry_file_and_priority()
+    test_large_registry()
+    print("媒体来源分类测试全部通过")
@@ -0,0 +1,55 @@
+import sys
+import os
+import re
+import random
+
+# 添加项目根目录到Python路径
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.time_parser import normalize_time
+from app.utils import SOURCE_PATTERNS, extract_text_fields
+
+# 改写前的来源规则，用于核对改写后的规则匹配结果相同
+ORIGINAL_SOURCE_PATTERNS = [
+    r'(央视网|新华网|人民网|光明网|中国日报网|中新网|环球网|凤凰网|中国新闻网|澎湃新闻|界面新闻|财经网|科技日报|成都商报|华西都市报)',
+    r'来源[:：]\s*(\w+)',
+    r'\s*(\w+)(?:[网报台])\s*',
+    r'^(\w+)(?:\s*[:：])?',
+    r'\s*(\w+)\s*·\s*',
+]
+
+
+def test_source_patterns_match_original():
+    """改写后的来源规则在随机文本上与原规则取到相同的结果"""
+    rnd = random.Random(0)
+    alphabet = '网报台·:： \n\tab1成都新闻_-'
+    for _ in range(20000):
+        text = ''.join(rnd.choice(alphabet) for _ in range(rnd.randint(0, 14)))
+        for original, compiled in zip(ORIGINAL_SOURCE_PATTERNS, SOURCE_PATTERNS):
+            expected = re.search(original, text, re.MULTILINE)
+            actual = compiled.search(text)
+            assert (expected and expected.group(1)) == (actual and actual.group(1)), (original, text)
+
+
+def test_extract_text_fields():
+    text = '\n成都地铁18号线开工\n2小时前 记者获悉，成都地铁18号线三期工程今日开工。分享 收藏\n成都商报\n'
+    source, publish_time, body = extract_text_fields(text, '成都地铁18号线开工')
+    assert source == '成都商报'
+    assert publish_time == '2小时前'
+    assert body == '记者获悉成都地铁18号线三期工程今日开工'
+
+
+def test_normalize_time():
+    assert normalize_time('') == ''
+    assert normalize_time('2025-12-01') == '2025-12-01 00:00'
+    assert normalize_time('12-01').endswith('-12-01 00:00')
+    assert normalize_time('12月2日') == '12月2日'
+    assert len(normalize_time('3小时前')) == 16
+    assert normalize_time('刚刚')[:4].isdigit()
+
+
+if __name__ == '__main__':
+    test_source_patterns_match_original()
+    test_extract_text_fields()
+    test_normalize_time()
+    print("文本字段提取测试全部通过")
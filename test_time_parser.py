@@ -0,0 +1,119 @@
+import sys
+import os
+import re
+import random
+import time
+from datetime import datetime, timedelta
+
+# 添加项目根目录到Python路径
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.time_parser import normalize_time, parse_date, parse_time, _parse_literal
+from app.utils import parse_baidu_news
+
+FIXTURE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'full_page.html')
+
+NOW = datetime(2026, 1, 2, 8, 30, 15)
+
+
+def legacy_normalize_time(time_str, now):
+    """原来的实现（把 datetime.now() 换成固定的 now），用于对照"""
+    if not time_str:
+        return ""
+    for pattern, unit in ((r'(\d+)小时前', 'hours'), (r'(\d+)天前', 'days'), (r'(\d+)分钟前', 'minutes'), (r'刚刚', None)):
+        match = re.search(pattern, time_str)
+        if match:
+            moment = now
+            if unit:
+                moment -= timedelta(**{unit: int(match.group(1))})
+            return moment.strftime("%Y-%m-%d %H:%M")
+    for pattern, has_year in ((r'^(\d{4})[-/年](0?[1-9]|1[0-2])[-/月](0?[1-9]|[12]\d|3[01])日?$', True),
+                              (r'^(0?[1-9]|1[0-2])[-/月](0?[1-9]|[12]\d|3[01])日?$', False),
+                              (r'^(\d{2}):(\d{2})$', False)):
+        if re.match(pattern, time_str):
+            try:
+                if not has_year:
+                    formatted_date = datetime.strptime(time_str, "%m-%d").replace(year=now.year)
+                    if formatted_date > now:
+                        formatted_date = formatted_date.replace(year=now.year - 1)
+                    return formatted_date.strftime("%Y-%m-%d %H:%M")
+                return datetime.strptime(time_str, "%Y-%m-%d").strftime("%Y-%m-%d %H:%M")
+            except ValueError:
+                continue
+    return time_str
+
+
+def legacy_parse_date(date_str, now):
+    if not date_str:
+        return now
+    for fmt in ('%Y-%m-%d %H:%M:%S', '%Y-%m-%d', '%Y/%m/%d %H:%M:%S', '%Y/%m/%d', '%d/%m/%Y', '%d-%m-%Y'):
+        try:
+            return datetime.strptime(date_str, fmt)
+        except ValueError:
+            continue
+    return now
+
+
+SAMPLES = ['', '刚刚', '3小时前', '15分钟前', '2天前', '发布于 5小时前', '2025-12-01', '2025-2-3', '2025-02-30',
+           '2025/12/01', '2025年12月1日', '12-01', '1-2', '01-03', '12月2日', '12:30', '昨天', '2025-12-01 10:00']
+
+
+def test_normalize_time_matches_legacy():
+    for time_str in SAMPLES:
+        assert normalize_time(time_str, NOW) == legacy_normalize_time(time_str, NOW), time_str
+    assert parse_time('3小时前', NOW) == datetime(2026, 1, 2, 5, 30)
+    assert parse_time('01-03', NOW) == datetime(2025, 1, 3)
+    assert parse_time('12:30', NOW) is None
+
+
+def test_parse_date_matches_legacy():
+    rnd = random.Random(3)
+    samples = ['', 'abc', '2025-12-01 10:20:30', '2025/1/2', '31/12/2025', '2-3-2025', '2025-13-01', '2025-12-01 10:20']
+    for _ in range(300):
+        year, month, day = rnd.randint(1990, 2030), rnd.randint(1, 13), rnd.randint(1, 32)
+        samples += [f'{year}-{month}-{day}', f'{year}/{month:02d}/{day:02d} {rnd.randint(0, 23)}:{rnd.randint(0, 59)}:00',
+                    f'{day}/{month}/{year}', f'{day:02d}-{month:02d}-{year}']
+    for date_str in samples:
+        assert parse_date(date_str, NOW) == legacy_parse_date(date_str, NOW), date_str
+
+
+def test_page_shares_reference_time():
+    with open(FIXTURE, 'r', encoding='utf-8') as f:
+        html_content = f.read()
+    items = list(parse_baidu_news(html_content, '成都', now=NOW))
+    assert items
+    for item in items:
+        assert item['crawl_time'] == '2026-01-02 08:30:15'
+        if item['publish_datetime'] is not None:
+            assert item['publish_time'] == item['publish_datetime'].strftime('%Y-%m-%d %H:%M')
+            assert item['publish_datetime'] <= NOW
+
+    # 重复的字符串只解析一次
+    _parse_literal.cache_clear()
+    start = time.time()
+    for _ in range(10000):
+        parse_time('3小时前', NOW)
+    elapsed = time.time() - start
+    assert _parse_literal.cache_info().misses == 1
+    print(f"解析10000次相对时间耗时: {elapsed * 1000:.1f}毫秒")
+
+
+def test_relative_time_reaches_parser():
+    """摘要里的 "N小时前" 按页面参照时间解析为 publish_datetime"""
+    html_content = '''<html><body><div id="content_left"><div class="result-op c-container">
+<h3 class="news-title_1YtI1"><a href="https://news.example.com/a.html">成都地铁18号线三期工程今日开工</a></h3>
+<div class="c-summary"><span class="c-color-gray2">3小时前</span> 记者获悉，线路全长约20公里。<span>成都商报</span></div>
+</div></div></body></html>'''
+    items = list(parse_baidu_news(html_content, '成都', now=NOW))
+    assert len(items) == 1
+    assert items[0]['publish_datetime'] == datetime(2026, 1, 2, 5, 30)
+    assert items[0]['publish_time'] == '2026-01-02 05:30'
+    assert '时前' not in items[0]['content']
+
+
+if __name__ == '__main__':
+    test_normalize_time_matches_legacy()
+    test_parse_date_matches_legacy()
+    test_page_shares_reference_time()
+    test_relative_time_reaches_parser()
+    print("时间解析测试全部通过")